@@ -0,0 +1,393 @@
+"""
+Offline micro-benchmarks of the council's Python-side hot paths.
+
+Usage:
+    python -m backend.benchmark [--quick] [--filter TEXT] [--output FILE] [--compare FILE]
+
+Covers prompt construction (Stage 2 ranking prompt, Stage 3 chairman
+prompt), ranking parsing and aggregation for synthetic councils of 2-64
+members with 1 KB-100 KB responses, and storage writes and reads on each
+backend for conversations of up to thousands of messages. No model is
+called. Results are written as JSON (one entry per benchmark and parameter
+set, times in seconds per call), so runs on two commits can be compared
+with --compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import LOG_FSYNC_INTERVAL
+from .council import (
+    build_chairman_messages,
+    build_ranking_messages,
+    calculate_aggregate_rankings,
+    parse_ranking_from_text,
+)
+from .storage import JsonStore, LogStore, SqliteStore, configured_codec
+
+
+MEMBERS = (2, 4, 8, 16, 32, 64)
+RESPONSE_SIZES = (1024, 10 * 1024, 100 * 1024)
+CONVERSATION_LENGTHS = (10, 100, 1000, 4000)
+
+QUICK_MEMBERS = (2, 8, 64)
+QUICK_RESPONSE_SIZES = (1024, 100 * 1024)
+QUICK_CONVERSATION_LENGTHS = (10, 1000)
+
+# Shape of the stored turns: a typical council answering at moderate length
+STORAGE_MEMBERS = 4
+STORAGE_RESPONSE_SIZE = 2 * 1024
+
+WORDS = (
+    "the council model response answer ranking evaluation accuracy detail "
+    "however because therefore example consider approach result question "
+    "clear strong weak misses covers argument evidence summary final"
+).split()
+
+
+def synthetic_text(size: int, rng: random.Random) -> str:
+    """
+    Generate filler prose of about 'size' characters.
+
+    Args:
+        size: Target length in characters
+        rng: Random source (seeded, so runs are reproducible)
+
+    Returns:
+        Text of whitespace-separated words and sentences
+    """
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)[:size]
+
+
+def synthetic_stage1(members: int, size: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Build Stage 1 results for a council of 'members' models."""
+    return [
+        {"model": f"sim/member-{i}", "response": synthetic_text(size, rng)}
+        for i in range(members)
+    ]
+
+
+def synthetic_ranking(labels: List[str], size: int, rng: random.Random) -> str:
+    """Build one Stage 2 evaluation of about 'size' characters ending in a FINAL RANKING."""
+    order = list(labels)
+    rng.shuffle(order)
+    ranking = "\n".join(f"{position}. {label}" for position, label in enumerate(order, start=1))
+    return f"{synthetic_text(size, rng)}\n\nFINAL RANKING:\n{ranking}"
+
+
+def synthetic_stage2(
+    stage1_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str],
+    size: int,
+    rng: random.Random
+) -> List[Dict[str, Any]]:
+    """Build Stage 2 results: every member ranks every response."""
+    labels = list(label_to_model)
+    results = []
+    for result in stage1_results:
+        text = synthetic_ranking(labels, size, rng)
+        results.append({
+            "model": result["model"],
+            "ranking": text,
+            "parsed_ranking": parse_ranking_from_text(text)
+        })
+    return results
+
+
+def synthetic_turn(members: int, size: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Build a stored turn: a user message and the assistant message with all stages."""
+    stage1 = synthetic_stage1(members, size, rng)
+    _, label_to_model = build_ranking_messages("question", stage1)
+    stage2 = synthetic_stage2(stage1, label_to_model, size, rng)
+    return [
+        {"role": "user", "content": synthetic_text(200, rng)},
+        {
+            "role": "assistant",
+            "stage1": stage1,
+            "stage2": stage2,
+            "stage3": {"model": "sim/chairman", "response": synthetic_text(size, rng)}
+        },
+    ]
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    min_time: float,
+    max_loops: Optional[int] = None,
+    setup: Optional[Callable[[], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Time a function like timeit's autorange.
+
+    The loop count is doubled until one batch takes at least min_time, then
+    'repeat' batches are timed. With a 'setup' function every batch is a
+    single call, preceded by an untimed setup() call, so calls with side
+    effects all start from the same state.
+
+    Args:
+        func: Function to call
+        repeat: Number of timed batches
+        min_time: Minimum seconds per batch
+        max_loops: Cap on calls per batch (for calls with side effects)
+        setup: Function restoring the initial state before each call
+
+    Returns:
+        Dict with 'loops', 'repeat' and the 'min', 'median', 'mean' and
+        'stdev' of the seconds per call
+    """
+    loops = 1
+    while setup is None:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or (max_loops is not None and loops >= max_loops):
+            break
+        loops *= 2
+        if max_loops is not None:
+            loops = min(loops, max_loops)
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+class Runner:
+    """Runs the benchmarks that match a filter and collects their results."""
+
+    def __init__(self, name_filter: Optional[str], repeat: int, min_time: float):
+        """
+        Initialize the runner.
+
+        Args:
+            name_filter: Only run benchmarks whose name contains this text
+            repeat: Timed batches per benchmark
+            min_time: Minimum seconds per batch
+        """
+        self.name_filter = name_filter
+        self.repeat = repeat
+        self.min_time = min_time
+        self.results: List[Dict[str, Any]] = []
+
+    def wants(self, name: str) -> bool:
+        """Check whether a benchmark is selected."""
+        return self.name_filter is None or self.name_filter in name
+
+    def run(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        func: Callable[[], Any],
+        max_loops: Optional[int] = None,
+        setup: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Time one benchmark and record the result.
+
+        Args:
+            name: Benchmark name
+            params: Parameters of this run (members, sizes, ...)
+            func: Function to time
+            max_loops: Cap on calls per batch
+            setup: Untimed function run before each call (see measure)
+        """
+        timing = measure(func, self.repeat, self.min_time, max_loops, setup)
+        self.results.append({"name": name, "params": params, **timing})
+        described = ", ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{name} [{described}]: {timing['median'] * 1000:.3f} ms", file=sys.stderr)
+
+
+def bench_council(runner: Runner, members_grid, sizes_grid):
+    """Benchmark prompt construction, ranking parsing and aggregation."""
+    for members in members_grid:
+        for size in sizes_grid:
+            rng = random.Random(f"{members}-{size}")
+            params = {"members": members, "response_bytes": size}
+            query = synthetic_text(500, rng)
+            stage1 = synthetic_stage1(members, size, rng)
+            _, label_to_model = build_ranking_messages(query, stage1)
+            stage2 = synthetic_stage2(stage1, label_to_model, size, rng)
+
+            if runner.wants("prompt.stage2"):
+                runner.run("prompt.stage2", params, lambda: build_ranking_messages(query, stage1))
+            if runner.wants("prompt.stage3"):
+                runner.run("prompt.stage3", params, lambda: build_chairman_messages(query, stage1, stage2))
+            if runner.wants("ranking.parse"):
+                text = stage2[0]["ranking"]
+                runner.run("ranking.parse", params, lambda: parse_ranking_from_text(text))
+            if runner.wants("ranking.aggregate"):
+                runner.run(
+                    "ranking.aggregate", params,
+                    lambda: calculate_aggregate_rankings(stage2, label_to_model)
+                )
+
+
+def create_bench_store(backend: str, directory: str):
+    """Create a storage backend in a scratch directory, with the configured codec."""
+    if backend == "jsonl":
+        return LogStore(directory, LOG_FSYNC_INTERVAL, configured_codec())
+    if backend == "json":
+        return JsonStore(directory)
+    return SqliteStore(os.path.join(directory, "conversations.db"), configured_codec())
+
+
+def bench_storage(runner: Runner, lengths_grid):
+    """Benchmark turn writes and full and tail reads on every storage backend."""
+    rng = random.Random("storage")
+    turn = synthetic_turn(STORAGE_MEMBERS, STORAGE_RESPONSE_SIZE, rng)
+
+    for backend in ("jsonl", "json", "sqlite"):
+        names = [f"storage.{backend}.{op}" for op in ("append_turn", "read_full", "read_tail")]
+        if not any(runner.wants(name) for name in names):
+            continue
+
+        for length in lengths_grid:
+            directory = tempfile.mkdtemp(prefix="council-bench-")
+            fixture = os.path.join(directory, "fixture")
+            scratch = os.path.join(directory, "scratch")
+            store = create_bench_store(backend, fixture)
+            appending = {}
+            try:
+                store.create_conversation("bench")
+                store.commit("bench", turn * (length // 2))
+                params = {
+                    "messages": length,
+                    "members": STORAGE_MEMBERS,
+                    "response_bytes": STORAGE_RESPONSE_SIZE,
+                }
+
+                if runner.wants(names[1]):
+                    runner.run(names[1], params, lambda: store.get_conversation("bench"))
+                if runner.wants(names[2]):
+                    runner.run(names[2], params, lambda: store.get_messages("bench", -2))
+                if runner.wants(names[0]):
+                    # Every append goes to a fresh copy of the 'length' message fixture
+                    store.close()
+
+                    def reset():
+                        if "store" in appending:
+                            appending.pop("store").close()
+                        shutil.rmtree(scratch, ignore_errors=True)
+                        shutil.copytree(fixture, scratch)
+                        appending["store"] = create_bench_store(backend, scratch)
+
+                    runner.run(names[0], params, lambda: appending["store"].commit("bench", turn), setup=reset)
+            finally:
+                store.close()
+                if "store" in appending:
+                    appending["store"].close()
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def git_revision() -> Optional[str]:
+    """Get the checked-out commit, if running from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], out=sys.stdout):
+    """
+    Print the median time of each benchmark against a baseline run.
+
+    Args:
+        results: Results of this run
+        baseline: Results of the baseline run
+        out: File to print to
+    """
+    def key(result):
+        return result["name"], json.dumps(result["params"], sort_keys=True)
+
+    previous = {key(result): result for result in baseline}
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        described = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+        print(
+            f"{result['name']} [{described}]: "
+            f"{before['median'] * 1000:.3f} ms -> {result['median'] * 1000:.3f} ms ({ratio:.2f}x)",
+            file=out
+        )
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller parameter grid")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per batch")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    args = parser.parse_args()
+
+    runner = Runner(args.filter, args.repeat, args.min_time)
+    if args.quick:
+        bench_council(runner, QUICK_MEMBERS, QUICK_RESPONSE_SIZES)
+        bench_storage(runner, QUICK_CONVERSATION_LENGTHS)
+    else:
+        bench_council(runner, MEMBERS, RESPONSE_SIZES)
+        bench_storage(runner, CONVERSATION_LENGTHS)
+
+    report = {
+        "commit": git_revision(),
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": runner.results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        # Keep stdout valid JSON when the results go there
+        compare(runner.results, baseline["results"], sys.stdout if args.output else sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,33 @@ MODEL_CONFIGS = {
     "ollama": {
         "base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
     },
+    # Simulated models ("sim/<name>") for load tests: no network, no cost.
+    # Responses are deterministic; failures follow a seeded random sequence.
+    # Every model uses 'defaults', overridden by its entry in 'models':
+    #   ttft               - seconds to the first token (+/- 'jitter' fraction)
+    #   tokens_per_second  - generation speed
+    #   response_tokens    - length of every response
+    #   error_rate         - fraction of requests failing with a 503
+    #   rate_limit_rate    - fraction answered with a 429 ('retry_after' seconds)
+    #   timeout_rate       - fraction that hang until the request timeout
+    "sim": {
+        "seed": int(os.getenv("SIM_SEED", "0")),
+        "defaults": {
+            "ttft": float(os.getenv("SIM_TTFT", "0.5")),
+            "tokens_per_second": float(os.getenv("SIM_TOKENS_PER_SECOND", "50")),
+            "response_tokens": int(os.getenv("SIM_RESPONSE_TOKENS", "300")),
+            "jitter": 0.2,
+            "error_rate": float(os.getenv("SIM_ERROR_RATE", "0")),
+            "rate_limit_rate": float(os.getenv("SIM_RATE_LIMIT_RATE", "0")),
+            "timeout_rate": float(os.getenv("SIM_TIMEOUT_RATE", "0")),
+            "retry_after": 1.0,
+        },
+        "models": {
+            "fast": {"ttft": 0.1, "tokens_per_second": 200.0},
+            "slow": {"ttft": 3.0, "tokens_per_second": 10.0},
+            "flaky": {"error_rate": 0.2, "rate_limit_rate": 0.1, "timeout_rate": 0.05},
+        },
+    },
 }
 
 # ============================================================================
@@ -43,6 +70,7 @@ MODEL_CONFIGS = {
 #   - "doubao/deepseek-v3"
 #   - "deepseek/deepseek-chat"
 #   - "ollama/llama3.1"
+#   - "sim/fast" (simulated, see MODEL_CONFIGS["sim"])
 # ============================================================================
 
 # Council members - list of model identifiers
@@ -58,5 +86,255 @@ COUNCIL_MODELS = [
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "deepseek/deepseek-chat"
 
+# Stage 1 quorum - stop waiting for slow council members
+# Stage 1 moves on once 'min_responses' members have answered (None = all of
+# them), or once 'soft_deadline' seconds have passed with at least one answer
+# (None = no deadline). Members still running are cancelled and reported as
+# stragglers.
+STAGE1_QUORUM = {
+    "min_responses": int(os.getenv("STAGE1_MIN_RESPONSES")) if os.getenv("STAGE1_MIN_RESPONSES") else None,
+    "soft_deadline": float(os.getenv("STAGE1_SOFT_DEADLINE")) if os.getenv("STAGE1_SOFT_DEADLINE") else None,
+}
+
+# ============================================================================
+# Hedged Requests
+# ============================================================================
+# Many models are reachable through more than one provider. When hedging is
+# enabled and a model has alternate routes, a request that has not answered
+# within the primary route's recent 'delay_percentile' latency (or
+# 'initial_delay' until 'min_samples' calls were seen) is duplicated to the
+# next alternate route. The first answer wins and the other is cancelled.
+# 'budget_ratio' caps hedges to that fraction of requests ('budget_burst'
+# hedges can be saved up), so extra cost stays bounded.
+# Streaming calls are never hedged.
+# ============================================================================
+
+HEDGE_CONFIG = {
+    "enabled": os.getenv("HEDGE_ENABLED", "false").lower() == "true",
+    "routes": {
+        # "deepseek/deepseek-chat": ["openrouter/deepseek/deepseek-chat"],
+    },
+    "delay_percentile": 95,
+    "min_samples": 20,
+    "initial_delay": 10.0,
+    "budget_ratio": 0.1,
+    "budget_burst": 5,
+}
+
+# ============================================================================
+# Rate Limits
+# ============================================================================
+# Requests beyond these limits are queued rather than sent (and failed):
+#   max_concurrency            - in-flight requests per provider
+#   max_concurrency_per_model  - in-flight requests per provider/model pair
+#   requests_per_minute        - token-bucket rate per provider (None = unlimited)
+#   burst                      - requests allowed back-to-back under that rate
+# 'default' applies to providers without their own entry. A 429 pauses the
+# provider for its Retry-After period, then the request is retried, up to
+# RATE_LIMIT_MAX_RETRIES times.
+# ============================================================================
+
+RATE_LIMITS = {
+    "default": {
+        "max_concurrency": 16,
+        "max_concurrency_per_model": 8,
+        "requests_per_minute": None,
+        "burst": 1,
+    },
+    "ollama": {
+        # Local models share one machine; Ollama runs few requests per model at once
+        "max_concurrency": 4,
+        "max_concurrency_per_model": 2,
+    },
+}
+
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+
+# ============================================================================
+# Retries and Circuit Breakers
+# ============================================================================
+# Provider errors are classified as timeout, connection, 429, 5xx or 4xx.
+# Timeouts, connection errors and 5xx are retried up to 'max_retries' times
+# with jittered exponential backoff (429s follow RATE_LIMITS above; 4xx are
+# not retried). The same errors count against a circuit breaker per
+# provider/base_url: after 'failure_threshold' consecutive failures the
+# breaker opens and requests fail fast, while the endpoint is probed every
+# 'probe_interval' seconds in the background. A successful probe (or
+# 'reset_timeout' seconds) lets requests through again.
+# ============================================================================
+
+RETRY_CONFIG = {
+    "max_retries": int(os.getenv("RETRY_MAX_RETRIES", "2")),
+    "base_delay": 0.5,
+    "max_delay": 8.0,
+}
+
+CIRCUIT_BREAKER_CONFIG = {
+    "failure_threshold": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+    "reset_timeout": float(os.getenv("CIRCUIT_RESET_TIMEOUT", "60")),
+    "probe_interval": float(os.getenv("CIRCUIT_PROBE_INTERVAL", "10")),
+}
+
+# ============================================================================
+# HTTP Connection Pool
+# ============================================================================
+# Each provider owns one long-lived httpx.AsyncClient, so council calls reuse
+# TCP/TLS connections instead of handshaking on every request.
+# HTTP/2 is only negotiated when the optional 'h2' package is installed
+# (pip install "httpx[http2]"); otherwise HTTP/1.1 keep-alive is used.
+# A provider can override any of these with a 'pool' dict in MODEL_CONFIGS.
+# ============================================================================
+
+HTTP_POOL_CONFIG = {
+    "http2": os.getenv("HTTP2_ENABLED", "true").lower() == "true",
+    "max_connections": int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    "max_keepalive_connections": int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    "keepalive_expiry": float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+}
+
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
+
+# ============================================================================
+# Conversation Storage
+# ============================================================================
+# "json"   - one JSON file per conversation in DATA_DIR, rewritten per change
+#            (the default, and the original layout). Both file layouts keep
+#            a metadata journal (DATA_DIR/index.jsonl) so listing a page
+#            does not read every conversation.
+# "jsonl"  - per conversation, a small header plus an append-only message
+#            log in DATA_DIR/<id>/; a turn only writes the new message.
+#            DATA_DIR/<id>.json files are read as is and converted on their
+#            first write; the original file is kept as <id>.json.bak once
+#            the new log and header are durably on disk.
+# "sqlite" - a single SQLite database (WAL mode) at SQLITE_PATH; listing
+#            reads an indexed metadata table instead of every conversation.
+# Existing conversations can be imported into SQLite with:
+#   python -m backend.storage.migrate
+# LOG_FSYNC_INTERVAL batches fsyncs of the jsonl logs (0 = every append).
+# The API calls storage through a bounded thread pool of STORAGE_IO_WORKERS
+# threads, so disk latency never blocks the event loop.
+# ============================================================================
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/council.db")
+LOG_FSYNC_INTERVAL = float(os.getenv("LOG_FSYNC_INTERVAL", "1.0"))
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", "4"))
+
+# ============================================================================
+# Storage Compression
+# ============================================================================
+# Conversation logs (jsonl backend) and SQLite message payloads can be
+# compressed with 'codec': "none" (the default), "gzip" (standard library)
+# or "zstd" (needs pip install zstandard; falls back to gzip). The json
+# backend is never compressed.
+#
+# Enabling compression changes the on-disk format: new logs are written
+# as messages.jsonl.gz / .zst and new SQLite payloads as compressed blobs,
+# which code older than this option cannot read. Data written in any
+# format stays readable here, so the codec can be changed at any time;
+# to go back to plain files, set the codec to "none" and run a
+# recompression pass.
+#
+# Each append is its own compressed block. A background job can rewrite
+# logs as a single block every 'recompress_interval' seconds once they have
+# grown by 'recompress_min_growth' bytes, converting logs in other formats
+# to the configured codec. It is off by default (interval 0) because it
+# rewrites files; run it once by hand with:
+#   python -m backend.storage.recompress
+# ============================================================================
+
+STORAGE_COMPRESSION = {
+    "codec": os.getenv("STORAGE_COMPRESSION", "none").lower(),
+    "level": int(os.getenv("STORAGE_COMPRESSION_LEVEL")) if os.getenv("STORAGE_COMPRESSION_LEVEL") else None,
+    "recompress_interval": float(os.getenv("RECOMPRESS_INTERVAL", "0")),
+    "recompress_min_growth": int(os.getenv("RECOMPRESS_MIN_GROWTH", "65536")),
+}
+
+# ============================================================================
+# Council Runs
+# ============================================================================
+# Each council turn runs as a background job whose events are kept in
+# memory, so a client can reconnect to GET .../runs/{id}/events with
+# Last-Event-ID and replay what it missed. Finished runs stay available for
+# 'retention' seconds; at most 'max_finished' of them are kept.
+#
+# Every model answer and finished stage is checkpointed to 'checkpoint_dir'
+# as soon as it arrives. Runs interrupted by a crash or shutdown are resumed
+# from their checkpoint on startup (if 'resume_on_startup'), without
+# querying again the models that already answered.
+#
+# 'on_disconnect' decides what happens when the client streaming a run goes
+# away: "cancel" stops the run (and its provider requests) once nobody has
+# reattached for 'disconnect_grace' seconds, saving the stages that
+# finished; "background" lets the run finish and saves the full answer.
+# While a run is quiet, streams send a keepalive comment every 'heartbeat'
+# seconds, which is also how a silent disconnect gets noticed.
+# ============================================================================
+
+RUNS_CONFIG = {
+    "retention": float(os.getenv("RUN_RETENTION", "900")),
+    "max_finished": int(os.getenv("RUN_MAX_FINISHED", "100")),
+    "checkpoint_dir": os.getenv("RUN_CHECKPOINT_DIR", "data/runs"),
+    "resume_on_startup": os.getenv("RUN_RESUME_ON_STARTUP", "true").lower() == "true",
+    "on_disconnect": os.getenv("RUN_ON_DISCONNECT", "cancel"),
+    "disconnect_grace": float(os.getenv("RUN_DISCONNECT_GRACE", "10")),
+    "heartbeat": float(os.getenv("RUN_SSE_HEARTBEAT", "15")),
+}
+
+# ============================================================================
+# Conversation Cache
+# ============================================================================
+# Recently used conversations are kept in memory and their changes are
+# written behind: a council turn (user message, title, assistant message)
+# is committed to storage once, when the turn ends. Anything left unwritten
+# is flushed after 'flush_delay' seconds and on shutdown. 'max_entries'
+# bounds how many clean conversations stay cached.
+# ============================================================================
+
+CONVERSATION_CACHE = {
+    "max_entries": int(os.getenv("CONVERSATION_CACHE_MAX_ENTRIES", "256")),
+    "flush_delay": float(os.getenv("CONVERSATION_CACHE_FLUSH_DELAY", "30")),
+}
+
+# ============================================================================
+# Response Cache
+# ============================================================================
+# Identical (model, messages) requests can be answered from a cache keyed by
+# a hash of both. The memory tier is an LRU bounded by 'max_entries' and
+# 'max_bytes'; the optional disk tier lives under the data directory. Entries
+# expire after 'ttl' seconds (None = never). 'stages' opts each council stage
+# in or out; calls without a stage use 'default'.
+# ============================================================================
+
+RESPONSE_CACHE = {
+    "enabled": os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true",
+    "max_entries": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+    "max_bytes": int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    "ttl": float(os.getenv("RESPONSE_CACHE_TTL")) if os.getenv("RESPONSE_CACHE_TTL") else 24 * 3600.0,
+    "disk_dir": (
+        os.path.join(os.path.dirname(DATA_DIR), "response_cache")
+        if os.getenv("RESPONSE_CACHE_DISK", "false").lower() == "true" else None
+    ),
+    "stages": {
+        "stage1": True,
+        "stage2": True,
+        "stage3": True,
+        "title": True,
+    },
+    "default": True,
+}
+
+# ============================================================================
+# Token Usage
+# ============================================================================
+# Token counts reported by the providers are stored with each assistant
+# message and appended, one record per model call, to 'log_path'.
+# GET /api/usage summarizes the log per model in time buckets of
+# 'bucket' seconds (unless the request asks for another size).
+# ============================================================================
+
+USAGE_CONFIG = {
+    "log_path": os.getenv("USAGE_LOG_PATH", os.path.join(os.path.dirname(DATA_DIR), "usage.jsonl")),
+    "bucket": float(os.getenv("USAGE_BUCKET", "3600")),
+}
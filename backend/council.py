@@ -1,10 +1,22 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple
-from .providers.factory import query_models_parallel, query_model
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
-
-
+import asyncio
+from collections import defaultdict
+from typing import List, Dict, Any, Tuple, AsyncIterator, Optional
+from .providers.factory import (
+    query_models_parallel,
+    query_models_as_completed,
+    query_models_quorum,
+    query_model,
+    stream_model,
+    stream_models_parallel,
+)
+from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, STAGE1_QUORUM
+from .metrics import instrument_stage
+from .tracing import traced
+
+
+@instrument_stage("stage1")
 async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
     """
     Stage 1: Collect individual responses from all council models.
@@ -17,8 +29,16 @@ async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
     """
     messages = [{"role": "user", "content": user_query}]
 
-    # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    # Query all models in parallel, cutting off stragglers once a quorum answered
+    responses, stragglers = await query_models_quorum(
+        COUNCIL_MODELS,
+        messages,
+        min_responses=STAGE1_QUORUM["min_responses"],
+        soft_deadline=STAGE1_QUORUM["soft_deadline"],
+        stage="stage1"
+    )
+    if stragglers:
+        print(f"Stage 1 quorum reached, cut off stragglers: {', '.join(stragglers)}")
 
     # Format results
     stage1_results = []
@@ -32,19 +52,107 @@ async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
     return stage1_results
 
 
-async def stage2_collect_rankings(
+@instrument_stage("stage1")
+async def stage1_stream_responses(
+    user_query: str,
+    answered: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stage 1, streaming: collect responses while forwarding each model's tokens.
+
+    Yields SSE-ready event dicts:
+        {'type': 'stage1_delta', 'model': ..., 'delta': ...} per text chunk
+        {'type': 'stage1_model_queued', 'model': ..., 'data': info} when a model's
+        request waits for a concurrency or rate limit
+        {'type': 'stage1_model_complete', 'data': result, 'timing': ...} as each model finishes
+        {'type': 'stage1_model_failed', 'model': ..., 'timing': ...} if a model fails
+        {'type': 'stage1_model_cutoff', 'model': ...} if a model is cut off by
+        the STAGE1_QUORUM policy
+        {'type': 'stage1_complete', 'data': stage1_results, 'metadata':
+        {'stragglers': [...]}} once the stage is over
+
+    Models in 'answered' (results saved by an interrupted run) are not
+    queried again: their results are replayed as 'stage1_model_complete'
+    events marked 'resumed' and count towards the quorum.
+
+    Args:
+        user_query: The user's question
+        answered: Stage 1 results already collected for this query
+
+    Yields:
+        Event dicts; the final 'stage1_complete' carries the same results as
+        stage1_collect_responses
+    """
+    messages = [{"role": "user", "content": user_query}]
+
+    responses = {}
+    for result in answered or []:
+        responses[result['model']] = {'content': result['response']}
+        yield {"type": "stage1_model_complete", "data": result, "resumed": True}
+
+    pending = [model for model in COUNCIL_MODELS if model not in responses]
+    min_responses = STAGE1_QUORUM["min_responses"]
+    if min_responses is not None:
+        min_responses -= len(responses)
+
+    stragglers = []
+    if min_responses is not None and min_responses <= 0:
+        # The quorum was reached before the interruption
+        stragglers = pending
+        pending = []
+        for model in stragglers:
+            yield {"type": "stage1_model_cutoff", "model": model}
+
+    async for model, kind, payload in stream_models_parallel(
+        pending,
+        messages,
+        min_responses=min_responses,
+        soft_deadline=STAGE1_QUORUM["soft_deadline"],
+        stage="stage1"
+    ):
+        if kind == "delta":
+            yield {"type": "stage1_delta", "model": model, "delta": payload}
+        elif kind == "queued":
+            yield {"type": "stage1_model_queued", "model": model, "data": payload}
+        elif kind == "straggler":
+            stragglers.append(model)
+            yield {"type": "stage1_model_cutoff", "model": model}
+        else:
+            response, timing = payload
+            responses[model] = response
+            if response is None:
+                yield {"type": "stage1_model_failed", "model": model, "timing": timing}
+            else:
+                yield {
+                    "type": "stage1_model_complete",
+                    "data": {"model": model, "response": response.get('content', '')},
+                    "timing": timing
+                }
+
+    # Format results in council order, like stage1_collect_responses
+    stage1_results = [
+        {"model": model, "response": responses[model].get('content', '')}
+        for model in COUNCIL_MODELS
+        if responses.get(model) is not None
+    ]
+
+    yield {"type": "stage1_complete", "data": stage1_results, "metadata": {"stragglers": stragglers}}
+
+
+@traced("prompt_build", stage="stage2")
+def build_ranking_messages(
     user_query: str,
     stage1_results: List[Dict[str, Any]]
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+) -> Tuple[List[Dict[str, str]], Dict[str, str]]:
     """
-    Stage 2: Each model ranks the anonymized responses.
+    Build the anonymized ranking prompt that every council model evaluates.
 
     Args:
         user_query: The original user query
         stage1_results: Results from Stage 1
 
     Returns:
-        Tuple of (rankings list, label_to_model mapping)
+        Tuple of (message list to send to each model, label_to_model mapping)
     """
     # Create anonymized labels for responses (Response A, Response B, etc.)
     labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
@@ -92,33 +200,179 @@ FINAL RANKING:
 
 Now provide your evaluation and ranking:"""
 
-    messages = [{"role": "user", "content": ranking_prompt}]
+    return [{"role": "user", "content": ranking_prompt}], label_to_model
+
+
+def format_stage2_result(model: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Format one model's ranking response as a Stage 2 result.
+
+    Args:
+        model: Model identifier that produced the ranking
+        response: Response dict from the model
+
+    Returns:
+        Dict with 'model', 'ranking' and 'parsed_ranking' keys
+    """
+    full_text = response.get('content', '')
+    return {
+        "model": model,
+        "ranking": full_text,
+        "parsed_ranking": parse_ranking_from_text(full_text)
+    }
+
+
+@instrument_stage("stage2")
+async def stage2_collect_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Stage 2: Each model ranks the anonymized responses.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+
+    Returns:
+        Tuple of (rankings list, label_to_model mapping)
+    """
+    messages, label_to_model = build_ranking_messages(user_query, stage1_results)
 
     # Get rankings from all council models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    responses = await query_models_parallel(COUNCIL_MODELS, messages, stage="stage2")
 
     # Format results
-    stage2_results = []
-    for model, response in responses.items():
-        if response is not None:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed
-            })
+    stage2_results = [
+        format_stage2_result(model, response)
+        for model, response in responses.items()
+        if response is not None
+    ]
 
     return stage2_results, label_to_model
 
 
-async def stage3_synthesize_final(
+@instrument_stage("stage2")
+async def stage2_stream_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    answered: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stage 2, incremental: emit each model's ranking as soon as it finishes.
+
+    The aggregate rankings are updated with every finished model, so the UI
+    can show partial standings before the slowest model is done.
+
+    Yields SSE-ready event dicts:
+        {'type': 'stage2_model_queued', 'model': ..., 'data': info} when a
+        model's request waits for a concurrency or rate limit
+        {'type': 'stage2_model_complete', 'data': result, 'timing': ...,
+        'metadata': {'label_to_model': ..., 'aggregate_rankings': ...}} per model
+        {'type': 'stage2_model_failed', 'model': ..., 'timing': ...} if a model fails
+        {'type': 'stage2_complete', 'data': stage2_results, 'metadata': ...} at the end
+
+    Models in 'answered' (rankings saved by an interrupted run) are not
+    queried again; their rankings are replayed first, marked 'resumed'.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Results from Stage 1
+        answered: Stage 2 results already collected for these Stage 1 results
+
+    Yields:
+        Event dicts; the final 'stage2_complete' carries the same results as
+        stage2_collect_rankings plus the aggregate rankings
+    """
+    messages, label_to_model = build_ranking_messages(user_query, stage1_results)
+
+    results_by_model = {}
+    model_positions = defaultdict(list)
+    for result in answered or []:
+        results_by_model[result['model']] = result
+        add_ranking_positions(model_positions, result['parsed_ranking'], label_to_model)
+        yield {
+            "type": "stage2_model_complete",
+            "data": result,
+            "resumed": True,
+            "metadata": {
+                "label_to_model": label_to_model,
+                "aggregate_rankings": summarize_ranking_positions(model_positions)
+            }
+        }
+    pending = [model for model in COUNCIL_MODELS if model not in results_by_model]
+
+    # Merge finished rankings and queued notices into one ordered event stream
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_queued(model: str, info: Dict[str, Any]):
+        events.put_nowait(("queued", model, info))
+
+    async def collect():
+        try:
+            async for model, response, timing in query_models_as_completed(
+                pending, messages, on_queued=on_queued, stage="stage2"
+            ):
+                events.put_nowait(("done", model, (response, timing)))
+        finally:
+            events.put_nowait(("end", None, None))
+
+    collector = asyncio.create_task(collect())
+
+    try:
+        while True:
+            kind, model, payload = await events.get()
+            if kind == "end":
+                break
+            if kind == "queued":
+                yield {"type": "stage2_model_queued", "model": model, "data": payload}
+                continue
+
+            response, timing = payload
+            if response is None:
+                yield {"type": "stage2_model_failed", "model": model, "timing": timing}
+                continue
+
+            result = format_stage2_result(model, response)
+            results_by_model[model] = result
+            add_ranking_positions(model_positions, result['parsed_ranking'], label_to_model)
+
+            yield {
+                "type": "stage2_model_complete",
+                "data": result,
+                "timing": timing,
+                "metadata": {
+                    "label_to_model": label_to_model,
+                    "aggregate_rankings": summarize_ranking_positions(model_positions)
+                }
+            }
+    finally:
+        collector.cancel()
+
+    # Surface errors from the fan-out itself, like stage2_collect_rankings would
+    await collector
+
+    # Format results in council order, like stage2_collect_rankings
+    stage2_results = [results_by_model[model] for model in COUNCIL_MODELS if model in results_by_model]
+
+    yield {
+        "type": "stage2_complete",
+        "data": stage2_results,
+        "metadata": {
+            "label_to_model": label_to_model,
+            "aggregate_rankings": summarize_ranking_positions(model_positions)
+        }
+    }
+
+
+@traced("prompt_build", stage="stage3")
+def build_chairman_messages(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     stage2_results: List[Dict[str, Any]]
-) -> Dict[str, Any]:
+) -> List[Dict[str, str]]:
     """
-    Stage 3: Chairman synthesizes final response.
+    Build the chairman's prompt from all Stage 1 responses and Stage 2 rankings.
 
     Args:
         user_query: The original user query
@@ -126,7 +380,7 @@ async def stage3_synthesize_final(
         stage2_results: Rankings from Stage 2
 
     Returns:
-        Dict with 'model' and 'response' keys
+        Message list to send to the chairman model
     """
     # Build comprehensive context for chairman
     stage1_text = "\n\n".join([
@@ -156,10 +410,30 @@ Your task as Chairman is to synthesize all of this information into a single, co
 
 Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
 
-    messages = [{"role": "user", "content": chairman_prompt}]
+    return [{"role": "user", "content": chairman_prompt}]
+
+
+@instrument_stage("stage3")
+async def stage3_synthesize_final(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Stage 3: Chairman synthesizes final response.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Individual model responses from Stage 1
+        stage2_results: Rankings from Stage 2
+
+    Returns:
+        Dict with 'model' and 'response' keys
+    """
+    messages = build_chairman_messages(user_query, stage1_results, stage2_results)
 
     # Query the chairman model
-    response = await query_model(CHAIRMAN_MODEL, messages)
+    response = await query_model(CHAIRMAN_MODEL, messages, stage="stage3")
 
     if response is None:
         # Fallback if chairman fails
@@ -174,6 +448,52 @@ Provide a clear, well-reasoned final answer that represents the council's collec
     }
 
 
+@instrument_stage("stage3")
+async def stage3_stream_final(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stage 3, streaming: forward the chairman's synthesis as it is generated.
+
+    Yields SSE-ready event dicts:
+        {'type': 'stage3_delta', 'model': ..., 'delta': ...} per text chunk
+        {'type': 'stage3_complete', 'data': stage3_result} with the assembled answer
+
+    Args:
+        user_query: The original user query
+        stage1_results: Individual model responses from Stage 1
+        stage2_results: Rankings from Stage 2
+
+    Yields:
+        Event dicts; the final 'stage3_complete' carries the same result as
+        stage3_synthesize_final
+    """
+    messages = build_chairman_messages(user_query, stage1_results, stage2_results)
+
+    parts = []
+    try:
+        async for chunk in stream_model(CHAIRMAN_MODEL, messages, stage="stage3"):
+            text = chunk.get('content')
+            if text:
+                parts.append(text)
+                yield {"type": "stage3_delta", "model": CHAIRMAN_MODEL, "delta": text}
+    except Exception as e:
+        print(f"Error streaming chairman model {CHAIRMAN_MODEL}: {e}")
+        # Fallback if chairman fails; replaces any partial text on the client
+        yield {"type": "stage3_complete", "data": {
+            "model": CHAIRMAN_MODEL,
+            "response": "Error: Unable to generate final synthesis."
+        }}
+        return
+
+    yield {"type": "stage3_complete", "data": {
+        "model": CHAIRMAN_MODEL,
+        "response": ''.join(parts)
+    }}
+
+
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
     """
     Parse the FINAL RANKING section from the model's response.
@@ -208,36 +528,27 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     return matches
 
 
-def calculate_aggregate_rankings(
-    stage2_results: List[Dict[str, Any]],
+def add_ranking_positions(
+    model_positions: Dict[str, List[int]],
+    parsed_ranking: List[str],
     label_to_model: Dict[str, str]
-) -> List[Dict[str, Any]]:
+):
     """
-    Calculate aggregate rankings across all models.
+    Record one model's ranking into the running per-model positions.
 
     Args:
-        stage2_results: Rankings from each model
+        model_positions: Mapping of model name to positions received so far (updated in place)
+        parsed_ranking: Response labels in ranked order, from parse_ranking_from_text
         label_to_model: Mapping from anonymous labels to model names
-
-    Returns:
-        List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
+    for position, label in enumerate(parsed_ranking, start=1):
+        if label in label_to_model:
+            model_name = label_to_model[label]
+            model_positions[model_name].append(position)
 
-    # Track positions for each model
-    model_positions = defaultdict(list)
-
-    for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
-
-        for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
 
+def _average_positions(model_positions: Dict[str, List[int]]) -> List[Dict[str, Any]]:
+    """Turn per-model positions into aggregate rankings (untraced)."""
     # Calculate average position for each model
     aggregate = []
     for model, positions in model_positions.items():
@@ -255,6 +566,48 @@ def calculate_aggregate_rankings(
     return aggregate
 
 
+@traced("aggregation", stage="stage2")
+def summarize_ranking_positions(model_positions: Dict[str, List[int]]) -> List[Dict[str, Any]]:
+    """
+    Turn per-model positions into aggregate rankings.
+
+    Args:
+        model_positions: Mapping of model name to positions received so far
+
+    Returns:
+        List of dicts with model name and average rank, sorted best to worst
+    """
+    return _average_positions(model_positions)
+
+
+@traced("aggregation", stage="stage2")
+def calculate_aggregate_rankings(
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    Calculate aggregate rankings across all models.
+
+    Args:
+        stage2_results: Rankings from each model
+        label_to_model: Mapping from anonymous labels to model names
+
+    Returns:
+        List of dicts with model name and average rank, sorted best to worst
+    """
+    # Track positions for each model
+    model_positions = defaultdict(list)
+
+    for ranking in stage2_results:
+        # Parse the ranking from the structured format
+        parsed_ranking = parse_ranking_from_text(ranking['ranking'])
+        add_ranking_positions(model_positions, parsed_ranking, label_to_model)
+
+    # Not summarize_ranking_positions(): this call is already one aggregation span
+    return _average_positions(model_positions)
+
+
+@instrument_stage("title")
 async def generate_conversation_title(user_query: str) -> str:
     """
     Generate a short title for a conversation based on the first user message.
@@ -275,7 +628,7 @@ Title:"""
     messages = [{"role": "user", "content": title_prompt}]
 
     # Use gemini-2.5-flash for title generation (fast and cheap)
-    response = await query_model("google/gemini-2.5-flash", messages, timeout=30.0)
+    response = await query_model("google/gemini-2.5-flash", messages, timeout=30.0, stage="title")
 
     if response is None:
         # Fallback to a generic title
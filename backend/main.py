@@ -1,18 +1,71 @@
 """FastAPI backend for LLM Council."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional
 import uuid
 import json
 import asyncio
 
-from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+from .storage import aio as storage, encode_cursor
+from .storage.conversation_cache import conversation_cache
+from .storage.recompress import recompression_loop
+from .config import (
+    HTTP_POOL_CONFIG,
+    COUNCIL_MODELS,
+    CHAIRMAN_MODEL,
+    STORAGE_COMPRESSION,
+    RUNS_CONFIG,
+    USAGE_CONFIG,
+)
+from .providers.base import http2_available
+from .providers.factory import (
+    init_providers,
+    close_providers,
+    response_cache,
+    scheduler,
+    hedge_budget,
+)
+from .council import run_full_council, generate_conversation_title
+from .runs import run_manager
+from . import metrics
+from .tracing import start_trace
+from .usage import run_usage, usage_records, summarize_usage
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build providers and resume interrupted runs at startup; close connection pools and storage on shutdown."""
+    if HTTP_POOL_CONFIG["http2"] and not http2_available():
+        print("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1 keep-alive")
+
+    problems = init_providers(COUNCIL_MODELS + [CHAIRMAN_MODEL])
+    for model_id, reason in problems.items():
+        print(f"Model {model_id} is unusable: {reason}")
+
+    if RUNS_CONFIG["resume_on_startup"]:
+        await run_manager.resume_pending()
 
-app = FastAPI(title="LLM Council API")
+    recompression_task = None
+    if STORAGE_COMPRESSION["recompress_interval"] > 0:
+        recompression_task = asyncio.create_task(recompression_loop(
+            STORAGE_COMPRESSION["recompress_interval"],
+            STORAGE_COMPRESSION["recompress_min_growth"]
+        ))
+
+    yield
+    if recompression_task is not None:
+        recompression_task.cancel()
+    await run_manager.close()
+    await close_providers()
+    await conversation_cache.close()
+    await storage.close()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -21,6 +74,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+# Export the existing component counters alongside the request metrics
+metrics.registry.register_stats(
+    "council_response_cache", "Response cache counter (see /api/cache/stats)", response_cache.stats
+)
+metrics.registry.register_stats(
+    "council_conversation_cache", "Conversation cache counter", conversation_cache.stats
+)
+metrics.registry.register_stats(
+    "council_scheduler", "Provider requests waiting for a concurrency or rate limit", scheduler.stats
+)
+metrics.registry.register_stats(
+    "council_hedge", "Hedged request counter", hedge_budget.stats
 )
 
 
@@ -43,11 +111,83 @@ class ConversationMetadata(BaseModel):
 
 
 class Conversation(BaseModel):
-    """Full conversation with all messages."""
+    """Conversation with all messages, or a range of them."""
     id: str
     created_at: str
     title: str
     messages: List[Dict[str, Any]]
+    message_count: Optional[int] = None
+    offset: int = 0
+
+
+# Stage payloads an assistant message can carry, and the projections of them
+STAGE_FIELDS = ("stage1", "stage2", "stage3")
+DETAIL_FIELDS = STAGE_FIELDS + ("trace",)
+PROJECTION_FIELDS = set(DETAIL_FIELDS) | {"stage2_rankings"}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[set]:
+    """
+    Parse a comma-separated 'fields' query parameter.
+
+    Args:
+        fields: e.g. "stage3" or "stage2_rankings,stage3"; None keeps everything
+
+    Returns:
+        Set of requested fields, or None for no projection
+
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - PROJECTION_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return requested
+
+
+def project_message(message: Dict[str, Any], fields: Optional[set]) -> Dict[str, Any]:
+    """
+    Keep only the requested stage payloads (and trace) of an assistant message.
+
+    'stage2_rankings' keeps Stage 2 without the evaluation text (model and
+    parsed ranking only). Dropped stages are listed under 'omitted' so the
+    client knows it can load them from the message details endpoint.
+
+    Args:
+        message: Stored message dict
+        fields: Requested fields from parse_fields(), or None for everything
+
+    Returns:
+        Projected message dict (user messages are returned unchanged)
+    """
+    if fields is None or message.get("role") != "assistant":
+        return message
+
+    projected = {key: value for key, value in message.items() if key not in DETAIL_FIELDS}
+    omitted = []
+    for stage in DETAIL_FIELDS:
+        if stage not in message:
+            continue
+        if stage in fields:
+            projected[stage] = message[stage]
+        elif stage == "stage2" and "stage2_rankings" in fields:
+            projected["stage2"] = [
+                {"model": result.get("model"), "parsed_ranking": result.get("parsed_ranking", [])}
+                for result in message["stage2"] or []
+            ]
+            omitted.append("stage2_text")
+        else:
+            omitted.append(stage)
+
+    if omitted:
+        projected["omitted"] = omitted
+    return projected
 
 
 @app.get("/")
@@ -56,50 +196,129 @@ async def root():
     return {"status": "ok", "service": "LLM Council API"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Expose metrics in the Prometheus text format."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache hit/miss counters."""
+    return response_cache.stats()
+
+
+@app.get("/api/usage")
+async def usage_summary(
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    bucket: Optional[float] = Query(None, ge=0),
+    conversation_id: Optional[str] = None
+):
+    """
+    Summarize token usage and throughput per model.
+
+    'since' and 'until' are Unix times; 'bucket' is the width in seconds of
+    the time series buckets (0 = totals only).
+    """
+    records = await storage.read_usage(since, until, conversation_id)
+    bucket = USAGE_CONFIG["bucket"] if bucket is None else bucket
+    return {
+        "since": since,
+        "until": until,
+        "bucket": bucket,
+        **summarize_usage(records, bucket),
+    }
+
+
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
-    return storage.list_conversations()
+async def list_conversations(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[str] = None
+):
+    """
+    List conversations (metadata only), newest first.
+
+    With 'limit', a full page sets the X-Next-Cursor header; pass it back
+    as 'before' to get the next page.
+    """
+    try:
+        conversations = await conversation_cache.list_conversations(limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if limit is not None and len(conversations) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(conversations[-1])
+    return conversations
 
 
 @app.post("/api/conversations", response_model=Conversation)
 async def create_conversation(request: CreateConversationRequest):
     """Create a new conversation."""
     conversation_id = str(uuid.uuid4())
-    conversation = storage.create_conversation(conversation_id)
+    conversation = await conversation_cache.create_conversation(conversation_id)
     return conversation
 
 
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
-async def get_conversation(conversation_id: str):
-    """Get a specific conversation with all its messages."""
-    conversation = storage.get_conversation(conversation_id)
+async def get_conversation(
+    conversation_id: str,
+    offset: int = 0,
+    limit: Optional[int] = Query(None, ge=0),
+    fields: Optional[str] = None
+):
+    """
+    Get a conversation with its messages.
+
+    'offset' and 'limit' select a range of messages (a negative offset
+    counts from the end), and 'fields' projects assistant messages down to
+    some stages, e.g. fields=stage3 when opening a long thread.
+    """
+    projection = parse_fields(fields)
+    conversation = await conversation_cache.get_messages(conversation_id, offset, limit)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
+
+    conversation["messages"] = [
+        project_message(message, projection) for message in conversation["messages"]
+    ]
     return conversation
 
 
+@app.get("/api/conversations/{conversation_id}/messages/{index}")
+async def get_message(conversation_id: str, index: int, fields: Optional[str] = None):
+    """Get one message with its stage details (optionally projected with 'fields')."""
+    projection = parse_fields(fields)
+    conversation = await conversation_cache.get_messages(conversation_id, index, 1)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    if index < 0 or not conversation["messages"]:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return project_message(conversation["messages"][0], projection)
+
+
 @app.post("/api/conversations/{conversation_id}/message")
 async def send_message(conversation_id: str, request: SendMessageRequest):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
     """
+    trace = start_trace()
+
     # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await conversation_cache.get_messages(conversation_id, 0, 0)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
-
     # Add user message
-    storage.add_user_message(conversation_id, request.content)
+    index = await conversation_cache.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
-    if is_first_message:
+    # If this is the first message, generate a title (decided from where it
+    # was stored, so concurrent requests cannot both generate one)
+    if index == 0:
         title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
+        await conversation_cache.update_conversation_title(conversation_id, title)
 
     # Run the 3-stage council process
     stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
@@ -107,12 +326,17 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     )
 
     # Add assistant message with all stages
-    storage.add_assistant_message(
+    await conversation_cache.add_assistant_message(
         conversation_id,
         stage1_results,
         stage2_results,
-        stage3_result
+        stage3_result,
+        trace.to_dict(),
+        run_usage(trace)
     )
+    await storage.append_usage(usage_records(trace, conversation_id))
+    # Write the whole turn (user message, title, answer) at once
+    await conversation_cache.flush(conversation_id)
 
     # Return the complete response with metadata
     return {
@@ -123,76 +347,36 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     }
 
 
-@app.post("/api/conversations/{conversation_id}/message/stream")
-async def send_message_stream(conversation_id: str, request: SendMessageRequest):
-    """
-    Send a message and stream the 3-stage council process.
-    Returns Server-Sent Events as each stage completes.
+def sse_frame(event_id: int, event: Dict[str, Any]) -> str:
+    """Format one run event as a Server-Sent Events frame."""
+    return f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+
+
+def stream_run(run, last_event_id: int = -1) -> StreamingResponse:
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
-        raise HTTPException(status_code=404, detail="Conversation not found")
+    Stream a council run's events as SSE, replaying those after last_event_id.
 
-    # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    Args:
+        run: CouncilRun to stream
+        last_event_id: Id of the last event the client already has
 
+    Returns:
+        StreamingResponse with the event stream
+    """
     async def event_generator():
-        # Initialize variables to store results
-        stage1_results = []
-        stage2_results = []
-        label_to_model = {}
-        stage3_result = {
-            "model": "error",
-            "response": "Failed to generate response: An error occurred during processing."
-        }
-
+        metrics.sse_streams.inc()
+        metrics.sse_streams_active.inc()
         try:
-            # Add user message
-            storage.add_user_message(conversation_id, request.content)
-
-            # Start title generation in parallel (don't await yet)
-            title_task = None
-            if is_first_message:
-                title_task = asyncio.create_task(generate_conversation_title(request.content))
-
-            # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(request.content)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results)
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-
-            # Wait for title generation if it was started
-            if title_task:
-                title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
-
-            # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
-
-        except Exception as e:
-            # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            async for event_id, event in run.subscribe(last_event_id, RUNS_CONFIG["heartbeat"]):
+                if event is None:
+                    # Keepalive: writing to a closed connection detects the disconnect
+                    frame = b": keepalive\n\n"
+                else:
+                    frame = sse_frame(event_id, event).encode()
+                metrics.sse_bytes.inc(amount=len(frame))
+                yield frame
         finally:
-            # Always save assistant message with whatever data we have
-            # This ensures partial results are saved even if an error occurs
-            storage.add_assistant_message(
-                conversation_id,
-                stage1_results,
-                stage2_results,
-                stage3_result
-            )
+            metrics.sse_streams_active.dec()
 
     return StreamingResponse(
         event_generator(),
@@ -204,6 +388,87 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     )
 
 
+async def start_run(conversation_id: str, content: str, attached: bool = False):
+    """
+    Start a council run for a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: The user's message
+        attached: Whether the caller streams the run (see RUNS_CONFIG['on_disconnect'])
+
+    Returns:
+        The started CouncilRun
+
+    Raises:
+        HTTPException: If the conversation does not exist
+    """
+    conversation = await conversation_cache.get_messages(conversation_id, 0, 0)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    return run_manager.start(conversation_id, content, attached)
+
+
+@app.post("/api/conversations/{conversation_id}/message/stream")
+async def send_message_stream(conversation_id: str, request: SendMessageRequest):
+    """
+    Send a message and stream the 3-stage council process.
+
+    The council runs as a background job; its first event ('run_started')
+    carries the run id, which can be used to reattach to the stream via
+    GET /api/conversations/{id}/runs/{run_id}/events. If the client
+    disconnects and does not reattach, the run is cancelled or finished in
+    the background according to RUNS_CONFIG['on_disconnect'].
+    """
+    run = await start_run(conversation_id, request.content, attached=True)
+    return stream_run(run)
+
+
+@app.post("/api/conversations/{conversation_id}/runs", status_code=202)
+async def create_run(conversation_id: str, request: SendMessageRequest):
+    """Start a council run in the background and return its id."""
+    run = await start_run(conversation_id, request.content)
+    return run.summary()
+
+
+def get_run_or_404(conversation_id: str, run_id: str):
+    """Look up a run belonging to a conversation, or raise 404."""
+    run = run_manager.get(run_id)
+    if run is None or run.conversation_id != conversation_id:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@app.get("/api/conversations/{conversation_id}/runs/{run_id}")
+async def get_run(conversation_id: str, run_id: str):
+    """Get a council run's status."""
+    return get_run_or_404(conversation_id, run_id).summary()
+
+
+@app.get("/api/conversations/{conversation_id}/runs/{run_id}/events")
+async def get_run_events(
+    conversation_id: str,
+    run_id: str,
+    last_event_id: Optional[str] = Header(None),
+    after: Optional[int] = None
+):
+    """
+    Stream a council run's events as SSE.
+
+    Events after the Last-Event-ID header (or the 'after' query parameter)
+    are replayed first, then new events follow live until the run ends.
+    """
+    run = get_run_or_404(conversation_id, run_id)
+    resume_from = after if after is not None else -1
+    if last_event_id is not None:
+        try:
+            resume_from = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    return stream_run(run, resume_from)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,340 @@
+"""Lightweight Prometheus-style metrics for the council backend."""
+
+import bisect
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from .tracing import span
+
+
+# Latency buckets in seconds, from a cache hit to a slow reasoning model
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+
+# Storage calls are much faster than model calls
+STORAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a label set as '{a="x",b="y"}'."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value (integers without a trailing .0)."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """
+    Base class for a metric family with optional labels.
+
+    Label values are looked up in a plain dict keyed by a tuple, so
+    recording a sample costs a dict lookup and an addition. Metrics are
+    only updated from the event loop thread and need no locks.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Check a label tuple against the label names."""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return labels
+
+    def samples(self) -> List[str]:
+        """Render the metric's sample lines."""
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+    def render(self) -> str:
+        """Render the metric family in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """
+        Increase the counter.
+
+        Args:
+            *labels: Label values, in the order of the label names
+            amount: Amount to add
+        """
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Increase the gauge."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        """Decrease the gauge."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        """Set the gauge."""
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, ascending
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels: str, value: float):
+        """
+        Record one observation.
+
+        Args:
+            *labels: Label values, in the order of the label names
+            value: Observed value
+        """
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket counts (non-cumulative; +Inf last), sum
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def samples(self) -> List[str]:
+        """Render bucket, sum and count lines."""
+        lines = []
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Holds the metric families and the stats callbacks exported at scrape time."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, str, Callable[[], Dict[str, Any]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family (returned for chaining)."""
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, documentation: str, stats: Callable[[], Dict[str, Any]]):
+        """
+        Export a component's stats() dict as gauges, read on every scrape.
+
+        Each numeric entry becomes a gauge named '<prefix>_<key>'.
+
+        Args:
+            prefix: Metric name prefix
+            documentation: Help text, shared by the gauges
+            stats: Function returning the current stats
+        """
+        self._collectors.append((prefix, documentation, stats))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        blocks = [metric.render() for metric in self._metrics]
+        for prefix, documentation, stats in self._collectors:
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Error collecting {prefix} stats: {e}")
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{key}"
+                blocks.append(
+                    f"# HELP {name} {documentation}\n# TYPE {name} gauge\n{name} {_format_value(value)}"
+                )
+        return "\n".join(blocks) + "\n"
+
+
+registry = Registry()
+
+model_request_seconds = registry.register(Histogram(
+    "council_model_request_duration_seconds",
+    "End-to-end model request latency per stage, including queueing, retries and hedges",
+    ("stage", "model")
+))
+model_requests = registry.register(Counter(
+    "council_model_requests_total",
+    "Model requests per stage by outcome (success, failure, cancelled)",
+    ("stage", "model", "outcome")
+))
+model_tokens = registry.register(Counter(
+    "council_model_tokens_total",
+    "Tokens reported by the providers per stage and model, by kind (prompt, completion)",
+    ("stage", "model", "kind")
+))
+provider_attempt_seconds = registry.register(Histogram(
+    "council_provider_attempt_duration_seconds",
+    "Latency of single provider HTTP attempts",
+    ("provider", "model", "outcome")
+))
+provider_attempts = registry.register(Counter(
+    "council_provider_attempts_total",
+    "Provider HTTP attempts by outcome (success, timeout, rate_limited, error, cancelled)",
+    ("provider", "model", "outcome")
+))
+provider_in_flight = registry.register(Gauge(
+    "council_provider_requests_in_flight",
+    "Provider HTTP requests currently running",
+    ("provider",)
+))
+stage_seconds = registry.register(Histogram(
+    "council_stage_duration_seconds",
+    "Duration of each council stage",
+    ("stage", "function")
+))
+stages_in_flight = registry.register(Gauge(
+    "council_stages_in_flight",
+    "Council stages currently running",
+    ("stage",)
+))
+storage_seconds = registry.register(Histogram(
+    "council_storage_operation_duration_seconds",
+    "Storage call latency, including the wait for a storage thread",
+    ("operation",),
+    buckets=STORAGE_BUCKETS
+))
+storage_errors = registry.register(Counter(
+    "council_storage_errors_total",
+    "Storage calls that raised",
+    ("operation",)
+))
+sse_streams_active = registry.register(Gauge(
+    "council_sse_streams_active",
+    "Server-Sent Events streams currently open"
+))
+sse_streams = registry.register(Counter(
+    "council_sse_streams_total",
+    "Server-Sent Events streams opened"
+))
+sse_bytes = registry.register(Counter(
+    "council_sse_bytes_total",
+    "Bytes written to Server-Sent Events streams"
+))
+runs_active = registry.register(Gauge(
+    "council_runs_active",
+    "Council runs in progress"
+))
+runs_finished = registry.register(Counter(
+    "council_runs_total",
+    "Finished council runs by status (complete, error, cancelled)",
+    ("status",)
+))
+
+
+def instrument_stage(stage: str):
+    """
+    Decorate a stage function (coroutine or async generator) to time it,
+    both in the metrics and as a 'stage' span of the run's trace.
+
+    Args:
+        stage: Stage label ("stage1", "stage2", "stage3", "title")
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        name = func.__name__
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                stages_in_flight.inc(stage)
+                start = time.perf_counter()
+                try:
+                    with span("stage", stage=stage, function=name):
+                        async for item in func(*args, **kwargs):
+                            yield item
+                finally:
+                    stages_in_flight.dec(stage)
+                    stage_seconds.observe(stage, name, value=time.perf_counter() - start)
+            return wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            stages_in_flight.inc(stage)
+            start = time.perf_counter()
+            try:
+                with span("stage", stage=stage, function=name):
+                    return await func(*args, **kwargs)
+            finally:
+                stages_in_flight.dec(stage)
+                stage_seconds.observe(stage, name, value=time.perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    return registry.render()
@@ -6,7 +6,19 @@ from .openai import OpenAIProvider
 from .doubao import DoubaoProvider
 from .deepseek import DeepSeekProvider
 from .ollama import OllamaProvider
-from .factory import get_provider, query_model, query_models_parallel
+from .sim import SimProvider
+from .registry import ProviderRegistry
+from .factory import (
+    get_provider,
+    init_providers,
+    close_providers,
+    query_model,
+    query_models_parallel,
+    query_models_as_completed,
+    query_models_quorum,
+    stream_model,
+    stream_models_parallel,
+)
 
 __all__ = [
     "ModelProvider",
@@ -15,7 +27,15 @@ __all__ = [
     "DoubaoProvider",
     "DeepSeekProvider",
     "OllamaProvider",
+    "SimProvider",
+    "ProviderRegistry",
     "get_provider",
+    "init_providers",
+    "close_providers",
     "query_model",
     "query_models_parallel",
+    "query_models_as_completed",
+    "query_models_quorum",
+    "stream_model",
+    "stream_models_parallel",
 ]
@@ -1,7 +1,125 @@
 """Abstract base class for model providers."""
 
+import importlib.util
+import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+import httpx
+
+from ..config import HTTP_POOL_CONFIG
+
+
+def http2_available() -> bool:
+    """Check whether the optional 'h2' package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse an OpenAI-style Server-Sent Events body into JSON payloads.
+
+    An event's 'data:' lines are joined with newlines and the event ends at
+    a blank line, as in the SSE spec; comments (':' keep-alives) and other
+    fields are ignored. An event left unterminated at the end of the body
+    is still decoded.
+
+    Args:
+        response: Streaming httpx response
+
+    Yields:
+        Decoded JSON object of each event with data, stopping at '[DONE]'
+
+    Raises:
+        ValueError: If an event's data is not valid JSON
+    """
+    lines: List[str] = []
+    async for line in response.aiter_lines():
+        if line:
+            if line.startswith('data:'):
+                value = line[5:]
+                lines.append(value[1:] if value.startswith(' ') else value)
+            continue
+        if not lines:
+            continue
+        data = '\n'.join(lines).strip()
+        lines = []
+        if data == '[DONE]':
+            return
+        if data:
+            yield json.loads(data)
+
+    data = '\n'.join(lines).strip()
+    if data and data != '[DONE]':
+        yield json.loads(data)
+
+
+async def iter_ndjson(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse a newline-delimited JSON body (as streamed by Ollama).
+
+    Args:
+        response: Streaming httpx response
+
+    Yields:
+        Decoded JSON object from each non-empty line (a final line without
+        a newline included)
+
+    Raises:
+        ValueError: If a line is not valid JSON, such as one cut off when
+            the connection dropped
+    """
+    async for line in response.aiter_lines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def openai_usage(usage: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize an OpenAI-style 'usage' block.
+
+    Args:
+        usage: The API's usage dict ('prompt_tokens', 'completion_tokens', ...), or None
+
+    Returns:
+        Dict with 'prompt_tokens', 'completion_tokens' and 'total_tokens', or None
+    """
+    if not usage:
+        return None
+    prompt = usage.get('prompt_tokens') or 0
+    completion = usage.get('completion_tokens') or 0
+    return {
+        'prompt_tokens': prompt,
+        'completion_tokens': completion,
+        'total_tokens': usage.get('total_tokens') or prompt + completion,
+    }
+
+
+def ollama_usage(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Extract token counts and timings from Ollama's final response.
+
+    Ollama reports 'prompt_eval_count' and 'eval_count' tokens, and the time
+    spent on each in nanoseconds, which gives the exact generation speed.
+
+    Args:
+        data: Final (done) response object
+
+    Returns:
+        Dict with 'prompt_tokens', 'completion_tokens', 'total_tokens',
+        'prompt_seconds' and 'generation_seconds', or None if not reported
+    """
+    if 'eval_count' not in data and 'prompt_eval_count' not in data:
+        return None
+    prompt = data.get('prompt_eval_count') or 0
+    completion = data.get('eval_count') or 0
+    return {
+        'prompt_tokens': prompt,
+        'completion_tokens': completion,
+        'total_tokens': prompt + completion,
+        'prompt_seconds': (data.get('prompt_eval_duration') or 0) / 1e9,
+        'generation_seconds': (data.get('eval_duration') or 0) / 1e9,
+    }
 
 
 class ModelProvider(ABC):
@@ -15,6 +133,56 @@ class ModelProvider(ABC):
             provider_config: Configuration dict for this provider
         """
         self.config = provider_config
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the provider's shared HTTP client, creating it on first use.
+
+        The client keeps a pool of keep-alive connections (HTTP/2 when
+        available) that is reused by every request to this provider.
+        Timeouts are passed per request, so one client serves all callers.
+
+        Returns:
+            Pooled httpx.AsyncClient
+        """
+        if self._client is None or self._client.is_closed:
+            pool = {**HTTP_POOL_CONFIG, **self.config.get('pool', {})}
+            self._client = httpx.AsyncClient(
+                http2=pool['http2'] and http2_available(),
+                limits=httpx.Limits(
+                    max_connections=pool['max_connections'],
+                    max_keepalive_connections=pool['max_keepalive_connections'],
+                    keepalive_expiry=pool['keepalive_expiry'],
+                ),
+                timeout=120.0,
+            )
+        return self._client
+
+    async def probe(self) -> bool:
+        """
+        Check whether the provider's endpoint is reachable again.
+
+        Used by the circuit breaker while it is open. Any HTTP answer below
+        500 counts as reachable, even an auth or not-found error.
+
+        Returns:
+            True if the endpoint answered, False otherwise
+        """
+        base_url = getattr(self, 'base_url', None)
+        if not base_url:
+            return True
+        try:
+            response = await self.get_client().get(base_url, timeout=10.0)
+        except httpx.HTTPError:
+            return False
+        return response.status_code < 500
+
+    async def aclose(self):
+        """Close the provider's HTTP client and release pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @abstractmethod
     async def query_model(
@@ -32,10 +200,44 @@ class ModelProvider(ABC):
             timeout: Request timeout in seconds
 
         Returns:
-            Response dict with 'content' and optional 'reasoning_details', or None if failed
+            Response dict with 'content', optional 'reasoning_details' and
+            optional 'usage' (see openai_usage)
+
+        Raises:
+            ProviderError: Classified error (see errors.classify_error) if the
+                request failed, so the caller can decide whether to retry
         """
         pass
 
+    async def stream_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a single model's response as it is generated.
+
+        Providers that support streaming override this. The default falls
+        back to query_model and yields the whole response as one chunk.
+
+        Args:
+            model: Model identifier (without provider prefix)
+            messages: List of message dicts with 'role' and 'content'
+            timeout: Request timeout in seconds
+
+        Yields:
+            Chunk dicts with a 'content' text delta, then a {'usage': ...}
+            chunk if the provider reported token counts
+
+        Raises:
+            ProviderError: If the model fails to respond
+        """
+        response = await self.query_model(model, messages, timeout)
+        yield {'content': response.get('content') or ''}
+        if response.get('usage'):
+            yield {'usage': response['usage']}
+
     @abstractmethod
     def supports_streaming(self) -> bool:
         """
@@ -0,0 +1,187 @@
+"""Content-addressed cache for model responses."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def cache_key(model_id: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Hash a model identifier and its messages into a cache key.
+
+    Messages are serialized canonically (sorted keys, no whitespace), so
+    equal conversations always map to the same key.
+
+    Args:
+        model_id: Full model identifier
+        messages: List of message dicts sent to the model
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(
+        {"model": model_id, "messages": messages},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: an in-memory LRU in front of optional disk files.
+
+    The memory tier is bounded by entry count and by approximate payload
+    size; both tiers expire entries after 'ttl' seconds. Disk entries are
+    promoted to memory on a hit. Responses are copied in and out, so a
+    caller changing a response it got cannot change the cached entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl: Optional[float],
+        disk_dir: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries kept in memory
+            max_bytes: Maximum approximate payload bytes kept in memory
+            ttl: Seconds an entry stays valid, or None to never expire
+            disk_dir: Directory for the disk tier, or None to disable it
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, created_at: float) -> bool:
+        """Check whether an entry created at the given time is past its TTL."""
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            Copy of the cached response dict, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            created_at, _, response = entry
+            if not self._expired(created_at):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(response)
+            self._remove(key)
+
+        if self.disk_dir is not None:
+            stored = await asyncio.to_thread(self._read_disk, key)
+            if stored is not None and not self._expired(stored["created_at"]):
+                self._store_memory(key, stored["response"], stored["created_at"])
+                self.disk_hits += 1
+                return copy.deepcopy(stored["response"])
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, response: Dict[str, Any]):
+        """
+        Store a successful response.
+
+        Args:
+            key: Cache key from cache_key()
+            response: Response dict to cache
+        """
+        created_at = time.time()
+        response = copy.deepcopy(response)
+        self._store_memory(key, response, created_at)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, response, created_at)
+
+    def _store_memory(self, key: str, response: Dict[str, Any], created_at: float):
+        """Insert into the memory tier and evict least recently used entries."""
+        if key in self._entries:
+            self._remove(key)
+
+        size = len(json.dumps(response, ensure_ascii=False))
+        self._entries[key] = (created_at, size, response)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        """Drop an entry from the memory tier."""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _disk_path(self, key: str) -> str:
+        """Get the disk path for a key, fanned out by its first two hex digits."""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from disk, or None if missing or unreadable."""
+        try:
+            with open(self._disk_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, response: Dict[str, Any], created_at: float):
+        """Write an entry to disk atomically."""
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A unique temp file, since concurrent puts of one key run on different threads
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"created_at": created_at, "response": response}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def clear(self):
+        """Drop all in-memory entries (the disk tier is left alone)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and memory usage."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
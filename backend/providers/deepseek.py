@@ -1,8 +1,8 @@
 """DeepSeek provider implementation."""
 
-import httpx
-from typing import List, Dict, Any, Optional
-from .base import ModelProvider
+from typing import List, Dict, Any, Optional, AsyncIterator
+from .base import ModelProvider, iter_sse_data, openai_usage
+from .errors import classify_error
 
 
 class DeepSeekProvider(ModelProvider):
@@ -37,7 +37,10 @@ class DeepSeekProvider(ModelProvider):
             timeout: Request timeout in seconds
 
         Returns:
-            Response dict with 'content', or None if failed
+            Response dict with 'content', and 'usage' (token counts, or None)
+
+        Raises:
+            ProviderError: Classified error if the request failed
         """
         api_url = f"{self.base_url}/chat/completions"
 
@@ -52,25 +55,76 @@ class DeepSeekProvider(ModelProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    api_url,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                message = data['choices'][0]['message']
-
-                return {
-                    'content': message.get('content'),
-                    'reasoning_details': message.get('reasoning_details')
-                }
+            response = await self.get_client().post(
+                api_url,
+                headers=headers,
+                json=payload,
+                timeout=timeout
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            message = data['choices'][0]['message']
+
+            return {
+                'content': message.get('content'),
+                'reasoning_details': message.get('reasoning_details'),
+                'usage': openai_usage(data.get('usage'))
+            }
 
         except Exception as e:
-            print(f"Error querying DeepSeek model {model}: {e}")
-            return None
+            # Classified so the factory can decide whether to retry
+            raise classify_error(e) from e
+
+    async def stream_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a model's response via DeepSeek API.
+
+        Args:
+            model: Model identifier (e.g., "deepseek-chat", "deepseek-reasoner")
+            messages: List of message dicts with 'role' and 'content'
+            timeout: Request timeout in seconds
+
+        Yields:
+            Chunk dicts with a 'content' text delta, then a {'usage': ...}
+            chunk if the API reported token counts
+        """
+        api_url = f"{self.base_url}/chat/completions"
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            # Ask for token counts in a final chunk
+            "stream_options": {"include_usage": True},
+        }
+
+        async with self.get_client().stream(
+            "POST",
+            api_url,
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        ) as response:
+            response.raise_for_status()
+
+            async for data in iter_sse_data(response):
+                choices = data.get('choices') or [{}]
+                delta = choices[0].get('delta') or {}
+                if delta.get('content'):
+                    yield {'content': delta['content']}
+                if data.get('usage'):
+                    yield {'usage': openai_usage(data['usage'])}
 
     def supports_streaming(self) -> bool:
         """Check if provider supports streaming."""
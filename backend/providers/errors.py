@@ -0,0 +1,147 @@
+"""Errors raised by model providers."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+
+class ProviderError(Exception):
+    """
+    Base class for classified provider failures.
+
+    'retryable' tells the caller whether the same request may succeed if
+    sent again; 'trips_breaker' whether it counts against the endpoint's health.
+    """
+
+    retryable = False
+    trips_breaker = False
+
+
+class ProviderTimeoutError(ProviderError):
+    """The request timed out."""
+
+    retryable = True
+    trips_breaker = True
+
+
+class ProviderConnectionError(ProviderError):
+    """The provider could not be reached (DNS, connect, reset, protocol errors)."""
+
+    retryable = True
+    trips_breaker = True
+
+
+class ProviderServerError(ProviderError):
+    """The provider answered with an HTTP 5xx."""
+
+    retryable = True
+    trips_breaker = True
+
+    def __init__(self, message: str, status_code: int):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error description
+            status_code: HTTP status code returned
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ProviderClientError(ProviderError):
+    """The provider rejected the request with an HTTP 4xx (bad key, unknown model, ...)."""
+
+    def __init__(self, message: str, status_code: int):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error description
+            status_code: HTTP status code returned
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RateLimitError(ProviderError):
+    """The provider rejected the request with HTTP 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error description
+            retry_after: Seconds the provider asked us to wait, if it said so
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ProviderError):
+    """The endpoint's circuit breaker is open, so the request was not sent."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # Dates with a "-0000" zone parse as naive; HTTP dates are always UTC
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_error(error: Exception) -> ProviderError:
+    """
+    Map an exception from a provider call to a classified ProviderError.
+
+    Args:
+        error: Exception raised while querying or streaming a model
+
+    Returns:
+        The error itself if already classified, otherwise a ProviderError
+        subclass describing it (plain ProviderError for anything unexpected,
+        such as a malformed response body)
+    """
+    if isinstance(error, ProviderError):
+        return error
+
+    if isinstance(error, httpx.TimeoutException):
+        return ProviderTimeoutError(f"Timed out: {error!r}")
+
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        status = response.status_code
+        if status == 429:
+            return RateLimitError(
+                str(error),
+                retry_after=parse_retry_after(response.headers.get('retry-after'))
+            )
+        if status >= 500:
+            return ProviderServerError(str(error), status)
+        return ProviderClientError(str(error), status)
+
+    if isinstance(error, httpx.TransportError):
+        return ProviderConnectionError(f"Connection failed: {error!r}")
+
+    return ProviderError(f"{type(error).__name__}: {error}")
@@ -1,14 +1,41 @@
 """Provider factory for creating appropriate model providers."""
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Callable
 from ..providers import (
+    ModelProvider,
     OpenRouterProvider,
     OpenAIProvider,
     DoubaoProvider,
     DeepSeekProvider,
     OllamaProvider,
+    SimProvider,
+)
+from .registry import ProviderRegistry
+from .hedging import LatencyTracker, HedgeBudget, hedged_call
+from .scheduler import RateLimitScheduler
+from .resilience import CircuitBreaker, retry_delay
+from .cache import ResponseCache, cache_key
+from .errors import (
+    ProviderError,
+    ProviderTimeoutError,
+    RateLimitError,
+    CircuitOpenError,
+    classify_error,
+)
+from .. import metrics
+from ..tracing import span
+from ..config import (
+    MODEL_CONFIGS,
+    HEDGE_CONFIG,
+    RATE_LIMITS,
+    RATE_LIMIT_MAX_RETRIES,
+    RETRY_CONFIG,
+    CIRCUIT_BREAKER_CONFIG,
+    RESPONSE_CACHE,
 )
-from ..config import MODEL_CONFIGS
 
 
 # Provider registry mapping provider names to their classes
@@ -18,8 +45,37 @@ PROVIDER_CLASSES = {
     "doubao": DoubaoProvider,
     "deepseek": DeepSeekProvider,
     "ollama": OllamaProvider,
+    "sim": SimProvider,
 }
 
+# Process-wide registry: each provider is built once and shared, so its
+# connection pool and other per-provider state live across requests
+registry = ProviderRegistry(PROVIDER_CLASSES, MODEL_CONFIGS)
+
+# Recent latencies per route, used to time hedged requests
+latency_tracker = LatencyTracker()
+
+# Shared cap on how many requests may be hedged
+hedge_budget = HedgeBudget(HEDGE_CONFIG["budget_ratio"], HEDGE_CONFIG["budget_burst"])
+
+# Per-provider/per-model concurrency and rate limits
+scheduler = RateLimitScheduler(RATE_LIMITS)
+
+# Shared response cache in front of query_model/stream_model
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE["max_entries"],
+    max_bytes=RESPONSE_CACHE["max_bytes"],
+    ttl=RESPONSE_CACHE["ttl"],
+    disk_dir=RESPONSE_CACHE["disk_dir"]
+)
+
+# Circuit breakers keyed by "provider:base_url"
+breakers: Dict[str, CircuitBreaker] = {}
+
+# Callback told when a model request is queued: (model_id, info) where info is
+# {'reason': 'concurrency' | 'rate_limit' | 'retry_after', 'wait': seconds or None}
+QueuedCallback = Callable[[str, Dict[str, Any]], None]
+
 
 def parse_model_identifier(model_id: str) -> tuple[str, str]:
     """
@@ -50,9 +106,9 @@ def parse_model_identifier(model_id: str) -> tuple[str, str]:
     return provider, model_name
 
 
-def get_provider(provider_name: str):
+def get_provider(provider_name: str) -> ModelProvider:
     """
-    Get a provider instance by name.
+    Get the shared provider instance by name.
 
     Args:
         provider_name: Name of the provider (e.g., "openai", "ollama")
@@ -63,42 +119,621 @@ def get_provider(provider_name: str):
     Raises:
         ValueError: If provider is not configured or not supported
     """
-    if provider_name not in PROVIDER_CLASSES:
-        raise ValueError(f"Unsupported provider: {provider_name}")
+    return registry.get(provider_name)
 
-    if provider_name not in MODEL_CONFIGS:
-        raise ValueError(f"Provider '{provider_name}' is not configured in MODEL_CONFIGS")
 
-    provider_config = MODEL_CONFIGS[provider_name]
-    provider_class = PROVIDER_CLASSES[provider_name]
+def init_providers(model_ids: List[str]) -> Dict[str, str]:
+    """
+    Build and validate the providers behind the given models up front.
+
+    Args:
+        model_ids: Full model identifiers (e.g., COUNCIL_MODELS + [CHAIRMAN_MODEL])
+
+    Returns:
+        Dict mapping each unusable model identifier to the reason it is unusable
+    """
+    problems = {}
+    for model_id in model_ids:
+        provider_name, _ = parse_model_identifier(model_id)
+        try:
+            registry.get(provider_name)
+        except ValueError as e:
+            problems[model_id] = str(e)
+    return problems
 
-    return provider_class(provider_config)
+
+async def close_providers():
+    """Close all live providers and their pooled HTTP connections."""
+    for breaker in breakers.values():
+        breaker.close()
+    breakers.clear()
+    await registry.close()
+
+
+def cache_enabled_for(stage: Optional[str]) -> bool:
+    """
+    Check whether the response cache applies to a council stage.
+
+    Args:
+        stage: Stage name (e.g., "stage1", "title"), or None
+
+    Returns:
+        True if responses for this stage are read from and written to the cache
+    """
+    if not RESPONSE_CACHE["enabled"]:
+        return False
+    return RESPONSE_CACHE["stages"].get(stage, RESPONSE_CACHE["default"])
+
+
+@contextmanager
+def _track_request(stage: Optional[str], model_id: str):
+    """
+    Time a model request end to end, count it by outcome and trace it.
+
+    The block sets result["ok"] to False on failure, and result["usage"] to
+    the token usage the provider reported, which is counted and added to
+    the request's span.
+    """
+    stage = stage or "none"
+    start = time.perf_counter()
+    result = {"ok": True, "usage": None}
+    with span("model", stage=stage, model=model_id) as attrs:
+        attrs["outcome"] = "cancelled"
+        try:
+            yield result
+            attrs["outcome"] = "success" if result["ok"] else "failure"
+            usage = result["usage"]
+            if usage:
+                attrs["usage"] = usage
+                metrics.model_tokens.inc(stage, model_id, "prompt", amount=usage.get("prompt_tokens") or 0)
+                metrics.model_tokens.inc(stage, model_id, "completion", amount=usage.get("completion_tokens") or 0)
+        except Exception:
+            attrs["outcome"] = "failure"
+            raise
+        finally:
+            metrics.model_request_seconds.observe(stage, model_id, value=time.perf_counter() - start)
+            metrics.model_requests.inc(stage, model_id, attrs["outcome"])
+
+
+@contextmanager
+def _track_attempt(provider_name: str, model_name: str):
+    """Time one provider HTTP attempt, count it by outcome, trace it and track it as in flight."""
+    metrics.provider_in_flight.inc(provider_name)
+    start = time.perf_counter()
+    with span("provider_attempt", provider=provider_name, model=model_name) as attrs:
+        attrs["outcome"] = "cancelled"
+        try:
+            yield
+            attrs["outcome"] = "success"
+        except Exception as e:
+            error = classify_error(e)
+            if isinstance(error, ProviderTimeoutError):
+                attrs["outcome"] = "timeout"
+            elif isinstance(error, RateLimitError):
+                attrs["outcome"] = "rate_limited"
+            else:
+                attrs["outcome"] = "error"
+            raise
+        finally:
+            metrics.provider_in_flight.dec(provider_name)
+            metrics.provider_attempt_seconds.observe(
+                provider_name, model_name, attrs["outcome"], value=time.perf_counter() - start
+            )
+            metrics.provider_attempts.inc(provider_name, model_name, attrs["outcome"])
 
 
 async def query_model(
     model_id: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    on_queued: Optional[QueuedCallback] = None,
+    stage: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model by its full identifier.
 
+    Requests wait for the provider's concurrency and rate limits. Timeouts,
+    connection errors and 5xx are retried with jittered backoff, 429s after
+    the provider's Retry-After period, and an endpoint whose circuit breaker
+    is open fails fast without being called.
+
     Args:
         model_id: Full model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        on_queued: Optional callback told when the request has to wait
+        stage: Council stage making the call, for per-stage cache settings
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details' and
+        optional 'usage' (token counts; absent for cached responses), or None if failed
+    """
+    with _track_request(stage, model_id) as result:
+        response = await _query_model(model_id, messages, timeout, on_queued, stage)
+        result["ok"] = response is not None
+        if response is not None:
+            result["usage"] = response.get('usage')
+    return response
+
+
+async def _query_model(
+    model_id: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_queued: Optional[QueuedCallback],
+    stage: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Query a model through the response cache and, if configured, hedging."""
+    use_cache = cache_enabled_for(stage)
+    if use_cache:
+        key = cache_key(model_id, messages)
+        cached = await response_cache.get(key)
+        if cached is not None:
+            return cached
+
+    alternates = HEDGE_CONFIG["routes"].get(model_id)
+    if HEDGE_CONFIG["enabled"] and alternates:
+        response = await _query_hedged(model_id, alternates, messages, timeout, on_queued)
+    else:
+        response = await _query_route(model_id, messages, timeout, on_queued)
+
+    if use_cache and response is not None:
+        # A cache hit uses no tokens, so it must not repeat the usage
+        await response_cache.put(key, {k: v for k, v in response.items() if k != 'usage'})
+    return response
+
+
+def _queued_notifier(
+    model_id: str,
+    on_queued: Optional[QueuedCallback]
+) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """Bind a model identifier to a queued callback for the scheduler."""
+    if on_queued is None:
+        return None
+    return lambda info: on_queued(model_id, info)
+
+
+def get_breaker(provider_name: str, provider: ModelProvider) -> CircuitBreaker:
+    """
+    Get the circuit breaker for a provider's endpoint, creating it on first use.
+
+    Args:
+        provider_name: Name of the provider
+        provider: Provider instance (its base_url identifies the endpoint)
+
+    Returns:
+        Shared CircuitBreaker for that provider/base_url
+    """
+    key = f"{provider_name}:{getattr(provider, 'base_url', '')}"
+    if key not in breakers:
+        breakers[key] = CircuitBreaker(
+            key,
+            failure_threshold=CIRCUIT_BREAKER_CONFIG["failure_threshold"],
+            reset_timeout=CIRCUIT_BREAKER_CONFIG["reset_timeout"],
+            probe_interval=CIRCUIT_BREAKER_CONFIG["probe_interval"],
+            probe=provider.probe
+        )
+    return breakers[key]
+
+
+def _plan_retry(
+    error: ProviderError,
+    provider_name: str,
+    breaker: CircuitBreaker,
+    attempts: Dict[str, int],
+    notify: Optional[Callable[[Dict[str, Any]], None]]
+) -> Optional[float]:
+    """
+    Record a failed attempt and decide whether to retry it.
+
+    Args:
+        error: Classified error from the attempt
+        provider_name: Provider the attempt went to
+        breaker: Circuit breaker for the provider's endpoint
+        attempts: Retry counters for this request (updated in place)
+        notify: Optional queued callback bound to the model
+
+    Returns:
+        Seconds to wait before retrying, or None to give up
+    """
+    if isinstance(error, CircuitOpenError):
+        return None
+
+    if isinstance(error, RateLimitError):
+        if attempts["rate_limited"] >= RATE_LIMIT_MAX_RETRIES:
+            return None
+        # The scheduler holds the provider for the Retry-After period, so the
+        # next slot acquisition does the waiting
+        delay = scheduler.backoff(provider_name, error.retry_after, attempts["rate_limited"])
+        attempts["rate_limited"] += 1
+        if notify is not None:
+            notify({"reason": "retry_after", "wait": delay})
+        return 0.0
+
+    if error.trips_breaker:
+        breaker.record_failure()
+
+    if not error.retryable or attempts["retries"] >= RETRY_CONFIG["max_retries"]:
+        return None
+
+    delay = retry_delay(attempts["retries"], RETRY_CONFIG["base_delay"], RETRY_CONFIG["max_delay"])
+    attempts["retries"] += 1
+    return delay
+
+
+async def _query_route(
+    model_id: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_queued: Optional[QueuedCallback] = None
+) -> Optional[Dict[str, Any]]:
+    """Query one route with scheduling, retries and circuit breaking."""
+    provider_name, model_name = parse_model_identifier(model_id)
+    provider = get_provider(provider_name)
+    breaker = get_breaker(provider_name, provider)
+    notify = _queued_notifier(model_id, on_queued)
+    attempts = {"retries": 0, "rate_limited": 0}
+
+    while True:
+        try:
+            trial = breaker.before_call()
+            try:
+                async with scheduler.slot(provider_name, model_name, notify):
+                    start = time.perf_counter()
+                    with _track_attempt(provider_name, model_name):
+                        response = await provider.query_model(model_name, messages, timeout)
+            finally:
+                # Also when cancelled, so a lost trial cannot keep the breaker shut
+                if trial:
+                    breaker.end_trial()
+        except Exception as e:
+            error = classify_error(e)
+            delay = _plan_retry(error, provider_name, breaker, attempts, notify)
+            if delay is None:
+                print(f"Error querying model {model_id}: {error}")
+                return None
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        latency_tracker.record(model_id, time.perf_counter() - start)
+        return response
+
+
+async def _query_hedged(
+    model_id: str,
+    alternates: List[str],
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_queued: Optional[QueuedCallback] = None
+) -> Optional[Dict[str, Any]]:
+    """Query a model, hedging to its alternate routes if the primary is slow."""
+    async def call(route: str) -> Optional[Dict[str, Any]]:
+        if route == model_id:
+            return await _query_route(route, messages, timeout, on_queued)
+        # An unusable alternate must not fail the primary request
+        try:
+            return await _query_route(route, messages, timeout)
+        except ValueError as e:
+            print(f"Skipping hedge route {route}: {e}")
+            return None
+
+    delay = latency_tracker.percentile(
+        model_id,
+        HEDGE_CONFIG["delay_percentile"],
+        HEDGE_CONFIG["min_samples"]
+    )
+    if delay is None:
+        delay = HEDGE_CONFIG["initial_delay"]
+
+    return await hedged_call(model_id, alternates, call, delay, hedge_budget)
+
+
+async def stream_model(
+    model_id: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    on_queued: Optional[QueuedCallback] = None,
+    stage: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a single model's response by its full identifier.
+
+    A cached response is replayed as a single chunk; a completed stream is
+    cached like a query_model response.
+
+    Args:
+        model_id: Full model identifier (e.g., "openai/gpt-4o")
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Request timeout in seconds
+        on_queued: Optional callback told when the request has to wait
+        stage: Council stage making the call, for per-stage cache settings
+
+    Yields:
+        Chunk dicts with a 'content' text delta, and a {'usage': ...} chunk
+        if the provider reported token counts
+
+    Raises:
+        ProviderError: Classified error if the stream failed
+    """
+    with _track_request(stage, model_id) as result:
+        async for chunk in _stream_model(model_id, messages, timeout, on_queued, stage):
+            if chunk.get('usage'):
+                result["usage"] = chunk['usage']
+            yield chunk
+
+
+async def _stream_model(
+    model_id: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_queued: Optional[QueuedCallback],
+    stage: Optional[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a model through the response cache."""
+    if not cache_enabled_for(stage):
+        async for chunk in _stream_route(model_id, messages, timeout, on_queued):
+            yield chunk
+        return
+
+    key = cache_key(model_id, messages)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        yield {'content': cached.get('content') or ''}
+        return
+
+    parts = []
+    async for chunk in _stream_route(model_id, messages, timeout, on_queued):
+        if chunk.get('content'):
+            parts.append(chunk['content'])
+        yield chunk
+    await response_cache.put(key, {'content': ''.join(parts), 'reasoning_details': None})
+
+
+async def _stream_route(
+    model_id: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_queued: Optional[QueuedCallback] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream one route with scheduling, retries and circuit breaking.
+
+    The scheduler slot is held for the whole stream. Failures are retried
+    like in query_model, but only until the first chunk has been yielded.
     """
     provider_name, model_name = parse_model_identifier(model_id)
     provider = get_provider(provider_name)
-    return await provider.query_model(model_name, messages, timeout)
+    breaker = get_breaker(provider_name, provider)
+    notify = _queued_notifier(model_id, on_queued)
+    attempts = {"retries": 0, "rate_limited": 0}
+
+    while True:
+        started = False
+        try:
+            trial = breaker.before_call()
+            try:
+                async with scheduler.slot(provider_name, model_name, notify):
+                    with _track_attempt(provider_name, model_name):
+                        async for chunk in provider.stream_model(model_name, messages, timeout):
+                            started = True
+                            yield chunk
+            finally:
+                if trial:
+                    breaker.end_trial()
+        except Exception as e:
+            error = classify_error(e)
+            if started:
+                # Output was already forwarded, so the stream cannot be replayed
+                if error.trips_breaker:
+                    breaker.record_failure()
+                delay = None
+            else:
+                delay = _plan_retry(error, provider_name, breaker, attempts, notify)
+            if delay is None:
+                if error is e:
+                    raise
+                raise error from e
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return
+
+
+async def stream_models_parallel(
+    model_ids: List[str],
+    messages: List[Dict[str, str]],
+    min_responses: Optional[int] = None,
+    soft_deadline: Optional[float] = None,
+    stage: Optional[str] = None
+) -> AsyncIterator[Tuple[str, str, Any]]:
+    """
+    Stream multiple models in parallel, interleaving their output.
+
+    Events are yielded as they arrive:
+        (model_id, "delta", text) for each streamed text chunk
+        (model_id, "done", (response, timing)) once a model finishes, where
+        response is a dict with the assembled 'content' and the 'usage' (or
+        None), or None if the model failed, and timing is a dict with the
+        model's own 'duration' in seconds
+        (model_id, "straggler", None) for each model cut off by the quorum
+        (model_id, "queued", info) when a model's request has to wait for a
+        concurrency or rate limit (see QueuedCallback)
+
+    Closing the iterator early cancels any models still streaming.
+
+    Args:
+        model_ids: List of full model identifiers
+        messages: List of message dicts to send to each model
+        min_responses: Stop once this many models succeeded (None = all)
+        soft_deadline: Seconds after which to stop, once at least one model
+            succeeded (None = no deadline)
+        stage: Council stage making the calls, for per-stage cache settings
+
+    Yields:
+        Tuples of (model_id, event_kind, payload)
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def on_queued(model_id: str, info: Dict[str, Any]):
+        queue.put_nowait((model_id, "queued", info))
+
+    async def pump(model_id: str):
+        start = time.perf_counter()
+        parts = []
+        usage = None
+        try:
+            async for chunk in stream_model(model_id, messages, on_queued=on_queued, stage=stage):
+                text = chunk.get('content')
+                if text:
+                    parts.append(text)
+                    await queue.put((model_id, "delta", text))
+                if chunk.get('usage'):
+                    usage = chunk['usage']
+        except Exception as e:
+            print(f"Error streaming model {model_id}: {e}")
+            await queue.put((model_id, "done", (None, {'duration': time.perf_counter() - start})))
+            return
+        response = {'content': ''.join(parts), 'usage': usage}
+        await queue.put((model_id, "done", (response, {'duration': time.perf_counter() - start})))
+
+    tasks = [asyncio.create_task(pump(model_id)) for model_id in model_ids]
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + soft_deadline if soft_deadline is not None else None
+    needed = min_responses or len(model_ids)
+    finished = set()
+    successes = 0
+
+    try:
+        while len(finished) < len(model_ids) and successes < needed:
+            # The deadline is soft: it only applies once someone has answered
+            timeout = None
+            if deadline is not None and successes:
+                timeout = max(0.0, deadline - loop.time())
+            try:
+                model_id, kind, payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            if kind == "done":
+                finished.add(model_id)
+                if payload[0] is not None:
+                    successes += 1
+            yield model_id, kind, payload
+
+        for model_id in model_ids:
+            if model_id not in finished:
+                yield model_id, "straggler", None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def query_models_as_completed(
+    model_ids: List[str],
+    messages: List[Dict[str, str]],
+    on_queued: Optional[QueuedCallback] = None,
+    stage: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Dict[str, float]]]:
+    """
+    Query multiple models in parallel, yielding each result as soon as it finishes.
+
+    Closing the iterator early cancels any models still running.
+
+    Args:
+        model_ids: List of full model identifiers
+        messages: List of message dicts to send to each model
+        on_queued: Optional callback told when a model's request has to wait
+        stage: Council stage making the calls, for per-stage cache settings
+
+    Yields:
+        Tuples of (model_id, response dict or None if failed, timing dict
+        with 'duration' in seconds), in completion order
+    """
+    async def timed_query(model_id: str):
+        start = time.perf_counter()
+        response = await query_model(model_id, messages, on_queued=on_queued, stage=stage)
+        return model_id, response, {'duration': time.perf_counter() - start}
+
+    tasks = [asyncio.create_task(timed_query(model_id)) for model_id in model_ids]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def query_models_quorum(
+    model_ids: List[str],
+    messages: List[Dict[str, str]],
+    min_responses: Optional[int] = None,
+    soft_deadline: Optional[float] = None,
+    stage: Optional[str] = None
+) -> Tuple[Dict[str, Optional[Dict[str, Any]]], List[str]]:
+    """
+    Query multiple models in parallel, stopping early once a quorum is reached.
+
+    Collection ends when every model finished, when 'min_responses' models
+    succeeded, or when 'soft_deadline' seconds passed with at least one
+    success. Models still running at that point are cancelled.
+
+    Args:
+        model_ids: List of full model identifiers
+        messages: List of message dicts to send to each model
+        min_responses: Stop once this many models succeeded (None = all)
+        soft_deadline: Seconds after which to stop, once at least one model
+            succeeded (None = no deadline)
+        stage: Council stage making the calls, for per-stage cache settings
+
+    Returns:
+        Tuple of (dict mapping finished model identifiers to response dict or
+        None if failed, list of straggler model identifiers that were cut off)
+    """
+    tasks = {
+        asyncio.create_task(query_model(model_id, messages, stage=stage)): model_id
+        for model_id in model_ids
+    }
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + soft_deadline if soft_deadline is not None else None
+    needed = min_responses or len(model_ids)
+    finished = {}
+    successes = 0
+    pending = set(tasks)
+
+    try:
+        while pending and successes < needed:
+            timeout = None
+            if deadline is not None and successes:
+                timeout = max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+
+            for task in done:
+                response = task.result()
+                finished[tasks[task]] = response
+                if response is not None:
+                    successes += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+    responses = {model_id: finished[model_id] for model_id in model_ids if model_id in finished}
+    stragglers = [model_id for model_id in model_ids if model_id not in finished]
+    return responses, stragglers
 
 
 async def query_models_parallel(
     model_ids: List[str],
-    messages: List[Dict[str, str]]
+    messages: List[Dict[str, str]],
+    stage: Optional[str] = None
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -106,14 +741,13 @@ async def query_models_parallel(
     Args:
         model_ids: List of full model identifiers
         messages: List of message dicts to send to each model
+        stage: Council stage making the calls, for per-stage cache settings
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     # Create tasks for all models
-    tasks = [query_model(model_id, messages) for model_id in model_ids]
+    tasks = [query_model(model_id, messages, stage=stage) for model_id in model_ids]
 
     # Wait for all to complete
     responses = await asyncio.gather(*tasks)
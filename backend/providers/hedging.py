@@ -0,0 +1,156 @@
+"""Hedged requests: race a slow primary route against an alternate route."""
+
+import asyncio
+import math
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Any
+
+
+class LatencyTracker:
+    """Keeps a sliding window of recent successful latencies per route."""
+
+    def __init__(self, window: int = 100):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of recent samples to keep per route
+        """
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, route: str, seconds: float):
+        """Record one successful call's latency for a route."""
+        samples = self._samples.get(route)
+        if samples is None:
+            samples = self._samples[route] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, route: str, percentile: float, min_samples: int) -> Optional[float]:
+        """
+        Get a latency percentile for a route.
+
+        Args:
+            route: Full model identifier of the route
+            percentile: Percentile to compute (0-100)
+            min_samples: Minimum samples required for a meaningful estimate
+
+        Returns:
+            Latency in seconds, or None if there are not enough samples yet
+        """
+        samples = self._samples.get(route)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+
+class HedgeBudget:
+    """
+    Caps hedges to a fraction of primary requests.
+
+    Every primary request earns 'ratio' tokens and every hedge spends one,
+    so over time at most ratio * requests hedges are sent. 'burst' bounds
+    how many unspent tokens can pile up during quiet periods.
+    """
+
+    def __init__(self, ratio: float, burst: float):
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Hedges allowed per primary request (e.g., 0.1 = 10%)
+            burst: Maximum number of hedges that can be saved up
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+    def earn(self):
+        """Credit the budget for one primary request."""
+        self.requests += 1
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend one hedge if the budget allows it."""
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.hedges += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hedge counters for monitoring."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+        }
+
+
+async def hedged_call(
+    primary: str,
+    alternates: List[str],
+    call: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    delay: float,
+    budget: HedgeBudget
+) -> Optional[Dict[str, Any]]:
+    """
+    Call the primary route, hedging to an alternate if it is slow or fails.
+
+    If the primary has not answered within 'delay' seconds (or fails before
+    that), a duplicate request goes to the next alternate route, budget
+    permitting. The first successful answer wins and the loser is cancelled.
+
+    Args:
+        primary: Primary route (full model identifier)
+        alternates: Alternate routes to the same model, in preference order
+        call: Coroutine function querying one route, returning None on failure
+        delay: Seconds to wait for the primary before hedging
+        budget: Shared hedge budget
+
+    Returns:
+        Response dict from whichever route answered first, or None if all failed
+    """
+    budget.earn()
+    primary_task = asyncio.create_task(call(primary))
+    tasks = {primary_task: primary}
+    pending = {primary_task}
+    remaining = list(alternates)
+
+    try:
+        while pending:
+            # Hedge only while another route is left and the budget allows it
+            timeout = delay if remaining and len(pending) == 1 else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                response = task.result()
+                if response is not None:
+                    if task is not primary_task:
+                        budget.hedge_wins += 1
+                    return response
+
+            if remaining and (not done or not pending) and budget.try_spend():
+                alternate = remaining.pop(0)
+                print(f"Hedging {primary} with {alternate}")
+                hedge_task = asyncio.create_task(call(alternate))
+                tasks[hedge_task] = alternate
+                pending.add(hedge_task)
+            elif not done:
+                # Budget exhausted: stop hedging and just wait for what is running
+                remaining = []
+
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
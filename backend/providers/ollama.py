@@ -1,8 +1,8 @@
 """Ollama provider implementation."""
 
-import httpx
-from typing import List, Dict, Any, Optional
-from .base import ModelProvider
+from typing import List, Dict, Any, Optional, AsyncIterator
+from .base import ModelProvider, iter_ndjson, ollama_usage
+from .errors import classify_error
 
 
 class OllamaProvider(ModelProvider):
@@ -33,7 +33,10 @@ class OllamaProvider(ModelProvider):
             timeout: Request timeout in seconds
 
         Returns:
-            Response dict with 'content', or None if failed
+            Response dict with 'content', and 'usage' (token counts, or None)
+
+        Raises:
+            ProviderError: Classified error if the request failed
         """
         api_url = f"{self.base_url}/api/chat"
 
@@ -45,23 +48,70 @@ class OllamaProvider(ModelProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    api_url,
-                    json=payload
-                )
-                response.raise_for_status()
+            response = await self.get_client().post(
+                api_url,
+                json=payload,
+                timeout=timeout
+            )
+            response.raise_for_status()
 
-                data = response.json()
+            data = response.json()
 
-                return {
-                    'content': data.get('message', {}).get('content', ''),
-                    'reasoning_details': None
-                }
+            return {
+                'content': data.get('message', {}).get('content', ''),
+                'reasoning_details': None,
+                'usage': ollama_usage(data)
+            }
 
         except Exception as e:
-            print(f"Error querying Ollama model {model}: {e}")
-            return None
+            # Classified so the factory can decide whether to retry
+            raise classify_error(e) from e
+
+    async def stream_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a model's response via Ollama API (newline-delimited JSON).
+
+        Args:
+            model: Model identifier (e.g., "llama3.1", "qwen2.5")
+            messages: List of message dicts with 'role' and 'content'
+            timeout: Request timeout in seconds
+
+        Yields:
+            Chunk dicts with a 'content' text delta, then a {'usage': ...}
+            chunk with the token counts of the final message
+        """
+        api_url = f"{self.base_url}/api/chat"
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+        }
+
+        async with self.get_client().stream(
+            "POST",
+            api_url,
+            json=payload,
+            timeout=timeout
+        ) as response:
+            response.raise_for_status()
+
+            async for data in iter_ndjson(response):
+                if data.get('error'):
+                    raise RuntimeError(data['error'])
+                content = data.get('message', {}).get('content')
+                if content:
+                    yield {'content': content}
+                if data.get('done'):
+                    usage = ollama_usage(data)
+                    if usage:
+                        yield {'usage': usage}
+                    break
 
     def supports_streaming(self) -> bool:
         """Check if provider supports streaming."""
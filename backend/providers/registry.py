@@ -0,0 +1,88 @@
+"""Process-wide registry of live provider instances."""
+
+from typing import Dict, Any, Type
+
+from .base import ModelProvider
+
+
+class ProviderRegistry:
+    """
+    Builds each provider once and hands out the same instance afterwards.
+
+    Per-provider state (connection pools, limiters, counters) lives on the
+    instance, so it is shared by every request for the life of the process.
+    Providers that fail to build are remembered, so a misconfigured provider
+    fails fast instead of re-validating its config on every call.
+    """
+
+    def __init__(
+        self,
+        provider_classes: Dict[str, Type[ModelProvider]],
+        model_configs: Dict[str, Dict[str, Any]]
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            provider_classes: Mapping of provider name to provider class
+            model_configs: Mapping of provider name to its configuration dict
+        """
+        self.provider_classes = provider_classes
+        self.model_configs = model_configs
+        self._instances: Dict[str, ModelProvider] = {}
+        self._failures: Dict[str, str] = {}
+
+    def get(self, provider_name: str) -> ModelProvider:
+        """
+        Get the provider instance, building it on first use.
+
+        Args:
+            provider_name: Name of the provider (e.g., "openai", "ollama")
+
+        Returns:
+            Shared provider instance
+
+        Raises:
+            ValueError: If provider is not supported, not configured, or failed to build
+        """
+        provider = self._instances.get(provider_name)
+        if provider is not None:
+            return provider
+
+        if provider_name in self._failures:
+            raise ValueError(self._failures[provider_name])
+
+        try:
+            provider = self._build(provider_name)
+        except ValueError as e:
+            self._failures[provider_name] = str(e)
+            raise
+
+        self._instances[provider_name] = provider
+        return provider
+
+    def _build(self, provider_name: str) -> ModelProvider:
+        """Validate config and construct a provider instance."""
+        if provider_name not in self.provider_classes:
+            raise ValueError(f"Unsupported provider: {provider_name}")
+
+        if provider_name not in self.model_configs:
+            raise ValueError(f"Provider '{provider_name}' is not configured in MODEL_CONFIGS")
+
+        provider_class = self.provider_classes[provider_name]
+        return provider_class(self.model_configs[provider_name])
+
+    def instances(self) -> Dict[str, ModelProvider]:
+        """Get a snapshot of all live provider instances by name."""
+        return dict(self._instances)
+
+    def failures(self) -> Dict[str, str]:
+        """Get the providers that failed to build, with their error messages."""
+        return dict(self._failures)
+
+    async def close(self):
+        """Close all live providers and forget them, including failures."""
+        for provider in self._instances.values():
+            await provider.aclose()
+        self._instances.clear()
+        self._failures.clear()
@@ -0,0 +1,142 @@
+"""Retry backoff and circuit breakers for provider endpoints."""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional
+
+from .errors import CircuitOpenError
+
+
+def retry_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    Compute a jittered exponential backoff delay ("full jitter").
+
+    Args:
+        attempt: Zero-based retry attempt
+        base_delay: Delay ceiling for the first retry, in seconds
+        max_delay: Upper bound for any delay, in seconds
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider endpoint.
+
+    closed    - requests flow; consecutive failures are counted
+    open      - requests fail fast with CircuitOpenError; a background task
+                probes the endpoint every 'probe_interval' seconds
+    half_open - after a successful probe (or 'reset_timeout' without one),
+                a single trial request is let through while the others keep
+                failing fast; its result closes or reopens the breaker
+
+    Only failures that say something about the endpoint's health (timeouts,
+    connection errors, 5xx) count; see ProviderError.trips_breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        probe_interval: float,
+        probe: Optional[Callable[[], Awaitable[bool]]] = None
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Endpoint name for logs (e.g., "ollama:http://localhost:11434")
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds after which an open breaker lets a trial through
+            probe_interval: Seconds between background health probes while open
+            probe: Coroutine function returning True if the endpoint is reachable
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_interval = probe_interval
+        self.probe = probe
+        self.state = "closed"
+        self.failures = 0
+        self._trial = False
+        self.opened_at = 0.0
+        self._trial = False
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def before_call(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request is the half-open trial; the caller must call
+            end_trial() once it is over, however it ends
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its
+                trial request still in flight
+        """
+        if self.state == "closed":
+            return False
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial:
+            self._trial = True
+            return True
+        raise CircuitOpenError(f"Circuit {self.state.replace('_', '-')} for {self.name}")
+
+    def end_trial(self):
+        """Let the next trial through once a half-open trial request is over."""
+        self._trial = False
+
+    def record_success(self):
+        """Record a successful request, closing the breaker."""
+        if self.state != "closed":
+            print(f"Circuit closed for {self.name}")
+        self.state = "closed"
+        self.failures = 0
+        self._trial = False
+
+    def record_failure(self):
+        """Record a failed request, opening the breaker if it is unhealthy."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        """Open the breaker and start probing the endpoint in the background."""
+        if self.state != "open":
+            print(f"Circuit opened for {self.name} after {self.failures} failures")
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self._trial = False
+
+        if self.probe is not None and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        """Probe the endpoint until it answers, then let trial requests through."""
+        while self.state == "open":
+            await asyncio.sleep(self.probe_interval)
+            if self.state != "open":
+                break
+            try:
+                healthy = await self.probe()
+            except Exception:
+                healthy = False
+            if healthy and self.state == "open":
+                self.state = "half_open"
+
+    def close(self):
+        """Stop background probing."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state for monitoring."""
+        return {"state": self.state, "failures": self.failures}
@@ -0,0 +1,177 @@
+"""Per-provider concurrency limits and rate-limit scheduling."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of rejecting requests.
+
+    Tokens may go negative: a caller that reserves past the budget is told how
+    long to wait, and that debt is paid back as the bucket refills.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second, or None for no rate limit
+            capacity: Maximum tokens that can be saved up (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserve one token.
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        now = time.monotonic()
+        wait = max(0.0, self.paused_until - now)
+        if self.rate is None:
+            return wait
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.rate)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold all reservations for the given number of seconds (e.g., after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class RateLimitScheduler:
+    """
+    Gates provider calls behind per-provider and per-model limits.
+
+    Each provider gets a concurrency semaphore, each provider/model pair gets
+    its own smaller semaphore, and each provider gets a token bucket for its
+    requests-per-minute budget. A 429 pauses the provider's bucket for the
+    Retry-After period so every queued caller backs off together.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, Any]]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limits: Mapping of provider name to limit settings, with a
+                'default' entry used for providers not listed
+        """
+        self.limits = limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queued = 0
+
+    def _limits_for(self, provider_name: str) -> Dict[str, Any]:
+        """Get the effective limits for a provider."""
+        return {**self.limits.get("default", {}), **self.limits.get(provider_name, {})}
+
+    def _semaphore(self, key: str, size: Optional[int]) -> Optional[asyncio.Semaphore]:
+        """Get or create the semaphore for a key (None means unlimited)."""
+        if not size:
+            return None
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(size)
+        return self._semaphores[key]
+
+    def _bucket(self, provider_name: str) -> TokenBucket:
+        """Get or create the token bucket for a provider."""
+        if provider_name not in self._buckets:
+            limits = self._limits_for(provider_name)
+            rpm = limits.get("requests_per_minute")
+            rate = rpm / 60.0 if rpm else None
+            self._buckets[provider_name] = TokenBucket(rate, limits.get("burst") or 1)
+        return self._buckets[provider_name]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider_name: str,
+        model_name: str,
+        on_queued: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a request slot for a provider/model pair.
+
+        Waits for the model and provider concurrency limits and the provider's
+        rate limit. If the request cannot start right away, on_queued is
+        called once with {'reason': 'concurrency' | 'rate_limit', 'wait': seconds or None}.
+
+        Args:
+            provider_name: Provider the request goes to
+            model_name: Model name without provider prefix
+            on_queued: Optional callback told when the request has to wait
+        """
+        limits = self._limits_for(provider_name)
+        model_sem = self._semaphore(
+            f"{provider_name}/{model_name}", limits.get("max_concurrency_per_model")
+        )
+        provider_sem = self._semaphore(provider_name, limits.get("max_concurrency"))
+        notified = False
+
+        def notify(reason: str, wait: Optional[float] = None):
+            nonlocal notified
+            if on_queued is not None and not notified:
+                notified = True
+                on_queued({"reason": reason, "wait": wait})
+
+        self._queued += 1
+        acquired = []
+        try:
+            for sem in (model_sem, provider_sem):
+                if sem is None:
+                    continue
+                if sem.locked():
+                    notify("concurrency")
+                await sem.acquire()
+                acquired.append(sem)
+
+            wait = self._bucket(provider_name).reserve()
+            if wait > 0:
+                notify("rate_limit", wait)
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._queued -= 1
+            for sem in acquired:
+                sem.release()
+            raise
+
+        self._queued -= 1
+        try:
+            yield
+        finally:
+            for sem in acquired:
+                sem.release()
+
+    def backoff(self, provider_name: str, retry_after: Optional[float], attempt: int) -> float:
+        """
+        Pause a provider after it rate limited us.
+
+        Args:
+            provider_name: Provider that returned 429
+            retry_after: Seconds from the Retry-After header, if any
+            attempt: Zero-based retry attempt, for exponential fallback
+
+        Returns:
+            Seconds the provider is paused for
+        """
+        delay = retry_after if retry_after is not None else min(60.0, 2.0 ** attempt)
+        self._bucket(provider_name).pause(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler counters for monitoring."""
+        return {"queued": self._queued}
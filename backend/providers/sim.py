@@ -0,0 +1,238 @@
+"""Simulated provider for load tests without network or paid models."""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+from .base import ModelProvider
+from .errors import ProviderServerError, ProviderTimeoutError, RateLimitError
+
+
+# Settings of a simulated model (see MODEL_CONFIGS["sim"] in config.py)
+DEFAULT_PROFILE = {
+    "ttft": 0.5,
+    "tokens_per_second": 50.0,
+    "response_tokens": 300,
+    "jitter": 0.2,
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+    "timeout_rate": 0.0,
+    "retry_after": 1.0,
+    "chunk_tokens": 4,
+}
+
+WORDS = (
+    "the council considers each answer carefully because accuracy matters "
+    "however some responses miss important detail while others cover the "
+    "question well with clear evidence strong reasoning and useful examples"
+).split()
+
+# Anonymized responses listed in a Stage 2 ranking prompt
+RESPONSE_LABEL = re.compile(r'^(Response [A-Z]):$', re.MULTILINE)
+
+
+class SimProvider(ModelProvider):
+    """
+    Synthetic model provider for load and failure testing.
+
+    Responses are generated locally from a hash of the model and the
+    messages, so the same request always gets the same text; Stage 2
+    prompts get a well-formed FINAL RANKING of the responses they list.
+    Each model ("sim/<name>") has a profile giving its time to first token,
+    generation speed and the rates at which requests fail with a 5xx, a
+    429 or a timeout. Failures are drawn from a seeded random sequence per
+    model, so a given seed always produces the same mix of outcomes.
+    """
+
+    def __init__(self, provider_config: Dict[str, Any]):
+        """
+        Initialize the simulated provider.
+
+        Args:
+            provider_config: Configuration dict with optional 'seed',
+                'defaults' (profile settings for every model) and 'models'
+                (per-model overrides keyed by model name)
+        """
+        super().__init__(provider_config)
+        self.seed = provider_config.get('seed', 0)
+        self.defaults = {**DEFAULT_PROFILE, **provider_config.get('defaults', {})}
+        self.models = provider_config.get('models', {})
+        self._rngs: Dict[str, random.Random] = {}
+
+    def profile(self, model: str) -> Dict[str, Any]:
+        """
+        Get the settings of a simulated model.
+
+        Args:
+            model: Model name (without the "sim/" prefix)
+
+        Returns:
+            Profile dict (defaults overridden by the model's own settings)
+        """
+        return {**self.defaults, **self.models.get(model, {})}
+
+    def _rng(self, model: str) -> random.Random:
+        """Get the model's seeded random sequence for failures and jitter."""
+        rng = self._rngs.get(model)
+        if rng is None:
+            rng = self._rngs[model] = random.Random(f"{self.seed}:{model}")
+        return rng
+
+    def _generate(self, model: str, messages: List[Dict[str, str]], tokens: int) -> List[str]:
+        """
+        Generate the response deterministically, as a list of tokens.
+
+        Args:
+            model: Model name
+            messages: Request messages
+            tokens: Number of tokens to generate
+
+        Returns:
+            Tokens (words with their leading space) of the response
+        """
+        digest = hashlib.sha256(
+            json.dumps([self.seed, model, messages], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        rng = random.Random(digest)
+        words = [rng.choice(WORDS) for _ in range(tokens)]
+
+        prompt = messages[-1].get('content', '') if messages else ''
+        labels = RESPONSE_LABEL.findall(prompt)
+        if labels and "FINAL RANKING:" in prompt:
+            rng.shuffle(labels)
+            ranking = "\n".join(f"{i}. {label}" for i, label in enumerate(labels, start=1))
+            words.append(f"\n\nFINAL RANKING:\n{ranking}")
+
+        return [words[0].capitalize()] + [f" {word}" for word in words[1:]] if words else []
+
+    async def _start(self, model: str, timeout: float) -> Dict[str, Any]:
+        """
+        Simulate the wait for the first token, or a failure.
+
+        Args:
+            model: Model name
+            timeout: Request timeout in seconds
+
+        Returns:
+            The model's profile, with the jittered 'ttft' actually waited
+
+        Raises:
+            ProviderTimeoutError: If the request is drawn to time out, or
+                would not start before the timeout
+            RateLimitError: If the request is drawn to be rate limited
+            ProviderServerError: If the request is drawn to fail
+        """
+        profile = self.profile(model)
+        rng = self._rng(model)
+        draw = rng.random()
+        jitter = 1.0 + profile['jitter'] * (2 * rng.random() - 1)
+        ttft = max(0.0, profile['ttft'] * jitter)
+
+        if draw < profile['timeout_rate'] or ttft >= timeout:
+            await asyncio.sleep(timeout)
+            raise ProviderTimeoutError(f"Simulated timeout for sim/{model}")
+        draw -= profile['timeout_rate']
+        if draw < profile['rate_limit_rate']:
+            raise RateLimitError(f"Simulated 429 for sim/{model}", profile['retry_after'])
+        draw -= profile['rate_limit_rate']
+        if draw < profile['error_rate']:
+            await asyncio.sleep(ttft)
+            raise ProviderServerError(f"Simulated 503 for sim/{model}", 503)
+
+        await asyncio.sleep(ttft)
+        return {**profile, 'ttft': ttft}
+
+    def _usage(self, messages: List[Dict[str, str]], tokens: int, seconds: float) -> Dict[str, Any]:
+        """Count tokens like a provider would (prompt tokens estimated at 4 characters each)."""
+        prompt = (sum(len(message.get('content', '')) for message in messages) + 3) // 4
+        return {
+            'prompt_tokens': prompt,
+            'completion_tokens': tokens,
+            'total_tokens': prompt + tokens,
+            'generation_seconds': seconds,
+        }
+
+    async def query_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Simulate a model query.
+
+        Args:
+            model: Simulated model name (e.g., "fast", "flaky")
+            messages: List of message dicts with 'role' and 'content'
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response dict with 'content', 'reasoning_details' (None) and 'usage'
+
+        Raises:
+            ProviderError: Simulated timeout, 429 or 5xx
+        """
+        profile = await self._start(model, timeout)
+        tokens = self._generate(model, messages, profile['response_tokens'])
+        seconds = len(tokens) / profile['tokens_per_second']
+        if profile['ttft'] + seconds >= timeout:
+            await asyncio.sleep(timeout - profile['ttft'])
+            raise ProviderTimeoutError(f"Simulated timeout for sim/{model}")
+        await asyncio.sleep(seconds)
+
+        return {
+            'content': ''.join(tokens),
+            'reasoning_details': None,
+            'usage': self._usage(messages, len(tokens), seconds)
+        }
+
+    async def stream_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Simulate a streamed response, paced at the model's tokens/sec.
+
+        Args:
+            model: Simulated model name (e.g., "fast", "flaky")
+            messages: List of message dicts with 'role' and 'content'
+            timeout: Request timeout in seconds
+
+        Yields:
+            Chunk dicts with a 'content' text delta, then a {'usage': ...} chunk
+
+        Raises:
+            ProviderError: Simulated timeout, 429 or 5xx before the first
+                chunk, or a timeout mid-stream if the response would not
+                finish in time (like query_model)
+        """
+        profile = await self._start(model, timeout)
+        tokens = self._generate(model, messages, profile['response_tokens'])
+        size = max(1, int(profile['chunk_tokens']))
+        delay = size / profile['tokens_per_second']
+        elapsed = profile['ttft']
+
+        for start in range(0, len(tokens), size):
+            if start:
+                if elapsed + delay >= timeout:
+                    await asyncio.sleep(max(0.0, timeout - elapsed))
+                    raise ProviderTimeoutError(f"Simulated timeout for sim/{model}")
+                await asyncio.sleep(delay)
+                elapsed += delay
+            yield {'content': ''.join(tokens[start:start + size])}
+
+        seconds = len(tokens) / profile['tokens_per_second']
+        yield {'usage': self._usage(messages, len(tokens), seconds)}
+
+    async def probe(self) -> bool:
+        """The simulated endpoint is always reachable."""
+        return True
+
+    def supports_streaming(self) -> bool:
+        """Check if provider supports streaming."""
+        return True
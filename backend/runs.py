@@ -0,0 +1,534 @@
+"""Background council runs with replayable event logs."""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .config import RUNS_CONFIG
+from .council import (
+    generate_conversation_title,
+    stage1_stream_responses,
+    stage2_stream_rankings,
+    stage3_stream_final,
+)
+from .storage import aio
+from .storage.conversation_cache import conversation_cache
+from .tracing import start_trace
+from .usage import run_usage, usage_records
+
+
+def new_checkpoint(
+    run_id: str,
+    conversation_id: str,
+    content: str
+) -> Dict[str, Any]:
+    """
+    Create the checkpoint of a run that has not started yet.
+
+    Whether the run titles the conversation ('is_first_message') is only
+    decided once its user message is stored, from the index it got.
+
+    Args:
+        run_id: Run identifier (also names the checkpoint file)
+        conversation_id: Conversation the turn belongs to
+        content: The user's message
+
+    Returns:
+        Checkpoint dict
+    """
+    return {
+        "run_id": run_id,
+        "conversation_id": conversation_id,
+        "content": content,
+        "is_first_message": None,
+        "created_at": datetime.utcnow().isoformat(),
+        "message_index": None,
+        "stage1": [],
+        "stage1_metadata": None,
+        "stage2": [],
+        "stage2_metadata": None,
+        "stage3": None,
+        "title": None,
+    }
+
+
+def _add_result(results: List[Dict[str, Any]], result: Dict[str, Any]) -> bool:
+    """Record one model's result in a checkpoint list, unless it is already there."""
+    if any(existing['model'] == result['model'] for existing in results):
+        return False
+    results.append(result)
+    return True
+
+
+async def _restore_user_message(checkpoint: Dict[str, Any]) -> bool:
+    """
+    Make sure a resumed run's user message is stored, and check whether the
+    run's answer already was.
+
+    The user message may have been lost with the write-behind cache, and
+    the assistant message may have been written just before the crash that
+    left the checkpoint behind.
+
+    Args:
+        checkpoint: Checkpoint of the resumed run
+
+    Returns:
+        True if the assistant message is already stored
+
+    Raises:
+        ValueError: If the conversation no longer exists
+    """
+    conversation_id = checkpoint['conversation_id']
+    index = checkpoint['message_index']
+    conversation = await conversation_cache.get_messages(conversation_id, index, 2)
+    if conversation is None:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+    messages = conversation['messages']
+    if messages and messages[0].get('role') == 'user' and messages[0].get('content') == checkpoint['content']:
+        return len(messages) > 1 and messages[1].get('role') == 'assistant'
+
+    checkpoint['message_index'] = await conversation_cache.add_user_message(
+        conversation_id, checkpoint['content']
+    )
+    await aio.save_checkpoint(checkpoint)
+    return False
+
+
+async def _generate_title(checkpoint: Dict[str, Any]) -> str:
+    """Generate a run's conversation title, recording it for the next checkpoint save."""
+    checkpoint['title'] = await generate_conversation_title(checkpoint['content'])
+    return checkpoint['title']
+
+
+async def council_run_events(
+    checkpoint: Dict[str, Any],
+    is_suspended: Callable[[], bool] = lambda: False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one council turn for a conversation, yielding progress events.
+
+    Every model answer and finished stage is written to the run's checkpoint
+    as soon as it arrives. A checkpoint that already holds results (a run
+    resumed after a restart) is continued from there: finished stages are
+    replayed as events instead of querying the models again. The assistant
+    message is saved at the end with whatever stages finished, even if the
+    run fails or is cancelled, and the checkpoint is then removed. A run
+    cancelled while is_suspended() is true keeps its checkpoint instead, to
+    resume later.
+
+    The run is traced (see backend.tracing): the trace is saved with the
+    assistant message and sent as a 'trace' event before 'complete'. The
+    token usage of its model calls (see backend.usage) is saved with the
+    message and appended to the usage log.
+
+    Args:
+        checkpoint: Checkpoint from new_checkpoint() or a previous run
+        is_suspended: Tells whether a cancellation is a shutdown to resume from
+
+    Yields:
+        Event dicts with a 'type' key (stage1_start ... trace, complete / error)
+    """
+    conversation_id = checkpoint['conversation_id']
+    content = checkpoint['content']
+    trace = start_trace(
+        run_id=checkpoint['run_id'],
+        resumed=checkpoint['message_index'] is not None
+    )
+
+    # Initialize variables to store results
+    stage1_results = checkpoint['stage1']
+    stage2_results = checkpoint['stage2']
+    stage3_result = checkpoint['stage3'] or {
+        "model": "error",
+        "response": "Failed to generate response: An error occurred during processing."
+    }
+    title_task = None
+    user_stored = False
+    answer_stored = False
+    failed = False
+
+    try:
+        # Add user message (or make sure it survived, when resuming)
+        if checkpoint['message_index'] is None:
+            checkpoint['message_index'] = await conversation_cache.add_user_message(
+                conversation_id, content
+            )
+            # Decided from the stored index, so concurrent turns cannot both title
+            checkpoint['is_first_message'] = checkpoint['message_index'] == 0
+            await aio.save_checkpoint(checkpoint)
+        else:
+            answer_stored = await _restore_user_message(checkpoint)
+        user_stored = True
+        if answer_stored:
+            yield {'type': 'complete'}
+            return
+
+        # Start title generation in parallel (don't await yet)
+        if checkpoint['is_first_message'] and checkpoint['title'] is None:
+            title_task = asyncio.create_task(_generate_title(checkpoint))
+
+        # Stage 1: Collect responses
+        yield {'type': 'stage1_start'}
+        if checkpoint['stage1_metadata'] is not None:
+            yield {
+                'type': 'stage1_complete',
+                'data': stage1_results,
+                'metadata': checkpoint['stage1_metadata'],
+                'resumed': True
+            }
+        else:
+            async for event in stage1_stream_responses(content, answered=list(stage1_results)):
+                if event['type'] == 'stage1_model_complete' and _add_result(stage1_results, event['data']):
+                    await aio.save_checkpoint(checkpoint)
+                elif event['type'] == 'stage1_complete':
+                    stage1_results = checkpoint['stage1'] = event['data']
+                    checkpoint['stage1_metadata'] = event['metadata']
+                    await aio.save_checkpoint(checkpoint)
+                yield event
+
+        # Stage 2: Collect rankings
+        yield {'type': 'stage2_start'}
+        if checkpoint['stage2_metadata'] is not None:
+            yield {
+                'type': 'stage2_complete',
+                'data': stage2_results,
+                'metadata': checkpoint['stage2_metadata'],
+                'resumed': True
+            }
+        else:
+            async for event in stage2_stream_rankings(content, stage1_results, answered=list(stage2_results)):
+                if event['type'] == 'stage2_model_complete' and _add_result(stage2_results, event['data']):
+                    await aio.save_checkpoint(checkpoint)
+                elif event['type'] == 'stage2_complete':
+                    stage2_results = checkpoint['stage2'] = event['data']
+                    checkpoint['stage2_metadata'] = event['metadata']
+                    await aio.save_checkpoint(checkpoint)
+                yield event
+
+        # Stage 3: Synthesize final answer
+        yield {'type': 'stage3_start'}
+        if checkpoint['stage3'] is not None:
+            yield {'type': 'stage3_complete', 'data': stage3_result, 'resumed': True}
+        else:
+            async for event in stage3_stream_final(content, stage1_results, stage2_results):
+                if event['type'] == 'stage3_complete':
+                    stage3_result = checkpoint['stage3'] = event['data']
+                    await aio.save_checkpoint(checkpoint)
+                yield event
+
+        # Wait for title generation if it was started
+        if title_task:
+            await title_task
+            await aio.save_checkpoint(checkpoint)
+        if checkpoint['title'] is not None:
+            await conversation_cache.update_conversation_title(conversation_id, checkpoint['title'])
+            yield {'type': 'title_complete', 'data': {'title': checkpoint['title']}}
+
+    except asyncio.CancelledError:
+        if checkpoint['stage3'] is None:
+            stage3_result = {
+                "model": "cancelled",
+                "response": "Cancelled before the final answer was ready."
+            }
+        raise
+    except Exception as e:
+        # Send error event
+        failed = True
+        yield {'type': 'error', 'message': str(e)}
+    finally:
+        if title_task is not None and not title_task.done():
+            title_task.cancel()
+        # Tokens already spent are logged even by a suspended run, since the
+        # resumed run does not query those models again
+        try:
+            await aio.append_usage(usage_records(trace, conversation_id))
+        except Exception as e:
+            print(f"Error logging token usage of run {checkpoint['run_id']}: {e}")
+        # A run suspended by a shutdown keeps its checkpoint and finishes on
+        # the next startup; otherwise save whatever data we have
+        if not is_suspended():
+            if user_stored and not answer_stored:
+                await conversation_cache.add_assistant_message(
+                    conversation_id,
+                    stage1_results,
+                    stage2_results,
+                    stage3_result,
+                    trace.to_dict(),
+                    run_usage(trace)
+                )
+                # Write the whole turn (user message, title, answer) at once
+                await conversation_cache.flush(conversation_id)
+            await aio.delete_checkpoint(checkpoint['run_id'])
+
+    # The event's trace also covers the final write of the turn
+    yield {'type': 'trace', 'data': trace.to_dict()}
+    if not failed:
+        # Send completion event
+        yield {'type': 'complete'}
+
+
+class CouncilRun:
+    """
+    One council turn running as a background task.
+
+    Every event the run produces is appended to an in-memory log and
+    numbered from 0, so subscribers can attach at any time and replay
+    everything after the last event they saw.
+
+    A run with a 'cancel_grace' is cancelled once its last subscriber has
+    been gone for that many seconds, unless someone reattaches first.
+    """
+
+    def __init__(self, run_id: str, conversation_id: str, resumed_from: Optional[str] = None):
+        """
+        Initialize the run.
+
+        Args:
+            run_id: Unique run identifier
+            conversation_id: Conversation the run belongs to
+            resumed_from: Id of the interrupted run this one continues, if any
+        """
+        self.id = run_id
+        self.conversation_id = conversation_id
+        self.resumed_from = resumed_from
+        self.status = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_grace: Optional[float] = None
+        self.subscribers = 0
+        self._cancel_timer: Optional[asyncio.TimerHandle] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the run has stopped producing events."""
+        return self.status != "running"
+
+    async def _append(self, event: Dict[str, Any]):
+        """Add an event to the log and wake subscribers."""
+        self.events.append(event)
+        if event['type'] in ('complete', 'error'):
+            self.status = event['type']
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _finish(self, status: str):
+        """Mark the run as finished and wake subscribers."""
+        if not self.finished:
+            self.status = status
+        self.finished_at = time.time()
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _cancel_if_abandoned(self):
+        """Cancel the run if no subscriber came back during the grace period."""
+        self._cancel_timer = None
+        if not self.subscribers and not self.finished and self.task is not None:
+            print(f"Cancelling council run {self.id}: client disconnected")
+            self.task.cancel()
+
+    async def subscribe(
+        self,
+        last_event_id: int = -1,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Tuple[Optional[int], Optional[Dict[str, Any]]]]:
+        """
+        Stream the run's events, replaying those after last_event_id first.
+
+        Args:
+            last_event_id: Id of the last event the client already has (-1 for none)
+            heartbeat: Seconds without events after which (None, None) is
+                yielded, so the caller can check the client is still there
+
+        Yields:
+            Tuples of (event id, event dict) until the run finishes
+        """
+        self.subscribers += 1
+        if self._cancel_timer is not None:
+            self._cancel_timer.cancel()
+            self._cancel_timer = None
+
+        next_id = max(0, last_event_id + 1)
+        try:
+            while True:
+                while next_id < len(self.events):
+                    yield next_id, self.events[next_id]
+                    next_id += 1
+                if self.finished and self.finished_at is not None:
+                    return
+                try:
+                    async with self._changed:
+                        await asyncio.wait_for(self._changed.wait_for(
+                            lambda: next_id < len(self.events) or self.finished_at is not None
+                        ), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None, None
+        finally:
+            self.subscribers -= 1
+            if not self.subscribers and self.cancel_grace is not None and not self.finished:
+                self._cancel_timer = asyncio.get_running_loop().call_later(
+                    self.cancel_grace, self._cancel_if_abandoned
+                )
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the run's status for the API."""
+        return {
+            "run_id": self.id,
+            "conversation_id": self.conversation_id,
+            "resumed_from": self.resumed_from,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "event_count": len(self.events),
+        }
+
+
+class RunManager:
+    """Starts council runs as background tasks and keeps their event logs."""
+
+    def __init__(
+        self,
+        retention: float,
+        max_finished: int,
+        on_disconnect: str = "background",
+        disconnect_grace: float = 0.0
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            retention: Seconds a finished run's event log stays available
+            max_finished: Maximum finished runs kept, oldest dropped first
+            on_disconnect: What happens to a streamed run whose client goes
+                away: "cancel" stops it (cancelling its provider calls) and
+                saves what finished; "background" lets it finish and save
+            disconnect_grace: Seconds a client has to reconnect before a
+                run is cancelled
+
+        Raises:
+            ValueError: If on_disconnect is unknown
+        """
+        if on_disconnect not in ("cancel", "background"):
+            raise ValueError(f"Unknown on_disconnect policy: {on_disconnect}")
+        self.retention = retention
+        self.max_finished = max_finished
+        self.on_disconnect = on_disconnect
+        self.disconnect_grace = disconnect_grace
+        self._runs: Dict[str, CouncilRun] = {}
+        self._suspending = False
+
+    def start(
+        self,
+        conversation_id: str,
+        content: str,
+        attached: bool = False
+    ) -> CouncilRun:
+        """
+        Start a council turn in the background.
+
+        Args:
+            conversation_id: Conversation the turn belongs to
+            content: The user's message
+            attached: Whether the run belongs to a streaming client, so the
+                on_disconnect policy applies when that client goes away
+
+        Returns:
+            The new CouncilRun
+        """
+        run_id = str(uuid.uuid4())
+        run = CouncilRun(run_id, conversation_id)
+        if attached and self.on_disconnect == "cancel":
+            run.cancel_grace = self.disconnect_grace
+        checkpoint = new_checkpoint(run_id, conversation_id, content)
+        return self._launch(run, checkpoint)
+
+    async def resume_pending(self) -> List[CouncilRun]:
+        """
+        Resume every run left unfinished by a crash or shutdown (called on startup).
+
+        Resumed runs get a new run id, since the event log of the interrupted
+        run is gone; they keep writing to the original checkpoint.
+
+        Returns:
+            The resumed runs
+        """
+        runs = []
+        for checkpoint in await aio.load_checkpoints():
+            run = CouncilRun(
+                str(uuid.uuid4()), checkpoint['conversation_id'], resumed_from=checkpoint['run_id']
+            )
+            print(f"Resuming council run {checkpoint['run_id']} as {run.id}")
+            runs.append(self._launch(run, checkpoint))
+        return runs
+
+    def _launch(self, run: CouncilRun, checkpoint: Dict[str, Any]) -> CouncilRun:
+        """Register a run and start its task."""
+        self._prune()
+        self._runs[run.id] = run
+        run.task = asyncio.create_task(
+            self._execute(run, council_run_events(checkpoint, lambda: self._suspending))
+        )
+        return run
+
+    async def _execute(self, run: CouncilRun, events: AsyncIterator[Dict[str, Any]]):
+        """Drive a run's event generator, recording every event."""
+        metrics.runs_active.inc()
+        try:
+            await run._append({
+                'type': 'run_started',
+                'data': {'run_id': run.id, 'resumed_from': run.resumed_from}
+            })
+            async for event in events:
+                await run._append(event)
+        except asyncio.CancelledError:
+            await run._finish("cancelled")
+            raise
+        except Exception as e:
+            print(f"Council run {run.id} failed: {e}")
+            await run._append({'type': 'error', 'message': str(e)})
+        finally:
+            await run._finish("complete")
+            metrics.runs_active.dec()
+            metrics.runs_finished.inc(run.status)
+
+    def get(self, run_id: str) -> Optional[CouncilRun]:
+        """Look up a run by id (None if unknown or expired)."""
+        self._prune()
+        return self._runs.get(run_id)
+
+    def _prune(self):
+        """Drop finished runs past their retention, and the oldest beyond max_finished."""
+        now = time.time()
+        finished = sorted(
+            (run for run in self._runs.values() if run.finished_at is not None),
+            key=lambda run: run.finished_at
+        )
+        for i, run in enumerate(finished):
+            if now - run.finished_at > self.retention or len(finished) - i > self.max_finished:
+                del self._runs[run.id]
+
+    async def close(self):
+        """
+        Stop runs still in progress (called on shutdown).
+
+        Their checkpoints are kept, so they resume on the next startup.
+        """
+        self._suspending = True
+        tasks = [run.task for run in self._runs.values() if run.task and not run.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+run_manager = RunManager(
+    RUNS_CONFIG["retention"],
+    RUNS_CONFIG["max_finished"],
+    RUNS_CONFIG["on_disconnect"],
+    RUNS_CONFIG["disconnect_grace"]
+)
@@ -0,0 +1,255 @@
+"""Conversation storage with pluggable backends."""
+
+import threading
+from typing import List, Dict, Any, Optional
+
+from ..config import (
+    DATA_DIR,
+    STORAGE_BACKEND,
+    SQLITE_PATH,
+    LOG_FSYNC_INTERVAL,
+    STORAGE_COMPRESSION,
+    RUNS_CONFIG,
+    USAGE_CONFIG,
+)
+from .base import ConversationStore, slice_conversation
+from .checkpoints import CheckpointStore
+from .codec import Codec, get_codec
+from .index import MetadataIndex, encode_cursor, parse_cursor
+from .json_store import JsonStore
+from .log_store import LogStore
+from .sqlite_store import SqliteStore
+from .usage_log import UsageLog
+
+
+_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+_checkpoints: Optional[CheckpointStore] = None
+_usage_log: Optional[UsageLog] = None
+
+
+def configured_codec() -> Codec:
+    """Get the compression codec selected in STORAGE_COMPRESSION."""
+    return get_codec(STORAGE_COMPRESSION["codec"], STORAGE_COMPRESSION["level"])
+
+
+def create_store(backend: str) -> ConversationStore:
+    """
+    Create a storage backend by name.
+
+    Args:
+        backend: Backend name ("jsonl", "json" or "sqlite")
+
+    Returns:
+        ConversationStore instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "jsonl":
+        return LogStore(DATA_DIR, LOG_FSYNC_INTERVAL, configured_codec())
+    if backend == "json":
+        return JsonStore(DATA_DIR)
+    if backend == "sqlite":
+        return SqliteStore(SQLITE_PATH, configured_codec())
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_store() -> ConversationStore:
+    """Get the configured storage backend, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store(STORAGE_BACKEND)
+    return _store
+
+
+def close_store():
+    """Close the configured storage backend, if it was opened."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Get the store for council run checkpoints, creating it on first use."""
+    global _checkpoints
+    if _checkpoints is None:
+        _checkpoints = CheckpointStore(RUNS_CONFIG["checkpoint_dir"])
+    return _checkpoints
+
+
+def get_usage_log() -> UsageLog:
+    """Get the token usage log, creating it on first use."""
+    global _usage_log
+    if _usage_log is None:
+        _usage_log = UsageLog(USAGE_CONFIG["log_path"])
+    return _usage_log
+
+
+def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Create a new conversation.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        New conversation dict
+    """
+    return get_store().create_conversation(conversation_id)
+
+
+def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation from storage.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Conversation dict or None if not found
+    """
+    return get_store().get_conversation(conversation_id)
+
+
+def get_messages(
+    conversation_id: str,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation with only a range of its messages.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+        offset: Index of the first message; negative counts from the end
+        limit: Maximum messages to return, or None for all after offset
+
+    Returns:
+        Conversation dict with 'message_count' and 'offset', or None if not found
+    """
+    return get_store().get_messages(conversation_id, offset, limit)
+
+
+def save_conversation(conversation: Dict[str, Any]):
+    """
+    Save a conversation to storage.
+
+    Args:
+        conversation: Conversation dict to save
+    """
+    get_store().save_conversation(conversation)
+
+
+def list_conversations(
+    limit: Optional[int] = None,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List conversations (metadata only), newest first.
+
+    Args:
+        limit: Maximum conversations to return, or None for all
+        before: Cursor from encode_cursor(); only older conversations are returned
+
+    Returns:
+        List of conversation metadata dicts
+    """
+    return get_store().list_conversations(limit, before)
+
+
+def add_user_message(conversation_id: str, content: str):
+    """
+    Add a user message to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: User message content
+    """
+    get_store().append_message(conversation_id, {
+        "role": "user",
+        "content": content
+    })
+
+
+def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any]
+):
+    """
+    Add an assistant message with all 3 stages to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        stage1: List of individual model responses
+        stage2: List of model rankings
+        stage3: Final synthesized response
+    """
+    get_store().append_message(conversation_id, {
+        "role": "assistant",
+        "stage1": stage1,
+        "stage2": stage2,
+        "stage3": stage3
+    })
+
+
+def update_conversation_title(conversation_id: str, title: str):
+    """
+    Update the title of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        title: New title for the conversation
+    """
+    get_store().update_title(conversation_id, title)
+
+
+def commit(
+    conversation_id: str,
+    messages: List[Dict[str, Any]],
+    title: Optional[str] = None
+):
+    """
+    Apply a batch of appended messages and an optional title in one write.
+
+    Args:
+        conversation_id: Conversation identifier
+        messages: Messages to append, in order
+        title: New title, or None to keep the current one
+    """
+    get_store().commit(conversation_id, messages, title)
+
+
+__all__ = [
+    'ConversationStore',
+    'slice_conversation',
+    'JsonStore',
+    'LogStore',
+    'SqliteStore',
+    'CheckpointStore',
+    'UsageLog',
+    'MetadataIndex',
+    'encode_cursor',
+    'parse_cursor',
+    'configured_codec',
+    'create_store',
+    'get_store',
+    'close_store',
+    'get_checkpoint_store',
+    'get_usage_log',
+    'create_conversation',
+    'get_conversation',
+    'get_messages',
+    'save_conversation',
+    'list_conversations',
+    'add_user_message',
+    'add_assistant_message',
+    'update_conversation_title',
+    'commit',
+]
@@ -0,0 +1,274 @@
+"""Async storage API that runs the blocking backends on a bounded thread pool."""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .. import metrics
+from ..tracing import span
+from ..config import STORAGE_IO_WORKERS
+from . import (
+    get_store,
+    close_store,
+    get_checkpoint_store,
+    get_usage_log,
+    add_user_message as _add_user_message,
+    add_assistant_message as _add_assistant_message,
+    update_conversation_title as _update_conversation_title,
+)
+
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the storage thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=STORAGE_IO_WORKERS, thread_name_prefix="storage-io"
+        )
+    return _executor
+
+
+async def _run(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking storage call on the thread pool, timing it for /metrics and the run trace."""
+    operation = args[0] if func is _call_store else func.__qualname__
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        with span("storage", operation=operation):
+            return await loop.run_in_executor(_get_executor(), functools.partial(func, *args))
+    except Exception:
+        metrics.storage_errors.inc(operation)
+        raise
+    finally:
+        metrics.storage_seconds.observe(operation, value=time.perf_counter() - start)
+
+
+def _call_store(method: str, *args: Any) -> Any:
+    """Call a store method by name (opening the store in the worker thread)."""
+    return getattr(get_store(), method)(*args)
+
+
+async def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Create a new conversation.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        New conversation dict
+    """
+    return await _run(_call_store, "create_conversation", conversation_id)
+
+
+async def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation from storage.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Conversation dict or None if not found
+    """
+    return await _run(_call_store, "get_conversation", conversation_id)
+
+
+async def get_messages(
+    conversation_id: str,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation with only a range of its messages.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+        offset: Index of the first message; negative counts from the end
+        limit: Maximum messages to return, or None for all after offset
+
+    Returns:
+        Conversation dict with 'message_count' and 'offset', or None if not found
+    """
+    return await _run(_call_store, "get_messages", conversation_id, offset, limit)
+
+
+async def save_conversation(conversation: Dict[str, Any]):
+    """
+    Save a conversation to storage.
+
+    Args:
+        conversation: Conversation dict to save
+    """
+    await _run(_call_store, "save_conversation", conversation)
+
+
+async def list_conversations(
+    limit: Optional[int] = None,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List conversations (metadata only), newest first.
+
+    Args:
+        limit: Maximum conversations to return, or None for all
+        before: Cursor; only older conversations are returned
+
+    Returns:
+        List of conversation metadata dicts
+    """
+    return await _run(_call_store, "list_conversations", limit, before)
+
+
+async def add_user_message(conversation_id: str, content: str):
+    """
+    Add a user message to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: User message content
+    """
+    await _run(_add_user_message, conversation_id, content)
+
+
+async def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any]
+):
+    """
+    Add an assistant message with all 3 stages to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        stage1: List of individual model responses
+        stage2: List of model rankings
+        stage3: Final synthesized response
+    """
+    await _run(_add_assistant_message, conversation_id, stage1, stage2, stage3)
+
+
+async def update_conversation_title(conversation_id: str, title: str):
+    """
+    Update the title of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        title: New title for the conversation
+    """
+    await _run(_update_conversation_title, conversation_id, title)
+
+
+async def commit(
+    conversation_id: str,
+    messages: List[Dict[str, Any]],
+    title: Optional[str] = None
+):
+    """
+    Apply a batch of appended messages and an optional title in one write.
+
+    Args:
+        conversation_id: Conversation identifier
+        messages: Messages to append, in order
+        title: New title, or None to keep the current one
+    """
+    await _run(_call_store, "commit", conversation_id, messages, title)
+
+
+async def recompression_candidates(min_growth: int) -> List[str]:
+    """
+    List conversations whose stored form should be recompressed.
+
+    Args:
+        min_growth: Bytes a compressed log must have grown by since it was last compacted
+
+    Returns:
+        Conversation ids
+    """
+    return await _run(_call_store, "recompression_candidates", min_growth)
+
+
+async def recompress(conversation_id: str):
+    """
+    Rewrite a conversation in the configured compression format.
+
+    Args:
+        conversation_id: Conversation identifier
+    """
+    await _run(_call_store, "recompress", conversation_id)
+
+
+async def save_checkpoint(checkpoint: Dict[str, Any]):
+    """
+    Durably write a council run's checkpoint.
+
+    Args:
+        checkpoint: Checkpoint dict with a 'run_id' key
+    """
+    await _run(get_checkpoint_store().save, checkpoint)
+
+
+async def delete_checkpoint(run_id: str):
+    """
+    Remove a council run's checkpoint.
+
+    Args:
+        run_id: Run identifier
+    """
+    await _run(get_checkpoint_store().delete, run_id)
+
+
+async def load_checkpoints() -> List[Dict[str, Any]]:
+    """
+    Load the checkpoints of every unfinished council run, oldest first.
+
+    Returns:
+        List of checkpoint dicts
+    """
+    return await _run(get_checkpoint_store().load_all)
+
+
+async def append_usage(records: List[Dict[str, Any]]):
+    """
+    Append token usage records to the usage log.
+
+    Args:
+        records: Record dicts (see backend.usage.usage_records)
+    """
+    await _run(get_usage_log().append, records)
+
+
+async def read_usage(
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    conversation_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read token usage records in a time range.
+
+    Args:
+        since: Only records from this Unix time on (None = from the start)
+        until: Only records before this Unix time (None = up to now)
+        conversation_id: Only records of this conversation (None = all)
+
+    Returns:
+        List of record dicts
+    """
+    return await _run(get_usage_log().read, since, until, conversation_id)
+
+
+async def close():
+    """Wait for pending storage calls, then close the pool and the backend."""
+    global _executor
+    if _executor is not None:
+        executor, _executor = _executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+    await asyncio.to_thread(close_store)
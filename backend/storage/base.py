@@ -0,0 +1,215 @@
+"""Abstract base class for conversation storage backends."""
+
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def slice_conversation(
+    conversation: Dict[str, Any],
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Cut a loaded conversation down to a range of its messages.
+
+    Args:
+        conversation: Full conversation dict
+        offset: Index of the first message; negative counts from the end
+        limit: Maximum messages to keep, or None for all after offset
+
+    Returns:
+        Conversation dict with the selected 'messages', the total
+        'message_count' and the resolved non-negative 'offset'
+    """
+    messages = conversation["messages"]
+    start, end = message_range(len(messages), offset, limit)
+    return {
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(messages),
+        "offset": start,
+        "messages": messages[start:end]
+    }
+
+
+def message_range(total: int, offset: int, limit: Optional[int]) -> Tuple[int, int]:
+    """
+    Resolve an offset/limit pair against a message count.
+
+    Args:
+        total: Number of messages in the conversation
+        offset: Index of the first message; negative counts from the end
+        limit: Maximum messages, or None for all after offset
+
+    Returns:
+        Tuple of (start, end) suitable for slicing
+    """
+    start = offset if offset >= 0 else max(0, total + offset)
+    start = min(start, total)
+    end = total if limit is None else min(total, start + limit)
+    return start, end
+
+
+class ConversationStore(ABC):
+    """Abstract base class for all conversation storage backends."""
+
+    @abstractmethod
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Create a new conversation.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            New conversation dict
+        """
+        pass
+
+    @abstractmethod
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with all its messages.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Conversation dict or None if not found
+        """
+        pass
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with only a range of its messages.
+
+        The default implementation loads everything and slices; backends
+        override it to read just the requested range.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            offset: Index of the first message; negative counts from the end
+            limit: Maximum messages to return, or None for all after offset
+
+        Returns:
+            Dict as returned by slice_conversation(), or None if not found
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            return None
+        return slice_conversation(conversation, offset, limit)
+
+    @abstractmethod
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """
+        Save a whole conversation, replacing any stored version.
+
+        Args:
+            conversation: Conversation dict to save
+        """
+        pass
+
+    @abstractmethod
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversations (metadata only), newest first.
+
+        Args:
+            limit: Maximum conversations to return, or None for all
+            before: Cursor from encode_cursor(); only older conversations are returned
+
+        Returns:
+            List of dicts with 'id', 'created_at', 'title' and 'message_count'
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        pass
+
+    @abstractmethod
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """
+        Append a message to a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            message: Message dict to append
+
+        Raises:
+            ValueError: If the conversation does not exist
+        """
+        pass
+
+    @abstractmethod
+    def update_title(self, conversation_id: str, title: str):
+        """
+        Update the title of a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            title: New title for the conversation
+
+        Raises:
+            ValueError: If the conversation does not exist
+        """
+        pass
+
+    def commit(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None
+    ):
+        """
+        Apply a batch of changes to a conversation in one write.
+
+        The default implementation applies each change separately; backends
+        override it to write the whole batch at once.
+
+        Args:
+            conversation_id: Conversation identifier
+            messages: Messages to append, in order
+            title: New title, or None to keep the current one
+
+        Raises:
+            ValueError: If the conversation does not exist
+        """
+        for message in messages:
+            self.append_message(conversation_id, message)
+        if title is not None:
+            self.update_title(conversation_id, title)
+
+    def recompression_candidates(self, min_growth: int) -> List[str]:
+        """
+        List conversations whose stored form should be recompressed.
+
+        Args:
+            min_growth: Bytes a compressed log must have grown by since it was last compacted
+
+        Returns:
+            Conversation ids; backends without compressed logs return none
+        """
+        return []
+
+    def recompress(self, conversation_id: str):
+        """
+        Rewrite a conversation in the configured compression format.
+
+        Args:
+            conversation_id: Conversation identifier
+        """
+        pass
+
+    def close(self):
+        """Release any resources held by the backend."""
+        pass
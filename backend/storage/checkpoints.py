@@ -0,0 +1,82 @@
+"""Durable checkpoints of council runs in progress."""
+
+import json
+import os
+from typing import Any, Dict, List
+
+
+class CheckpointStore:
+    """
+    Keeps one JSON file per unfinished council run.
+
+    A checkpoint holds everything needed to finish a run after a restart:
+    the user message, where it sits in the conversation, and the results of
+    every model and stage that already answered. Each save rewrites the file
+    atomically (temp file, fsync, rename), so a crash leaves either the old
+    or the new checkpoint, never a torn one.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the checkpoint files
+        """
+        self.directory = directory
+
+    def _path(self, run_id: str) -> str:
+        """Get the file path for a run's checkpoint."""
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def save(self, checkpoint: Dict[str, Any]):
+        """
+        Write a run's checkpoint durably.
+
+        Args:
+            checkpoint: Checkpoint dict with a 'run_id' key
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(checkpoint["run_id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def delete(self, run_id: str):
+        """
+        Remove a run's checkpoint once its result is stored.
+
+        Args:
+            run_id: Run identifier
+        """
+        try:
+            os.remove(self._path(run_id))
+        except FileNotFoundError:
+            pass
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """
+        Load the checkpoints of every unfinished run, oldest first.
+
+        Returns:
+            List of checkpoint dicts; unreadable files are skipped
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        checkpoints = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                with open(path, 'r') as f:
+                    checkpoints.append(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable run checkpoint {path}: {e}")
+
+        checkpoints.sort(key=lambda checkpoint: checkpoint.get("created_at", ""))
+        return checkpoints
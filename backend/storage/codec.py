@@ -0,0 +1,235 @@
+"""Compression codecs for stored conversation data."""
+
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class Codec:
+    """
+    Compresses append-only logs as a sequence of independent blocks.
+
+    Each compress() call produces a self-contained block (a plain byte run,
+    a gzip member or a zstd frame), so appending a block to an existing file
+    needs no read-modify-write. decode() returns the concatenated payload of
+    every complete block, and how many bytes of input those blocks used, so a
+    torn block at the tail from a crash can be trimmed.
+    """
+
+    name = "none"
+    suffix = ""
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode one block."""
+        return data
+
+    def decode(self, data: bytes) -> Tuple[bytes, int]:
+        """
+        Decode a sequence of blocks.
+
+        Args:
+            data: Raw file contents
+
+        Returns:
+            Tuple of (decoded payload, length of the valid input prefix)
+        """
+        # Plain logs are newline-terminated records; anything after the last
+        # newline is a torn write
+        valid = data.rfind(b"\n") + 1
+        return data[:valid], valid
+
+    def blocks(self, data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Split a sequence of blocks, stopping at the first incomplete one.
+
+        Any run of whole lines is a valid plain block, so plain data is
+        split per line.
+
+        Args:
+            data: Raw file contents
+
+        Yields:
+            Tuples of (start offset, end offset, decoded payload) per block
+        """
+        start = 0
+        while True:
+            end = data.find(b"\n", start) + 1
+            if not end:
+                return
+            yield start, end, data[start:end]
+            start = end
+
+
+def _join_blocks(blocks: Iterator[Tuple[int, int, bytes]]) -> Tuple[bytes, int]:
+    """Concatenate split blocks into (decoded payload, length of the valid input prefix)."""
+    parts = []
+    valid = 0
+    for _, end, chunk in blocks:
+        parts.append(chunk)
+        valid = end
+    return b"".join(parts), valid
+
+
+class GzipCodec(Codec):
+    """gzip members; readable with standard tools (zcat)."""
+
+    name = "gzip"
+    suffix = ".gz"
+
+    def __init__(self, level: Optional[int] = None):
+        """
+        Initialize the codec.
+
+        Args:
+            level: zlib compression level (1-9), or None for the default (6)
+        """
+        self.level = 6 if level is None else level
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode one gzip member."""
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def decode(self, data: bytes) -> Tuple[bytes, int]:
+        """Decode gzip members up to the first incomplete or corrupt one."""
+        return _join_blocks(self.blocks(data))
+
+    def blocks(self, data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+        """Split gzip members up to the first incomplete or corrupt one."""
+        start = 0
+        remaining = data
+        while remaining:
+            decompressor = zlib.decompressobj(31)
+            try:
+                chunk = decompressor.decompress(remaining)
+            except zlib.error:
+                return
+            if not decompressor.eof:
+                return
+            end = len(data) - len(decompressor.unused_data)
+            yield start, end, chunk
+            start = end
+            remaining = decompressor.unused_data
+
+
+class ZstdCodec(Codec):
+    """zstd frames; faster and smaller than gzip, needs the 'zstandard' package."""
+
+    name = "zstd"
+    suffix = ".zst"
+
+    def __init__(self, level: Optional[int] = None):
+        """
+        Initialize the codec.
+
+        Args:
+            level: zstd compression level, or None for the default (3)
+        """
+        self.level = 3 if level is None else level
+        self._compressor = zstandard.ZstdCompressor(level=self.level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        """Encode one zstd frame."""
+        return self._compressor.compress(data)
+
+    def decode(self, data: bytes) -> Tuple[bytes, int]:
+        """Decode zstd frames up to the first incomplete or corrupt one."""
+        return _join_blocks(self.blocks(data))
+
+    def blocks(self, data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+        """Split zstd frames up to the first incomplete or corrupt one."""
+        start = 0
+        remaining = data
+        while remaining:
+            decompressor = self._decompressor.decompressobj()
+            try:
+                chunk = decompressor.decompress(remaining)
+            except zstandard.ZstdError:
+                return
+            if not decompressor.eof:
+                return
+            end = len(data) - len(decompressor.unused_data)
+            yield start, end, chunk
+            start = end
+            remaining = decompressor.unused_data
+
+
+def zstd_available() -> bool:
+    """Check whether zstd compression is usable (the 'zstandard' package is installed)."""
+    return zstandard is not None
+
+
+def get_codec(name: str, level: Optional[int] = None) -> Codec:
+    """
+    Create a codec by name.
+
+    Falls back to gzip if zstd is requested but 'zstandard' is not installed.
+
+    Args:
+        name: "none", "gzip" or "zstd"
+        level: Compression level, or None for the codec's default
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "none":
+        return Codec()
+    if name == "gzip":
+        return GzipCodec(level)
+    if name == "zstd":
+        if not zstd_available():
+            print("zstd compression requested but 'zstandard' is not installed; using gzip")
+            return GzipCodec()
+        return ZstdCodec(level)
+    raise ValueError(f"Unknown compression codec: {name}")
+
+
+def codecs_by_suffix(preferred: Codec) -> Dict[str, Codec]:
+    """
+    Get a codec for every file suffix that may exist on disk.
+
+    Args:
+        preferred: The configured codec (reused for its own suffix)
+
+    Returns:
+        Mapping of file suffix to codec; zstd is included only if available
+    """
+    codecs: Dict[str, Codec] = {"": Codec(), ".gz": GzipCodec()}
+    if zstd_available():
+        codecs[".zst"] = ZstdCodec()
+    codecs[preferred.suffix] = preferred
+    return codecs
+
+
+def decompress_blob(data: bytes) -> bytes:
+    """
+    Decompress a single stored blob, detecting its codec from the magic bytes.
+
+    Args:
+        data: gzip or zstd compressed bytes
+
+    Returns:
+        Decompressed bytes
+
+    Raises:
+        ValueError: If the format is unknown or zstd support is missing
+    """
+    if data[:2] == GZIP_MAGIC:
+        return zlib.decompress(data, 31)
+    if data[:4] == ZSTD_MAGIC:
+        if not zstd_available():
+            raise ValueError("zstd-compressed data found but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError("Unknown compressed data format")
@@ -0,0 +1,363 @@
+"""Write-behind in-memory cache of conversations."""
+
+import asyncio
+import copy
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..config import CONVERSATION_CACHE
+from . import aio
+from .base import slice_conversation
+
+
+class _Entry:
+    """A cached conversation plus the changes not yet written to storage."""
+
+    def __init__(self, conversation: Dict[str, Any]):
+        self.conversation = conversation
+        self.pending_messages: List[Dict[str, Any]] = []
+        self.pending_title: Optional[str] = None
+        self.flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are changes waiting to be flushed."""
+        return bool(self.pending_messages) or self.pending_title is not None
+
+
+class ConversationCache:
+    """
+    Serves hot conversations from memory and batches their writes.
+
+    Every change to a conversation happens under that conversation's
+    asyncio lock, so concurrent requests cannot lose each other's updates.
+    Changes are applied in memory and queued; flush() writes everything
+    queued for a conversation with a single storage commit. Callers flush
+    at the end of a turn, and a timer flushes anything left dirty for
+    'flush_delay' seconds. Clean entries beyond 'max_entries' are evicted
+    least recently used first.
+    """
+
+    def __init__(self, max_entries: int, flush_delay: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum clean conversations kept in memory
+            flush_delay: Seconds a change may stay unwritten before the timer flushes it
+        """
+        self.max_entries = max_entries
+        self.flush_delay = flush_delay
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def _lock(self, conversation_id: str) -> asyncio.Lock:
+        """Get the lock guarding one conversation."""
+        lock = self._locks.get(conversation_id)
+        if lock is None:
+            lock = self._locks[conversation_id] = asyncio.Lock()
+        return lock
+
+    def _drop_unused_lock(self, conversation_id: str):
+        """Forget the lock of a conversation that is not cached, unless it is held."""
+        lock = self._locks.get(conversation_id)
+        if lock is not None and not lock.locked() and conversation_id not in self._entries:
+            del self._locks[conversation_id]
+
+    async def _load(self, conversation_id: str) -> Optional[_Entry]:
+        """Get a conversation's entry, loading it from storage on a miss (caller holds the lock)."""
+        entry = self._entries.get(conversation_id)
+        if entry is not None:
+            self._entries.move_to_end(conversation_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        conversation = await aio.get_conversation(conversation_id)
+        if conversation is None:
+            return None
+        entry = self._entries[conversation_id] = _Entry(conversation)
+        self._evict()
+        return entry
+
+    def _evict(self):
+        """Drop least recently used clean entries beyond the size limit."""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        for conversation_id in list(self._entries):
+            if excess <= 0:
+                break
+            entry = self._entries[conversation_id]
+            lock = self._locks.get(conversation_id)
+            if entry.dirty or (lock is not None and lock.locked()):
+                continue
+            del self._entries[conversation_id]
+            self._locks.pop(conversation_id, None)
+            excess -= 1
+
+    def _schedule_flush(self, conversation_id: str, entry: _Entry):
+        """Start the timer that flushes a dirty entry if no one else does."""
+        if entry.flush_task is None or entry.flush_task.done():
+            entry.flush_task = asyncio.create_task(self._delayed_flush(conversation_id))
+
+    async def _delayed_flush(self, conversation_id: str):
+        """Flush a conversation after the write-behind delay."""
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush(conversation_id, from_timer=True)
+        except Exception as e:
+            print(f"Error flushing conversation {conversation_id}: {e}")
+
+    @staticmethod
+    def _snapshot(conversation: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a conversation, messages included, so callers cannot mutate the cached one."""
+        return {**conversation, "messages": copy.deepcopy(conversation["messages"])}
+
+    async def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Create a new conversation and cache it.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            New conversation dict
+        """
+        async with self._lock(conversation_id):
+            conversation = await aio.create_conversation(conversation_id)
+            self._entries[conversation_id] = _Entry(self._snapshot(conversation))
+            self._evict()
+        return conversation
+
+    async def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a conversation, including changes not yet flushed.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Conversation dict or None if not found
+        """
+        async with self._lock(conversation_id):
+            entry = await self._load(conversation_id)
+            if entry is not None:
+                return self._snapshot(entry.conversation)
+
+        self._drop_unused_lock(conversation_id)
+        return None
+
+    async def get_messages(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a range of a conversation's messages.
+
+        Cached conversations are sliced in memory; others are range-read
+        from storage without being cached, since a partial view cannot
+        serve later requests.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            offset: Index of the first message; negative counts from the end
+            limit: Maximum messages to return, or None for all after offset
+
+        Returns:
+            Conversation dict with 'message_count' and 'offset', or None if not found
+        """
+        async with self._lock(conversation_id):
+            entry = self._entries.get(conversation_id)
+            if entry is not None:
+                self._entries.move_to_end(conversation_id)
+                self.hits += 1
+                return slice_conversation(entry.conversation, offset, limit)
+
+        self._drop_unused_lock(conversation_id)
+        self.misses += 1
+        return await aio.get_messages(conversation_id, offset, limit)
+
+    async def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversations (metadata only), with unflushed titles and counts applied.
+
+        Args:
+            limit: Maximum conversations to return, or None for all
+            before: Cursor; only older conversations are returned
+
+        Returns:
+            List of conversation metadata dicts
+        """
+        conversations = await aio.list_conversations(limit, before)
+        for item in conversations:
+            entry = self._entries.get(item["id"])
+            if entry is not None and entry.dirty:
+                item["title"] = entry.conversation["title"]
+                item["message_count"] = len(entry.conversation["messages"])
+        return conversations
+
+    async def append_message(self, conversation_id: str, message: Dict[str, Any]) -> int:
+        """
+        Append a message in memory and queue it for the next flush.
+
+        Args:
+            conversation_id: Conversation identifier
+            message: Message dict to append
+
+        Returns:
+            Index of the message in the conversation
+
+        Raises:
+            ValueError: If the conversation does not exist
+        """
+        async with self._lock(conversation_id):
+            entry = await self._load(conversation_id)
+            if entry is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+            entry.conversation["messages"].append(message)
+            entry.pending_messages.append(message)
+            self._schedule_flush(conversation_id, entry)
+            return len(entry.conversation["messages"]) - 1
+
+    async def add_user_message(self, conversation_id: str, content: str) -> int:
+        """
+        Add a user message to a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            content: User message content
+
+        Returns:
+            Index of the message in the conversation
+        """
+        return await self.append_message(conversation_id, {
+            "role": "user",
+            "content": content
+        })
+
+    async def add_assistant_message(
+        self,
+        conversation_id: str,
+        stage1: List[Dict[str, Any]],
+        stage2: List[Dict[str, Any]],
+        stage3: Dict[str, Any],
+        trace: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Add an assistant message with all 3 stages to a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            stage1: List of individual model responses
+            stage2: List of model rankings
+            stage3: Final synthesized response
+            trace: Optional timing trace of the run that produced the message
+            usage: Optional token usage of the run (see backend.usage.run_usage)
+        """
+        message = {
+            "role": "assistant",
+            "stage1": stage1,
+            "stage2": stage2,
+            "stage3": stage3
+        }
+        if trace is not None:
+            message["trace"] = trace
+        if usage is not None:
+            message["usage"] = usage
+        await self.append_message(conversation_id, message)
+
+    async def update_conversation_title(self, conversation_id: str, title: str):
+        """
+        Update a conversation's title in memory and queue it for the next flush.
+
+        Args:
+            conversation_id: Conversation identifier
+            title: New title for the conversation
+
+        Raises:
+            ValueError: If the conversation does not exist
+        """
+        async with self._lock(conversation_id):
+            entry = await self._load(conversation_id)
+            if entry is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+            entry.conversation["title"] = title
+            entry.pending_title = title
+            self._schedule_flush(conversation_id, entry)
+
+    async def flush(self, conversation_id: str, from_timer: bool = False):
+        """
+        Write all queued changes for a conversation in one storage commit.
+
+        If the commit fails the changes stay queued for the next flush,
+        unless the conversation no longer exists in storage, in which case
+        its entry is dropped.
+
+        Args:
+            conversation_id: Conversation identifier
+            from_timer: True when called by the write-behind timer itself
+
+        Raises:
+            ValueError: If the conversation no longer exists in storage
+        """
+        async with self._lock(conversation_id):
+            entry = self._entries.get(conversation_id)
+            if entry is None or not entry.dirty:
+                return
+
+            if not from_timer and entry.flush_task is not None:
+                entry.flush_task.cancel()
+            entry.flush_task = None
+
+            messages, title = entry.pending_messages, entry.pending_title
+            entry.pending_messages, entry.pending_title = [], None
+            try:
+                await aio.commit(conversation_id, messages, title)
+            except BaseException as e:
+                if isinstance(e, ValueError) and await aio.get_messages(conversation_id, 0, 0) is None:
+                    # Gone from storage: retrying can never succeed
+                    print(f"Dropping unflushed changes of missing conversation {conversation_id}")
+                    del self._entries[conversation_id]
+                    raise
+                # Keep the changes queued so the next flush retries them
+                entry.pending_messages = messages + entry.pending_messages
+                if entry.pending_title is None:
+                    entry.pending_title = title
+                raise
+            self.flushes += 1
+
+        self._evict()
+
+    async def close(self):
+        """Flush every dirty conversation (called on shutdown)."""
+        for conversation_id in list(self._entries):
+            try:
+                await self.flush(conversation_id)
+            except Exception as e:
+                print(f"Error flushing conversation {conversation_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "flushes": self.flushes,
+            "entries": len(self._entries),
+            "dirty": sum(1 for entry in self._entries.values() if entry.dirty),
+        }
+
+
+conversation_cache = ConversationCache(
+    CONVERSATION_CACHE["max_entries"], CONVERSATION_CACHE["flush_delay"]
+)
@@ -0,0 +1,187 @@
+"""Maintained conversation metadata index with cursor pagination."""
+
+import bisect
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Journal file name, shared by the file-based stores in their data directory
+INDEX_FILE = "index.jsonl"
+
+def encode_cursor(item: Dict[str, Any]) -> str:
+    """
+    Build a pagination cursor pointing just past a listed conversation.
+
+    Args:
+        item: Conversation metadata dict with 'created_at' and 'id'
+
+    Returns:
+        Cursor string of the form 'created_at|id'
+    """
+    return f"{item['created_at']}|{item['id']}"
+
+
+def parse_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Split a cursor from encode_cursor() into its sort key.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, sep, conversation_id = cursor.partition("|")
+    if not sep or not created_at or not conversation_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, conversation_id
+
+
+def paginate(
+    items: List[Dict[str, Any]],
+    limit: Optional[int] = None,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Page through metadata already sorted newest first.
+
+    Args:
+        items: Metadata dicts sorted by (created_at, id) descending
+        limit: Maximum items to return, or None for all
+        before: Cursor; only items older than it are returned
+
+    Returns:
+        The requested page
+    """
+    if before is not None:
+        key = parse_cursor(before)
+        items = [item for item in items if (item["created_at"], item["id"]) < key]
+    return items if limit is None else items[:limit]
+
+
+class MetadataIndex:
+    """
+    In-memory index of conversation metadata, persisted as an append-only journal.
+
+    Entries are kept sorted by (created_at, id), so a page is a binary search
+    plus a slice: O(log n + page size) no matter how many conversations exist.
+    Every upsert appends one JSON line to the journal; the journal is
+    compacted once it holds far more lines than live entries, and on load if
+    it ends in a torn line. If the journal is missing, the index is rebuilt
+    once from a full scan.
+    """
+
+    def __init__(self, path: str, scan: Callable[[], Iterable[Dict[str, Any]]]):
+        """
+        Initialize the index (loaded lazily on first use).
+
+        Args:
+            path: Journal file path
+            scan: Function yielding metadata for every stored conversation,
+                used to rebuild the index when the journal does not exist
+        """
+        self.path = path
+        self.scan = scan
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._keys: List[Tuple[str, str]] = []
+        self._journal_lines = 0
+
+    def _load(self):
+        """Load the journal, or rebuild it from a scan if it is missing."""
+        self._entries = {}
+        self._keys = []
+        self._journal_lines = 0
+
+        if not os.path.exists(self.path):
+            for item in self.scan():
+                self._set(item)
+            self._compact()
+            return
+
+        torn = False
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    # Torn final line: the upsert it carried is lost, not the index
+                    torn = True
+                    continue
+                self._journal_lines += 1
+                self._set(item)
+
+        if torn:
+            # Rewrite the journal so the next upsert does not land on the torn line
+            self._compact()
+
+    def _ensure_loaded(self):
+        """Load the index on first use."""
+        if self._entries is None:
+            self._load()
+
+    def _set(self, item: Dict[str, Any]):
+        """Insert or replace an entry in memory."""
+        old = self._entries.get(item["id"])
+        if old is not None:
+            old_key = (old["created_at"], old["id"])
+            del self._keys[bisect.bisect_left(self._keys, old_key)]
+        self._entries[item["id"]] = {
+            "id": item["id"],
+            "created_at": item["created_at"],
+            "title": item.get("title", "New Conversation"),
+            "message_count": item.get("message_count", 0),
+        }
+        bisect.insort(self._keys, (item["created_at"], item["id"]))
+
+    def _compact(self):
+        """Rewrite the journal with one line per live entry."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for item in self._entries.values():
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self._journal_lines = len(self._entries)
+
+    def upsert(self, item: Dict[str, Any]):
+        """
+        Record new or changed metadata for a conversation.
+
+        Args:
+            item: Metadata dict with 'id', 'created_at', 'title' and 'message_count'
+        """
+        self._ensure_loaded()
+        self._set(item)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(self._entries[item["id"]], ensure_ascii=False) + "\n")
+        self._journal_lines += 1
+
+        if self._journal_lines > 2 * len(self._entries) + 100:
+            self._compact()
+
+    def page(self, limit: Optional[int] = None, before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of metadata, newest first.
+
+        Args:
+            limit: Maximum items to return, or None for all
+            before: Cursor; only conversations older than it are returned
+
+        Returns:
+            List of metadata dicts
+        """
+        self._ensure_loaded()
+        end = len(self._keys)
+        if before is not None:
+            end = bisect.bisect_left(self._keys, parse_cursor(before))
+        start = 0 if limit is None else max(0, end - limit)
+        return [
+            dict(self._entries[conversation_id])
+            for _, conversation_id in reversed(self._keys[start:end])
+        ]
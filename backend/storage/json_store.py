@@ -0,0 +1,209 @@
+"""JSON-based storage for conversations (one file per conversation)."""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+
+from .base import ConversationStore
+from .index import INDEX_FILE, MetadataIndex
+
+
+def _metadata(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the listing metadata of a conversation."""
+    return {
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(conversation["messages"])
+    }
+
+
+class JsonStore(ConversationStore):
+    """
+    Stores each conversation as a pretty-printed JSON file.
+
+    Every save also updates a MetadataIndex (data_dir/index.jsonl, the same
+    journal LogStore keeps), so listing a page never opens the conversation
+    files.
+    """
+
+    def __init__(self, data_dir: str):
+        """
+        Initialize the JSON store.
+
+        Args:
+            data_dir: Directory holding one '<id>.json' file per conversation
+        """
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._index = MetadataIndex(os.path.join(data_dir, INDEX_FILE), self._scan)
+
+    def ensure_data_dir(self):
+        """Ensure the data directory exists."""
+        Path(self.data_dir).mkdir(parents=True, exist_ok=True)
+
+    def get_conversation_path(self, conversation_id: str) -> str:
+        """Get the file path for a conversation."""
+        return os.path.join(self.data_dir, f"{conversation_id}.json")
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Create a new conversation.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            New conversation dict
+        """
+        self.ensure_data_dir()
+
+        conversation = {
+            "id": conversation_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "title": "New Conversation",
+            "messages": []
+        }
+
+        # Save to file
+        self.save_conversation(conversation)
+
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation from storage.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Conversation dict or None if not found
+        """
+        path = self.get_conversation_path(conversation_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """
+        Save a conversation to storage.
+
+        The file is replaced atomically (temp file, fsync, rename), so a
+        concurrent reader on another storage thread sees either the old or
+        the new conversation, never a half-written file.
+
+        Args:
+            conversation: Conversation dict to save
+        """
+        self.ensure_data_dir()
+
+        path = self.get_conversation_path(conversation['id'])
+        # A unique temp file, since two threads may save the same conversation
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f"{conversation['id']}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(conversation, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            # Renamed under the lock so the index ends up with the last save
+            with self._lock:
+                os.replace(tmp_path, path)
+                self._index.upsert(_metadata(conversation))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Read metadata for every conversation file (used to rebuild the index)."""
+        self.ensure_data_dir()
+
+        conversations = []
+        for filename in os.listdir(self.data_dir):
+            if filename.endswith('.json'):
+                path = os.path.join(self.data_dir, filename)
+                with open(path, 'r') as f:
+                    conversations.append(_metadata(json.load(f)))
+        return conversations
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversations (metadata only), newest first, from the metadata index.
+
+        Args:
+            limit: Maximum conversations to return, or None for all
+            before: Cursor; only older conversations are returned
+
+        Returns:
+            List of conversation metadata dicts
+        """
+        with self._lock:
+            return self._index.page(limit, before)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """
+        Append a message to a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            message: Message dict to append
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["messages"].append(message)
+
+        self.save_conversation(conversation)
+
+    def update_title(self, conversation_id: str, title: str):
+        """
+        Update the title of a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            title: New title for the conversation
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["title"] = title
+        self.save_conversation(conversation)
+
+    def commit(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None
+    ):
+        """
+        Apply appended messages and a title change with a single file rewrite.
+
+        Args:
+            conversation_id: Conversation identifier
+            messages: Messages to append, in order
+            title: New title, or None to keep the current one
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["messages"].extend(messages)
+        if title is not None:
+            conversation["title"] = title
+        self.save_conversation(conversation)
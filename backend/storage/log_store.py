@@ -0,0 +1,724 @@
+"""Append-only log storage for conversations."""
+
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import ConversationStore, message_range, slice_conversation
+from .codec import Codec, codecs_by_suffix
+from .index import INDEX_FILE, MetadataIndex
+
+
+HEADER_FILE = "header.json"
+LOG_FILE = "messages.jsonl"
+OFFSETS_FILE = "messages.offsets"
+
+# Per message: start and end offset of the log block holding it, and its line within the block
+OFFSET_RECORD = struct.Struct("<QQI")
+
+# Suffix a converted legacy '<id>.json' file is kept under
+LEGACY_BACKUP_SUFFIX = ".bak"
+
+# Append descriptors kept open at once; older ones are closed and reopened on demand
+MAX_OPEN_LOGS = 64
+
+
+def _fsync_dir(path: str):
+    """fsync a directory so renames and new files in it survive a crash."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _encode_lines(messages: List[Dict[str, Any]]) -> List[bytes]:
+    """Serialize messages as log lines."""
+    return [(json.dumps(m, ensure_ascii=False) + "\n").encode('utf-8') for m in messages]
+
+
+def _offset_records(codec: Codec, start: int, lines: List[bytes], size: int) -> List[Tuple[int, int, int]]:
+    """
+    Get the offset records of messages written as one block.
+
+    Args:
+        codec: Codec the block was written with
+        start: File offset of the block
+        lines: The messages' encoded lines
+        size: Size of the written block
+
+    Returns:
+        One (block start, block end, line in block) record per message
+    """
+    if codec.suffix:
+        return [(start, start + size, line) for line in range(len(lines))]
+    # Any run of whole lines is a valid plain block, so each line is its own
+    records = []
+    for line in lines:
+        records.append((start, start + len(line), 0))
+        start += len(line)
+    return records
+
+
+class LogStore(ConversationStore):
+    """
+    Stores each conversation as a small header plus an append-only message log.
+
+    Layout under data_dir:
+        <id>/header.json     - id, created_at, title, message_count
+        <id>/messages.jsonl  - one JSON message per line, optionally
+                               compressed (messages.jsonl.gz / .zst)
+        <id>/messages.offsets - fixed-size record per message locating
+                               the log block (and line in it) holding it
+
+    Appending a message is a single write() of one line to a file opened
+    with O_APPEND, so a turn costs I/O proportional to the new message
+    rather than the whole conversation. fsync is batched: dirty logs are
+    synced together at most every 'fsync_interval' seconds (and on flush()
+    or close()). Reads replay the log; a torn final line from a crash is
+    ignored and trimmed before the next append. save_conversation() compacts
+    by rewriting the log in one atomic replace.
+
+    get_messages() looks the requested range up in the offsets file and
+    reads and decodes only the blocks holding it. The offsets file is
+    derived data: it is not fsynced, and if it does not match the log (after
+    a crash) it is rebuilt from the log on the next range read.
+
+    Legacy '<id>.json' files are read transparently and converted to the
+    log layout on their first write. The legacy file is only renamed to
+    '<id>.json.bak' once the new log and header have been fsynced, so a
+    crash mid-conversion leaves the original readable and a rollback can
+    restore it.
+
+    Every header write also updates a MetadataIndex (data_dir/index.jsonl),
+    so listing a page never scans the conversation directories.
+
+    With a compressing codec each append becomes one gzip member or zstd
+    frame. Small blocks compress poorly, so recompress() rewrites a log as a
+    single block once it has grown; logs in any format (including plain
+    ones written before compression was enabled) are read transparently.
+    """
+
+    def __init__(self, data_dir: str, fsync_interval: float = 1.0, codec: Optional[Codec] = None):
+        """
+        Initialize the store.
+
+        Args:
+            data_dir: Directory holding one subdirectory per conversation
+            fsync_interval: Seconds between batched fsyncs (0 = fsync every append)
+            codec: Codec for new and recompressed logs (default: uncompressed)
+        """
+        self.data_dir = data_dir
+        self.fsync_interval = fsync_interval
+        self.codec = codec or Codec()
+        self._codecs = codecs_by_suffix(self.codec)
+        self._lock = threading.Lock()
+        self._fds: Dict[str, Tuple[int, Codec]] = {}
+        self._dirty: set = set()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._index = MetadataIndex(os.path.join(data_dir, INDEX_FILE), self._scan)
+
+    def ensure_data_dir(self):
+        """Ensure the data directory exists."""
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _dir(self, conversation_id: str) -> str:
+        """Get the directory for a conversation's header and log."""
+        return os.path.join(self.data_dir, conversation_id)
+
+    def _legacy_path(self, conversation_id: str) -> str:
+        """Get the path of a conversation stored in the old single-file format."""
+        return os.path.join(self.data_dir, f"{conversation_id}.json")
+
+    # ------------------------------------------------------------------
+    # Header and log primitives
+    # ------------------------------------------------------------------
+
+    def _write_header(self, header: Dict[str, Any], durable: bool = False):
+        """
+        Replace a conversation's header atomically and update the index.
+
+        Args:
+            header: Header dict
+            durable: fsync the header and its directory before returning
+        """
+        directory = self._dir(header["id"])
+        path = os.path.join(directory, HEADER_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(header, f)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if durable:
+            _fsync_dir(directory)
+        self._index.upsert(header)
+
+    def _read_header(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Read a conversation's header, or None if it is missing or unreadable."""
+        try:
+            with open(os.path.join(self._dir(conversation_id), HEADER_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _find_log(self, conversation_id: str) -> Tuple[str, Codec]:
+        """Get the path and codec of a conversation's log, whichever format it is in."""
+        base = os.path.join(self._dir(conversation_id), LOG_FILE)
+        for suffix, codec in self._codecs.items():
+            if os.path.exists(base + suffix):
+                return base + suffix, codec
+        return base + self.codec.suffix, self.codec
+
+    def _read_log(self, conversation_id: str) -> bytes:
+        """Read and decode the complete records of a conversation's log."""
+        path, codec = self._find_log(conversation_id)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return b""
+        return codec.decode(data)[0]
+
+    def _replay(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Read every complete message from a conversation's log."""
+        data = self._read_log(conversation_id)
+
+        messages = []
+        for line in data.split(b"\n"):
+            if not line:
+                continue
+            try:
+                messages.append(json.loads(line))
+            except ValueError:
+                # Torn write at the tail: everything before it is intact
+                break
+        return messages
+
+    def _open_log(self, conversation_id: str) -> Tuple[int, Codec]:
+        """Get an append-mode descriptor for a log, trimming any torn tail."""
+        opened = self._fds.get(conversation_id)
+        if opened is not None:
+            return opened
+
+        if len(self._fds) >= MAX_OPEN_LOGS:
+            # Close the least recently opened log, syncing it first if needed
+            oldest = next(iter(self._fds))
+            fd, _ = self._fds.pop(oldest)
+            if oldest in self._dirty:
+                os.fsync(fd)
+                self._dirty.discard(oldest)
+            os.close(fd)
+
+        # Appends continue in the log's existing format until it is recompressed
+        path, codec = self._find_log(conversation_id)
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        size = os.fstat(fd).st_size
+        if size and (codec.suffix or os.pread(fd, 1, size - 1) != b"\n"):
+            with open(path, 'rb') as f:
+                valid = codec.decode(f.read())[1]
+            if valid < size:
+                os.ftruncate(fd, valid)
+        self._fds[conversation_id] = (fd, codec)
+        return fd, codec
+
+    def _append(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        """Append message lines in one write and schedule them for the next fsync batch."""
+        fd, codec = self._open_log(conversation_id)
+        lines = _encode_lines(messages)
+        encoded = codec.compress(b"".join(lines))
+        start = os.fstat(fd).st_size
+        os.write(fd, encoded)
+        self._dirty.add(conversation_id)
+        self._append_offsets(conversation_id, _offset_records(codec, start, lines, len(encoded)))
+
+        if self.fsync_interval <= 0:
+            self._fsync_dirty()
+        else:
+            self._start_flusher()
+
+    def _offsets_path(self, conversation_id: str) -> str:
+        """Get the path of a conversation's message offsets file."""
+        return os.path.join(self._dir(conversation_id), OFFSETS_FILE)
+
+    def _append_offsets(self, conversation_id: str, records: List[Tuple[int, int, int]]):
+        """Append offset records for newly written messages."""
+        with open(self._offsets_path(conversation_id), 'ab') as f:
+            f.write(b"".join(OFFSET_RECORD.pack(*record) for record in records))
+
+    def _write_offsets(self, conversation_id: str, records: List[Tuple[int, int, int]]):
+        """Replace a conversation's offsets file atomically."""
+        path = self._offsets_path(conversation_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(OFFSET_RECORD.pack(*record) for record in records))
+        os.replace(tmp_path, path)
+
+    def _read_offsets(self, conversation_id: str, index: int) -> Tuple[int, int, int]:
+        """Read the offset record of one message."""
+        with open(self._offsets_path(conversation_id), 'rb') as f:
+            f.seek(index * OFFSET_RECORD.size)
+            return OFFSET_RECORD.unpack(f.read(OFFSET_RECORD.size))
+
+    def _offsets_match(self, conversation_id: str, header: Dict[str, Any]) -> bool:
+        """Check that the offsets file covers exactly the header's messages and the whole log."""
+        try:
+            size = os.path.getsize(self._offsets_path(conversation_id))
+        except OSError:
+            return False
+        count = header["message_count"]
+        if size != count * OFFSET_RECORD.size:
+            return False
+        path, _ = self._find_log(conversation_id)
+        log_size = os.path.getsize(path) if os.path.exists(path) else 0
+        if count == 0:
+            return log_size == 0
+        return self._read_offsets(conversation_id, count - 1)[1] == log_size
+
+    def _rebuild_offsets(self, conversation_id: str, header: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a conversation's offsets file from its log (caller holds the lock).
+
+        The log's torn tail, if any, is trimmed first, and the header's
+        message count is corrected if it lags the log.
+
+        Returns:
+            The (possibly updated) header
+        """
+        self._open_log(conversation_id)
+        path, codec = self._find_log(conversation_id)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        records = []
+        for start, end, payload in codec.blocks(data):
+            records.extend((start, end, line) for line in range(payload.count(b"\n")))
+        self._write_offsets(conversation_id, records)
+
+        if header["message_count"] != len(records):
+            header["message_count"] = len(records)
+            self._write_header(header)
+        return header
+
+    def _read_range(self, conversation_id: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Read messages [start, end) by decoding only the log blocks holding them.
+
+        Stops at a corrupt line, like _replay().
+        """
+        if start >= end:
+            return []
+        first_start, _, first_line = self._read_offsets(conversation_id, start)
+        _, last_end, _ = self._read_offsets(conversation_id, end - 1)
+
+        path, codec = self._find_log(conversation_id)
+        with open(path, 'rb') as f:
+            f.seek(first_start)
+            data = codec.decode(f.read(last_end - first_start))[0]
+
+        lines = data.split(b"\n", first_line + end - start)[first_line:first_line + end - start]
+        messages = []
+        for line in lines:
+            try:
+                messages.append(json.loads(line))
+            except ValueError:
+                break
+        return messages
+
+    def _fsync_dirty(self):
+        """fsync every log written since the last batch (caller holds the lock)."""
+        for conversation_id in self._dirty:
+            opened = self._fds.get(conversation_id)
+            if opened is not None:
+                os.fsync(opened[0])
+        self._dirty.clear()
+
+    def _start_flusher(self):
+        """Start the background thread that fsyncs dirty logs in batches."""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._stop.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="log-store-fsync", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self):
+        """Periodically fsync dirty logs until the store is closed."""
+        while not self._stop.wait(self.fsync_interval):
+            self.flush()
+
+    def _convert_legacy(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Move a legacy single-file conversation into the log layout, keeping a backup."""
+        legacy_path = self._legacy_path(conversation_id)
+        if not os.path.exists(legacy_path):
+            return None
+        with open(legacy_path, 'r') as f:
+            conversation = json.load(f)
+        header = self._compact(conversation)
+        self._retire_legacy(conversation_id)
+        return header
+
+    def _retire_legacy(self, conversation_id: str):
+        """
+        Rename a converted legacy file to its backup name.
+
+        Only called after _compact(), whose log and header are durable by
+        then, so the conversation is never without a complete copy on disk.
+        """
+        legacy_path = self._legacy_path(conversation_id)
+        if os.path.exists(legacy_path):
+            os.replace(legacy_path, legacy_path + LEGACY_BACKUP_SUFFIX)
+            _fsync_dir(self.data_dir)
+
+    def _compact(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite a conversation's log and header from a full conversation dict."""
+        conversation_id = conversation["id"]
+        os.makedirs(self._dir(conversation_id), exist_ok=True)
+
+        # Drop the append descriptor: it would point at the replaced file
+        opened = self._fds.pop(conversation_id, None)
+        if opened is not None:
+            os.close(opened[0])
+        self._dirty.discard(conversation_id)
+
+        messages = conversation.get("messages", [])
+        lines = _encode_lines(messages)
+        encoded = self.codec.compress(b"".join(lines))
+
+        base = os.path.join(self._dir(conversation_id), LOG_FILE)
+        path = base + self.codec.suffix
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        # Old offsets must never be paired with the new log, even after a crash
+        try:
+            os.remove(self._offsets_path(conversation_id))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+        _fsync_dir(self._dir(conversation_id))
+        self._write_offsets(conversation_id, _offset_records(self.codec, 0, lines, len(encoded)))
+
+        # Remove the log in any previous format
+        for suffix in self._codecs:
+            if suffix != self.codec.suffix and os.path.exists(base + suffix):
+                os.remove(base + suffix)
+
+        header = {
+            "id": conversation_id,
+            "created_at": conversation["created_at"],
+            "title": conversation.get("title", "New Conversation"),
+            "message_count": len(messages),
+            "compacted_bytes": len(encoded),
+        }
+        self._write_header(header, durable=True)
+        return header
+
+    def _header_for_write(self, conversation_id: str) -> Dict[str, Any]:
+        """Get the header of a conversation about to be modified (caller holds the lock)."""
+        header = self._read_header(conversation_id)
+        if header is None:
+            header = self._convert_legacy(conversation_id)
+        if header is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+        return header
+
+    # ------------------------------------------------------------------
+    # ConversationStore interface
+    # ------------------------------------------------------------------
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Create a new conversation.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            New conversation dict
+        """
+        self.ensure_data_dir()
+
+        header = {
+            "id": conversation_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "title": "New Conversation",
+            "message_count": 0,
+        }
+
+        with self._lock:
+            os.makedirs(self._dir(conversation_id), exist_ok=True)
+            self._write_header(header)
+
+        return {
+            "id": header["id"],
+            "created_at": header["created_at"],
+            "title": header["title"],
+            "messages": []
+        }
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation by replaying its log.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Conversation dict or None if not found
+        """
+        header = self._read_header(conversation_id)
+        if header is None:
+            legacy_path = self._legacy_path(conversation_id)
+            if not os.path.exists(legacy_path):
+                return None
+            with open(legacy_path, 'r') as f:
+                return json.load(f)
+
+        messages = self._replay(conversation_id)
+        if len(messages) != header["message_count"]:
+            # The header lags the log if a crash hit between the two writes;
+            # re-check under the lock so an append in flight is not mistaken for one
+            with self._lock:
+                header = self._read_header(conversation_id) or header
+                messages = self._replay(conversation_id)
+                if len(messages) != header["message_count"]:
+                    header["message_count"] = len(messages)
+                    self._write_header(header)
+
+        return {
+            "id": header["id"],
+            "created_at": header["created_at"],
+            "title": header["title"],
+            "messages": messages
+        }
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with a range of messages.
+
+        Only the log blocks holding the range are read and decoded, located
+        through the offsets file (rebuilt first if it does not match the log).
+        Parsing stops at a corrupt line, like a full replay.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            offset: Index of the first message; negative counts from the end
+            limit: Maximum messages to return, or None for all after offset
+
+        Returns:
+            Dict as returned by slice_conversation(), or None if not found
+        """
+        header = self._read_header(conversation_id)
+        if header is None:
+            conversation = self.get_conversation(conversation_id)
+            return slice_conversation(conversation, offset, limit) if conversation else None
+
+        # Under the lock, so a compaction cannot swap the log mid-read
+        with self._lock:
+            header = self._read_header(conversation_id) or header
+            if not self._offsets_match(conversation_id, header):
+                header = self._rebuild_offsets(conversation_id, header)
+            total = header["message_count"]
+            start, end = message_range(total, offset, limit)
+            messages = self._read_range(conversation_id, start, end)
+
+        return {
+            "id": header["id"],
+            "created_at": header["created_at"],
+            "title": header["title"],
+            "message_count": total,
+            "offset": start,
+            "messages": messages
+        }
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """
+        Save a whole conversation, compacting its log.
+
+        Args:
+            conversation: Conversation dict to save
+        """
+        self.ensure_data_dir()
+        with self._lock:
+            self._compact(conversation)
+            self._retire_legacy(conversation["id"])
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Read metadata for every conversation on disk (used to rebuild the index)."""
+        self.ensure_data_dir()
+
+        conversations = []
+        for name in os.listdir(self.data_dir):
+            path = os.path.join(self.data_dir, name)
+            if os.path.isdir(path):
+                header = self._read_header(name)
+                if header is not None:
+                    conversations.append(header)
+            elif name.endswith('.json'):
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                conversations.append({
+                    "id": data["id"],
+                    "created_at": data["created_at"],
+                    "title": data.get("title", "New Conversation"),
+                    "message_count": len(data["messages"])
+                })
+        return conversations
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversations (metadata only), newest first, from the metadata index.
+
+        Args:
+            limit: Maximum conversations to return, or None for all
+            before: Cursor; only older conversations are returned
+
+        Returns:
+            List of conversation metadata dicts
+        """
+        with self._lock:
+            return self._index.page(limit, before)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """
+        Append a message to a conversation's log.
+
+        Args:
+            conversation_id: Conversation identifier
+            message: Message dict to append
+        """
+        with self._lock:
+            header = self._header_for_write(conversation_id)
+            self._append(conversation_id, [message])
+            header["message_count"] += 1
+            self._write_header(header)
+
+    def update_title(self, conversation_id: str, title: str):
+        """
+        Update the title of a conversation (rewrites only the header).
+
+        Args:
+            conversation_id: Conversation identifier
+            title: New title for the conversation
+        """
+        with self._lock:
+            header = self._header_for_write(conversation_id)
+            header["title"] = title
+            self._write_header(header)
+
+    def commit(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None
+    ):
+        """
+        Append messages in one log write and update the header once.
+
+        Args:
+            conversation_id: Conversation identifier
+            messages: Messages to append, in order
+            title: New title, or None to keep the current one
+        """
+        with self._lock:
+            header = self._header_for_write(conversation_id)
+            if messages:
+                self._append(conversation_id, messages)
+                header["message_count"] += len(messages)
+            if title is not None:
+                header["title"] = title
+            self._write_header(header)
+
+    def recompression_candidates(self, min_growth: int) -> List[str]:
+        """
+        List conversations whose logs should be recompressed.
+
+        Args:
+            min_growth: Bytes a compressed log must have grown by since it was last compacted
+
+        Returns:
+            Conversation ids, per needs_recompression()
+        """
+        return [
+            item["id"] for item in self.list_conversations()
+            if self.needs_recompression(item["id"], min_growth)
+        ]
+
+    def needs_recompression(self, conversation_id: str, min_growth: int) -> bool:
+        """
+        Check whether a log would benefit from being rewritten as one block.
+
+        Args:
+            conversation_id: Conversation identifier
+            min_growth: Bytes a log must have grown by since its last compaction
+
+        Returns:
+            True if the log is in another format than the configured codec,
+            or is compressed and has grown by at least min_growth bytes
+        """
+        if self._read_header(conversation_id) is None:
+            return os.path.exists(self._legacy_path(conversation_id))
+
+        path, codec = self._find_log(conversation_id)
+        if not os.path.exists(path):
+            return False
+        if codec.suffix != self.codec.suffix:
+            return True
+        if not codec.suffix:
+            return False
+        header = self._read_header(conversation_id)
+        return os.path.getsize(path) - header.get("compacted_bytes", 0) >= min_growth
+
+    def recompress(self, conversation_id: str):
+        """
+        Rewrite a conversation's log as a single block in the configured format.
+
+        Args:
+            conversation_id: Conversation identifier
+        """
+        with self._lock:
+            header = self._read_header(conversation_id)
+            if header is None:
+                self._convert_legacy(conversation_id)
+                return
+            self._compact({
+                "id": header["id"],
+                "created_at": header["created_at"],
+                "title": header["title"],
+                "messages": self._replay(conversation_id),
+            })
+
+    def flush(self):
+        """fsync every log written since the last batch."""
+        with self._lock:
+            if self._dirty:
+                self._fsync_dirty()
+
+    def close(self):
+        """Flush pending appends and close all log descriptors."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            self._fsync_dirty()
+            for fd, _ in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
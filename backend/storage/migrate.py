@@ -0,0 +1,89 @@
+"""
+Import file-based conversations into the SQLite store.
+
+Usage:
+    python -m backend.storage.migrate [--source DIR] [--target DB] [--overwrite]
+
+Conversations already present in the database are skipped unless
+--overwrite is given, so the tool can be re-run safely.
+"""
+
+import argparse
+import os
+import sys
+
+from ..config import DATA_DIR, SQLITE_PATH
+from . import configured_codec
+from .log_store import LogStore
+from .sqlite_store import SqliteStore
+
+
+def migrate(source_dir: str, target_path: str, overwrite: bool = False) -> dict:
+    """
+    Copy every file-based conversation into a SQLite database.
+
+    Args:
+        source_dir: Directory of conversation logs and/or legacy '<id>.json' files
+        target_path: Path to the SQLite database (created if missing)
+        overwrite: Replace conversations that already exist in the database
+
+    Returns:
+        Dict with 'imported', 'skipped' and 'failed' counts
+    """
+    # LogStore reads both its own logs and legacy single-file conversations
+    source = LogStore(source_dir)
+    target = SqliteStore(target_path, configured_codec())
+    counts = {"imported": 0, "skipped": 0, "failed": 0}
+
+    try:
+        names = sorted(os.listdir(source_dir)) if os.path.isdir(source_dir) else []
+        for name in names:
+            if name.endswith('.json'):
+                conversation_id = name[:-len('.json')]
+            elif os.path.isdir(os.path.join(source_dir, name)):
+                conversation_id = name
+            else:
+                continue
+
+            try:
+                conversation = source.get_conversation(conversation_id)
+            except (OSError, ValueError) as e:
+                print(f"Failed to read {name}: {e}")
+                counts["failed"] += 1
+                continue
+            if conversation is None:
+                continue
+
+            if not overwrite and target.get_conversation(conversation["id"]) is not None:
+                counts["skipped"] += 1
+                continue
+
+            target.save_conversation(conversation)
+            counts["imported"] += 1
+    finally:
+        source.close()
+        target.close()
+
+    return counts
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import file-based conversations into SQLite.")
+    parser.add_argument("--source", default=DATA_DIR, help=f"Conversation directory (default: {DATA_DIR})")
+    parser.add_argument("--target", default=SQLITE_PATH, help=f"SQLite database (default: {SQLITE_PATH})")
+    parser.add_argument("--overwrite", action="store_true", help="Replace conversations already imported")
+    args = parser.parse_args()
+
+    counts = migrate(args.source, args.target, args.overwrite)
+    print(
+        f"Imported {counts['imported']}, skipped {counts['skipped']}, "
+        f"failed {counts['failed']} conversations into {args.target}"
+    )
+    if counts["imported"] or counts["skipped"]:
+        print("Set STORAGE_BACKEND=sqlite to use the database.")
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
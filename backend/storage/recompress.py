@@ -0,0 +1,68 @@
+"""
+Background recompression of stored conversations.
+
+Usage (one pass, outside the server):
+    python -m backend.storage.recompress
+"""
+
+import asyncio
+
+from ..config import STORAGE_COMPRESSION
+from . import aio, get_store, close_store
+
+
+async def recompress_once(min_growth: int) -> int:
+    """
+    Recompress every conversation that needs it.
+
+    Each conversation is rewritten by its own storage call, so other
+    requests interleave with the job instead of waiting for the whole pass.
+
+    Args:
+        min_growth: Bytes a compressed log must have grown by since it was last compacted
+
+    Returns:
+        Number of conversations recompressed
+    """
+    count = 0
+    for conversation_id in await aio.recompression_candidates(min_growth):
+        try:
+            await aio.recompress(conversation_id)
+            count += 1
+        except Exception as e:
+            print(f"Error recompressing conversation {conversation_id}: {e}")
+    return count
+
+
+async def recompression_loop(interval: float, min_growth: int):
+    """
+    Run recompression passes forever (until cancelled).
+
+    Args:
+        interval: Seconds between passes
+        min_growth: Bytes a compressed log must have grown by since it was last compacted
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            count = await recompress_once(min_growth)
+            if count:
+                print(f"Recompressed {count} conversations")
+        except Exception as e:
+            print(f"Recompression pass failed: {e}")
+
+
+def main():
+    """Command-line entry point: run a single pass with the configured codec."""
+    store = get_store()
+    try:
+        ids = store.recompression_candidates(STORAGE_COMPRESSION["recompress_min_growth"])
+        for conversation_id in ids:
+            store.recompress(conversation_id)
+        print(f"Recompressed {len(ids)} conversations")
+    finally:
+        close_store()
+
+
+if __name__ == "__main__":
+    main()
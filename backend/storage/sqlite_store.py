@@ -0,0 +1,345 @@
+"""SQLite storage for conversations, using WAL mode."""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base import ConversationStore, message_range
+from .codec import Codec, decompress_blob
+from .index import parse_cursor
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+DROP INDEX IF EXISTS idx_conversations_created_at;
+CREATE INDEX IF NOT EXISTS idx_conversations_created_at_id
+    ON conversations (created_at, id);
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, seq)
+);
+"""
+
+
+class SqliteStore(ConversationStore):
+    """
+    Stores conversations in a single SQLite database.
+
+    Conversation metadata (including a maintained message count) lives in
+    its own table, so listing never touches message rows. Messages are
+    stored one row each as a JSON payload (compressed when a codec is
+    configured), so appending a turn does not rewrite the conversation.
+    WAL mode lets readers run alongside a writer.
+    """
+
+    def __init__(self, path: str, codec: Optional[Codec] = None):
+        """
+        Initialize the store, creating the database and schema if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            codec: Codec for new message payloads (default: uncompressed JSON text)
+        """
+        self.path = path
+        self.codec = codec or Codec()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly in _write()
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _encode(self, message: Dict[str, Any]):
+        """Serialize a message payload: JSON text, or a compressed BLOB (kept as-is by SQLite)."""
+        payload = json.dumps(message)
+        if not self.codec.suffix:
+            return payload
+        return self.codec.compress(payload.encode('utf-8'))
+
+    @staticmethod
+    def _decode(payload) -> Dict[str, Any]:
+        """Deserialize a payload stored in either form."""
+        if isinstance(payload, bytes):
+            payload = decompress_blob(payload)
+        return json.loads(payload)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in a write transaction, taking the write lock up front."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Create a new conversation.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            New conversation dict
+        """
+        conversation = {
+            "id": conversation_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "title": "New Conversation",
+            "messages": []
+        }
+
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO conversations (id, created_at, title, message_count) "
+                "VALUES (?, ?, ?, 0)",
+                (conversation["id"], conversation["created_at"], conversation["title"])
+            )
+
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with all its messages.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+
+        Returns:
+            Conversation dict or None if not found
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT id, created_at, title FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        messages = conn.execute(
+            "SELECT payload FROM messages WHERE conversation_id = ? ORDER BY seq",
+            (conversation_id,)
+        ).fetchall()
+
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "title": row["title"],
+            "messages": [self._decode(m["payload"]) for m in messages]
+        }
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with a range of messages, reading only those rows.
+
+        Args:
+            conversation_id: Unique identifier for the conversation
+            offset: Index of the first message; negative counts from the end
+            limit: Maximum messages to return, or None for all after offset
+
+        Returns:
+            Dict as returned by slice_conversation(), or None if not found
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT id, created_at, title, message_count FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        start, end = message_range(row["message_count"], offset, limit)
+        messages = conn.execute(
+            "SELECT payload FROM messages WHERE conversation_id = ? AND seq >= ? AND seq < ? "
+            "ORDER BY seq",
+            (conversation_id, start, end)
+        ).fetchall()
+
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "title": row["title"],
+            "message_count": row["message_count"],
+            "offset": start,
+            "messages": [self._decode(m["payload"]) for m in messages]
+        }
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """
+        Save a whole conversation, replacing any stored version.
+
+        Args:
+            conversation: Conversation dict to save
+        """
+        messages = conversation.get("messages", [])
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO conversations (id, created_at, title, message_count) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET created_at = excluded.created_at, "
+                "title = excluded.title, message_count = excluded.message_count",
+                (
+                    conversation["id"],
+                    conversation["created_at"],
+                    conversation.get("title", "New Conversation"),
+                    len(messages),
+                )
+            )
+            conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation["id"],))
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, seq, role, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (conversation["id"], seq, message.get("role", ""), self._encode(message))
+                    for seq, message in enumerate(messages)
+                ]
+            )
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversations (metadata only), newest first, using the created_at index.
+
+        Args:
+            limit: Maximum conversations to return, or None for all
+            before: Cursor; only older conversations are returned
+
+        Returns:
+            List of conversation metadata dicts
+        """
+        query = "SELECT id, created_at, title, message_count FROM conversations"
+        params: List[Any] = []
+        if before is not None:
+            query += " WHERE (created_at, id) < (?, ?)"
+            params.extend(parse_cursor(before))
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._connection().execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """
+        Append a message to a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            message: Message dict to append
+        """
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT message_count FROM conversations WHERE id = ?",
+                (conversation_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            seq = row["message_count"]
+            conn.execute(
+                "INSERT INTO messages (conversation_id, seq, role, payload) VALUES (?, ?, ?, ?)",
+                (conversation_id, seq, message.get("role", ""), self._encode(message))
+            )
+            conn.execute(
+                "UPDATE conversations SET message_count = ? WHERE id = ?",
+                (seq + 1, conversation_id)
+            )
+
+    def update_title(self, conversation_id: str, title: str):
+        """
+        Update the title of a conversation.
+
+        Args:
+            conversation_id: Conversation identifier
+            title: New title for the conversation
+        """
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE conversations SET title = ? WHERE id = ?",
+                (title, conversation_id)
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+    def commit(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None
+    ):
+        """
+        Apply appended messages and a title change in one transaction.
+
+        Args:
+            conversation_id: Conversation identifier
+            messages: Messages to append, in order
+            title: New title, or None to keep the current one
+        """
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT message_count, title FROM conversations WHERE id = ?",
+                (conversation_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
+            start = row["message_count"]
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, seq, role, payload) VALUES (?, ?, ?, ?)",
+                [
+                    (conversation_id, start + i, message.get("role", ""), self._encode(message))
+                    for i, message in enumerate(messages)
+                ]
+            )
+            conn.execute(
+                "UPDATE conversations SET message_count = ?, title = ? WHERE id = ?",
+                (start + len(messages), title if title is not None else row["title"], conversation_id)
+            )
+
+    def close(self):
+        """Close every connection opened by this store."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,91 @@
+"""Append-only log of per-call token usage."""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class UsageLog:
+    """
+    Keeps one JSON line per model call that reported token usage.
+
+    Records are only ever appended, a run's worth at a time, and synced to
+    disk, so the log is cheap to write and a crash loses at most the last
+    partial line. The next append starts on a fresh line after such a tail,
+    and reads skip any line that does not parse.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the log.
+
+        Args:
+            path: Path of the JSONL file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, records: List[Dict[str, Any]]):
+        """
+        Append usage records.
+
+        Args:
+            records: Record dicts (see backend.usage.usage_records)
+        """
+        if not records:
+            return
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a+b') as f:
+                # Terminate a partial line left by a crash so it cannot swallow the first record
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = "\n" + data
+                f.write(data.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        conversation_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the records in a time range.
+
+        Args:
+            since: Only records with 'ts' >= since (None = from the start)
+            until: Only records with 'ts' < until (None = up to now)
+            conversation_id: Only records of this conversation (None = all)
+
+        Returns:
+            List of record dicts, in the order they were written
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn or corrupt line (includes invalid UTF-8)
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                ts = record.get("ts", 0)
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts >= until:
+                    continue
+                if conversation_id is not None and record.get("conversation_id") != conversation_id:
+                    continue
+                records.append(record)
+        return records
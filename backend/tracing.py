@@ -0,0 +1,152 @@
+"""Per-run timing traces for council turns."""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("council_trace", default=None)
+
+
+class Trace:
+    """
+    Timed spans recorded during one council run.
+
+    The trace is found through a context variable, so every task the run
+    starts (title generation, per-model requests, storage calls) adds its
+    spans to the same trace without it being passed around. Spans are flat
+    dicts with a 'name', their 'start' offset from the start of the run and
+    their 'duration', both in seconds, plus descriptive attributes such as
+    'stage' and 'model'.
+    """
+
+    def __init__(self, **attrs: Any):
+        """
+        Initialize the trace.
+
+        Args:
+            **attrs: Attributes describing the run (e.g., run_id)
+        """
+        self.attrs = attrs
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+    def record(self, name: str, start: float, end: float, attrs: Dict[str, Any]):
+        """
+        Add a finished span.
+
+        Args:
+            name: Span name
+            start: perf_counter() value when the span started
+            end: perf_counter() value when the span ended
+            attrs: Span attributes
+        """
+        self.spans.append({
+            "name": name,
+            "start": round(start - self._origin, 6),
+            "duration": round(end - start, 6),
+            **attrs,
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize where the time went.
+
+        Returns:
+            Dict with the duration of each stage and, per stage, the slowest
+            model request (the straggler)
+        """
+        stages = {}
+        slowest = {}
+        for span in self.spans:
+            if span["name"] == "stage":
+                stages[span["stage"]] = stages.get(span["stage"], 0.0) + span["duration"]
+            elif span["name"] == "model":
+                best = slowest.get(span["stage"])
+                if best is None or span["duration"] > best["duration"]:
+                    slowest[span["stage"]] = {"model": span["model"], "duration": span["duration"]}
+        return {"stages": stages, "slowest_models": slowest}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the trace as a JSON-serializable dict.
+
+        Returns:
+            Dict with 'started_at', 'duration', 'summary' and the 'spans' in start order
+        """
+        return {
+            **self.attrs,
+            "started_at": self.started_at,
+            "duration": round(time.perf_counter() - self._origin, 6),
+            "summary": self.summary(),
+            "spans": sorted(self.spans, key=lambda span: span["start"]),
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the run in progress, if any."""
+    return _current_trace.get()
+
+
+def start_trace(**attrs: Any) -> Trace:
+    """
+    Start a trace for the current task and the tasks it starts from now on.
+
+    Args:
+        **attrs: Attributes describing the run
+
+    Returns:
+        The new Trace
+    """
+    trace = Trace(**attrs)
+    _current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as a span of the current trace (a no-op outside a run).
+
+    Args:
+        name: Span name
+        **attrs: Span attributes
+
+    Yields:
+        The attribute dict, so the block can add attributes such as the outcome
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield attrs
+        return
+
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        trace.record(name, start, time.perf_counter(), attrs)
+
+
+def traced(name: str, **attrs: Any):
+    """
+    Decorate a synchronous function to record each call as a span.
+
+    Args:
+        name: Span name
+        **attrs: Span attributes
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
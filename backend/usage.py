@@ -0,0 +1,134 @@
+"""Token usage accounting for council runs."""
+
+from typing import Any, Dict, List, Optional
+
+from .tracing import Trace
+
+
+TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def _empty_totals() -> Dict[str, Any]:
+    """Get zeroed usage totals."""
+    return {"calls": 0, **{field: 0 for field in TOKEN_FIELDS}, "seconds": 0.0}
+
+
+def _add(totals: Dict[str, Any], usage: Dict[str, Any], seconds: float):
+    """Add one call's usage and generation time to running totals."""
+    totals["calls"] += 1
+    for field in TOKEN_FIELDS:
+        totals[field] += usage.get(field) or 0
+    totals["seconds"] += seconds
+
+
+def _finish(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Round the time and add the completion throughput to totals."""
+    seconds = totals["seconds"]
+    totals["seconds"] = round(seconds, 3)
+    totals["tokens_per_second"] = round(totals["completion_tokens"] / seconds, 2) if seconds else None
+    return totals
+
+
+def _call_seconds(span: Dict[str, Any]) -> float:
+    """Generation time of a call: as reported by the provider if it does, else the request time."""
+    return span["usage"].get("generation_seconds") or span["duration"]
+
+
+def run_usage(trace: Trace) -> Dict[str, Any]:
+    """
+    Aggregate the token usage of a run, per stage and per model.
+
+    Usage is read from the run's 'model' spans, which carry the counts the
+    provider reported. Responses served from the response cache used no
+    tokens and are not counted.
+
+    Args:
+        trace: The run's trace
+
+    Returns:
+        Dict with the run 'total' and, per stage, its totals and 'models'.
+        Totals hold 'calls', token counts, 'seconds' and 'tokens_per_second'
+    """
+    total = _empty_totals()
+    stages: Dict[str, Dict[str, Any]] = {}
+    for span in trace.spans:
+        if span["name"] != "model" or not span.get("usage"):
+            continue
+        seconds = _call_seconds(span)
+        stage = stages.setdefault(span["stage"], {**_empty_totals(), "models": {}})
+        model = stage["models"].setdefault(span["model"], _empty_totals())
+        for totals in (total, stage, model):
+            _add(totals, span["usage"], seconds)
+
+    for stage in stages.values():
+        for model in stage["models"].values():
+            _finish(model)
+        _finish(stage)
+    return {"total": _finish(total), "stages": stages}
+
+
+def usage_records(trace: Trace, conversation_id: str) -> List[Dict[str, Any]]:
+    """
+    Turn a run's model calls into usage log records.
+
+    Args:
+        trace: The run's trace
+        conversation_id: Conversation the run belongs to
+
+    Returns:
+        One record per call that reported usage, with its end time 'ts'
+    """
+    records = []
+    for span in trace.spans:
+        if span["name"] != "model" or not span.get("usage"):
+            continue
+        records.append({
+            "ts": round(trace.started_at + span["start"] + span["duration"], 3),
+            "run_id": trace.attrs.get("run_id"),
+            "conversation_id": conversation_id,
+            "stage": span["stage"],
+            "model": span["model"],
+            **{field: span["usage"].get(field) or 0 for field in TOKEN_FIELDS},
+            "seconds": round(_call_seconds(span), 3),
+        })
+    return records
+
+
+def summarize_usage(records: List[Dict[str, Any]], bucket: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Summarize usage records per model, overall and over time.
+
+    Args:
+        records: Usage log records
+        bucket: Width of the time buckets in seconds (None or 0 = no series)
+
+    Returns:
+        Dict with 'models' (per model totals and per stage 'stages' totals)
+        and, if bucketed, 'series': one entry per non-empty bucket with its
+        'start' time and per model totals, oldest first
+    """
+    models: Dict[str, Dict[str, Any]] = {}
+    series: Dict[float, Dict[str, Dict[str, Any]]] = {}
+    for record in records:
+        seconds = record.get("seconds") or 0.0
+        model = models.setdefault(record["model"], {**_empty_totals(), "stages": {}})
+        stage = model["stages"].setdefault(record["stage"], _empty_totals())
+        _add(model, record, seconds)
+        _add(stage, record, seconds)
+        if bucket:
+            start = record["ts"] - record["ts"] % bucket
+            point = series.setdefault(start, {}).setdefault(record["model"], _empty_totals())
+            _add(point, record, seconds)
+
+    for model in models.values():
+        for stage in model["stages"].values():
+            _finish(stage)
+        _finish(model)
+
+    summary: Dict[str, Any] = {"models": models}
+    if bucket:
+        summary["series"] = [
+            {"start": start, "models": {name: _finish(totals) for name, totals in points.items()}}
+            for start, points in sorted(series.items())
+        ]
+    return summary
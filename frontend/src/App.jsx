@@ -6,6 +6,7 @@ import './App.css';
 
 function App() {
   const [conversations, setConversations] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [currentConversationId, setCurrentConversationId] = useState(null);
   const [currentConversation, setCurrentConversation] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
@@ -24,22 +25,50 @@ function App() {
 
   const loadConversations = async () => {
     try {
-      const convs = await api.listConversations();
-      setConversations(convs);
+      const page = await api.listConversations();
+      setConversations(page.conversations);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error('Failed to load conversations:', error);
     }
   };
 
-  const loadConversation = async (id) => {
+  const loadMoreConversations = async () => {
+    if (!nextCursor) return;
     try {
-      const conv = await api.getConversation(id);
+      const page = await api.listConversations(undefined, nextCursor);
+      setConversations((prev) => [...prev, ...page.conversations]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to load more conversations:', error);
+    }
+  };
+
+  // Opening a conversation fetches only final answers; Stage 1/2 details
+  // are loaded per message on demand
+  const loadConversation = async (id, fields = 'stage3') => {
+    try {
+      const conv = await api.getConversation(id, fields);
       setCurrentConversation(conv);
     } catch (error) {
       console.error('Failed to load conversation:', error);
     }
   };
 
+  const handleLoadDetails = async (index) => {
+    try {
+      const offset = currentConversation?.offset || 0;
+      const message = await api.getMessage(currentConversationId, offset + index);
+      setCurrentConversation((prev) => {
+        const messages = [...prev.messages];
+        messages[index] = message;
+        return { ...prev, messages };
+      });
+    } catch (error) {
+      console.error('Failed to load message details:', error);
+    }
+  };
+
   const handleNewConversation = async () => {
     try {
       const newConv = await api.createConversation();
@@ -92,6 +121,10 @@ function App() {
       // Send message with streaming
       await api.sendMessageStream(currentConversationId, content, (eventType, event) => {
         switch (eventType) {
+          case 'run_started':
+            // Run id is tracked by the API client for reconnecting
+            break;
+
           case 'stage1_start':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -101,6 +134,53 @@ function App() {
             });
             break;
 
+          case 'stage1_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const stage1 = [...(lastMsg.stage1 || [])];
+              const index = stage1.findIndex((resp) => resp.model === event.model);
+              if (index === -1) {
+                stage1.push({ model: event.model, response: event.delta });
+              } else {
+                stage1[index] = {
+                  ...stage1[index],
+                  response: stage1[index].response + event.delta,
+                };
+              }
+              messages[messages.length - 1] = { ...lastMsg, stage1 };
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage1_model_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const stage1 = (lastMsg.stage1 || []).filter(
+                (resp) => resp.model !== event.data.model
+              );
+              messages[messages.length - 1] = {
+                ...lastMsg,
+                stage1: [...stage1, event.data],
+              };
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage1_model_failed':
+          case 'stage1_model_cutoff':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const stage1 = (lastMsg.stage1 || []).filter(
+                (resp) => resp.model !== event.model
+              );
+              messages[messages.length - 1] = { ...lastMsg, stage1 };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -120,6 +200,23 @@ function App() {
             });
             break;
 
+          case 'stage2_model_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              messages[messages.length - 1] = {
+                ...lastMsg,
+                stage2: [...(lastMsg.stage2 || []), event.data],
+                metadata: event.metadata,
+              };
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage2_model_failed':
+            // Nothing to show: the failed model simply has no ranking
+            break;
+
           case 'stage2_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -140,6 +237,19 @@ function App() {
             });
             break;
 
+          case 'stage3_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const response = (lastMsg.stage3?.response || '') + event.delta;
+              messages[messages.length - 1] = {
+                ...lastMsg,
+                stage3: { model: event.model, response },
+              };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage3_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -150,6 +260,16 @@ function App() {
             });
             break;
 
+          case 'trace':
+            // Timing trace of the run, kept with the message for debugging
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              messages[messages.length - 1] = { ...lastMsg, trace: event.data };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'title_complete':
             // Reload conversations to get updated title
             loadConversations();
@@ -159,7 +279,8 @@ function App() {
             // Stream complete, reload conversations list and current conversation
             loadConversations();
             if (currentConversationId) {
-              loadConversation(currentConversationId);
+              // Keep the stage details that were just streamed
+              loadConversation(currentConversationId, null);
             }
             setIsLoading(false);
             break;
@@ -191,10 +312,13 @@ function App() {
         currentConversationId={currentConversationId}
         onSelectConversation={handleSelectConversation}
         onNewConversation={handleNewConversation}
+        hasMore={nextCursor !== null}
+        onLoadMore={loadMoreConversations}
       />
       <ChatInterface
         conversation={currentConversation}
         onSendMessage={handleSendMessage}
+        onLoadDetails={handleLoadDetails}
         isLoading={isLoading}
       />
     </div>
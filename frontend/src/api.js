@@ -6,14 +6,24 @@ const API_BASE = 'http://localhost:8001';
 
 export const api = {
   /**
-   * List all conversations.
+   * List one page of conversations, newest first.
+   * @param {number} limit - Page size
+   * @param {string|null} before - Cursor returned with the previous page
+   * @returns {Promise<{conversations: Array, nextCursor: string|null}>}
    */
-  async listConversations() {
-    const response = await fetch(`${API_BASE}/api/conversations`);
+  async listConversations(limit = 50, before = null) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (before) {
+      params.set('before', before);
+    }
+    const response = await fetch(`${API_BASE}/api/conversations?${params}`);
     if (!response.ok) {
       throw new Error('Failed to list conversations');
     }
-    return response.json();
+    return {
+      conversations: await response.json(),
+      nextCursor: response.headers.get('X-Next-Cursor'),
+    };
   },
 
   /**
@@ -36,9 +46,10 @@ export const api = {
   /**
    * Get a specific conversation.
    */
-  async getConversation(conversationId) {
+  async getConversation(conversationId, fields = null) {
+    const query = fields ? `?fields=${encodeURIComponent(fields)}` : '';
     const response = await fetch(
-      `${API_BASE}/api/conversations/${conversationId}`
+      `${API_BASE}/api/conversations/${conversationId}${query}`
     );
     if (!response.ok) {
       throw new Error('Failed to get conversation');
@@ -46,6 +57,19 @@ export const api = {
     return response.json();
   },
 
+  /**
+   * Get one message with all its stage details.
+   */
+  async getMessage(conversationId, index) {
+    const response = await fetch(
+      `${API_BASE}/api/conversations/${conversationId}/messages/${index}`
+    );
+    if (!response.ok) {
+      throw new Error('Failed to get message');
+    }
+    return response.json();
+  },
+
   /**
    * Send a message in a conversation.
    */
@@ -68,6 +92,10 @@ export const api = {
 
   /**
    * Send a message and receive streaming updates.
+   *
+   * The council runs as a background job on the server. If the stream
+   * drops before the run finishes, this reconnects to the run's event
+   * stream and resumes after the last event received.
    * @param {string} conversationId - The conversation ID
    * @param {string} content - The message content
    * @param {function} onEvent - Callback function for each event: (eventType, data) => void
@@ -89,27 +117,73 @@ export const api = {
       throw new Error('Failed to send message');
     }
 
-    const reader = response.body.getReader();
-    const decoder = new TextDecoder();
-
-    while (true) {
-      const { done, value } = await reader.read();
-      if (done) break;
+    const state = { runId: null, lastEventId: null, finished: false };
+    const handleEvent = (id, event) => {
+      if (id !== null) state.lastEventId = id;
+      if (event.type === 'run_started') state.runId = event.data.run_id;
+      if (event.type === 'complete' || event.type === 'error') state.finished = true;
+      onEvent(event.type, event);
+    };
 
-      const chunk = decoder.decode(value);
-      const lines = chunk.split('\n');
+    try {
+      await readEventStream(response, handleEvent);
+    } catch (e) {
+      if (!state.runId) throw e;
+      console.warn('Stream interrupted, reconnecting:', e);
+    }
 
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          const data = line.slice(6);
-          try {
-            const event = JSON.parse(data);
-            onEvent(event.type, event);
-          } catch (e) {
-            console.error('Failed to parse SSE event:', e);
+    for (let attempt = 1; !state.finished && state.runId && attempt <= 5; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 500 * attempt));
+      try {
+        const resumed = await fetch(
+          `${API_BASE}/api/conversations/${conversationId}/runs/${state.runId}/events`,
+          {
+            headers: state.lastEventId !== null
+              ? { 'Last-Event-ID': state.lastEventId }
+              : {},
           }
-        }
+        );
+        if (resumed.status === 404) break;
+        if (!resumed.ok) continue;
+        await readEventStream(resumed, handleEvent);
+      } catch (e) {
+        console.warn('Reconnect failed:', e);
       }
     }
   },
 };
+
+/**
+ * Read a Server-Sent Events response, calling onEvent(id, event) per event.
+ */
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let eventId = null;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    // Token deltas arrive as many small events, so an event can be split
+    // across reads: only parse complete lines and keep the remainder.
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+
+    for (const line of lines) {
+      if (line.startsWith('id: ')) {
+        eventId = line.slice(4);
+      } else if (line.startsWith('data: ')) {
+        const data = line.slice(6);
+        try {
+          const event = JSON.parse(data);
+          onEvent(eventId, event);
+        } catch (e) {
+          console.error('Failed to parse SSE event:', e);
+        }
+      }
+    }
+  }
+}
@@ -9,6 +9,7 @@ import './ChatInterface.css';
 export default function ChatInterface({
   conversation,
   onSendMessage,
+  onLoadDetails,
   isLoading,
 }) {
   const [input, setInput] = useState('');
@@ -73,6 +74,15 @@ export default function ChatInterface({
                 <div className="assistant-message">
                   <div className="message-label">LLM Council</div>
 
+                  {msg.omitted?.length > 0 && (
+                    <button
+                      className="load-details-btn"
+                      onClick={() => onLoadDetails(index)}
+                    >
+                      Show council deliberation
+                    </button>
+                  )}
+
                   {/* Stage 1 */}
                   {msg.loading?.stage1 && (
                     <div className="stage-loading">
@@ -6,6 +6,8 @@ export default function Sidebar({
   currentConversationId,
   onSelectConversation,
   onNewConversation,
+  hasMore,
+  onLoadMore,
 }) {
   return (
     <div className="sidebar">
@@ -37,6 +39,11 @@ export default function Sidebar({
             </div>
           ))
         )}
+        {hasMore && (
+          <button className="load-more-btn" onClick={onLoadMore}>
+            Load older conversations
+          </button>
+        )}
       </div>
     </div>
   );
@@ -48,6 +48,9 @@ export default function Stage1({ responses }) {
     return null;
   }
 
+  // Streaming can drop a failed model's tab, so keep the selection in range
+  const active = responses[Math.min(activeTab, responses.length - 1)];
+
   return (
     <div className="stage stage1">
       <h3 className="stage-title">Stage 1: Individual Responses</h3>
@@ -65,9 +68,9 @@ export default function Stage1({ responses }) {
       </div>
 
       <div className="tab-content">
-        <div className="model-name">{responses[activeTab].model}</div>
+        <div className="model-name">{active.model}</div>
         <div className="response-text markdown-content">
-          <ResponseWithThinking content={responses[activeTab].response} />
+          <ResponseWithThinking content={active.response} />
         </div>
       </div>
     </div>
@@ -0,0 +1,62 @@
+"""Shared fixtures: a fast simulated provider and scratch storage."""
+
+from collections import OrderedDict
+
+import pytest
+
+import backend.storage as storage_module
+from backend.config import RATE_LIMITS, RETRY_CONFIG
+from backend.providers import factory
+from backend.providers.scheduler import RateLimitScheduler
+from backend.providers.sim import SimProvider
+from backend.storage import CheckpointStore, LogStore, UsageLog
+from backend.storage.conversation_cache import conversation_cache
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    """
+    Serve "sim/<name>" models from a fresh, fast simulated provider.
+
+    Every model answers 20 tokens after ~1 ms unless the test adds a profile
+    to the returned provider's 'models'. The scheduler and circuit breakers
+    are fresh too, and retries back off for at most a few milliseconds.
+    """
+    provider = SimProvider({
+        "seed": 0,
+        "defaults": {
+            "ttft": 0.001,
+            "tokens_per_second": 100000.0,
+            "response_tokens": 20,
+            "jitter": 0.0,
+            "retry_after": 0.001,
+        },
+        "models": {},
+    })
+    monkeypatch.setitem(factory.registry._instances, "sim", provider)
+    monkeypatch.setattr(factory, "scheduler", RateLimitScheduler(RATE_LIMITS))
+    monkeypatch.setattr(factory, "breakers", {})
+    monkeypatch.setitem(RETRY_CONFIG, "base_delay", 0.001)
+    monkeypatch.setitem(RETRY_CONFIG, "max_delay", 0.001)
+    return provider
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """
+    Point the storage layer at a scratch directory.
+
+    Conversations go to a LogStore under tmp_path, run checkpoints and the
+    usage log next to it, and the shared conversation cache starts empty.
+
+    Yields:
+        The LogStore backing the storage layer
+    """
+    store = LogStore(str(tmp_path / "conversations"), fsync_interval=0)
+    monkeypatch.setattr(storage_module, "_store", store)
+    monkeypatch.setattr(storage_module, "_checkpoints", CheckpointStore(str(tmp_path / "runs")))
+    monkeypatch.setattr(storage_module, "_usage_log", UsageLog(str(tmp_path / "usage.jsonl")))
+    monkeypatch.setattr(conversation_cache, "_entries", OrderedDict())
+    monkeypatch.setattr(conversation_cache, "_locks", {})
+    yield store
+    store.close()
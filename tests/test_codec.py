@@ -0,0 +1,139 @@
+"""Tests for the storage compression codecs."""
+
+import pytest
+
+from backend.storage import LogStore, SqliteStore
+from backend.storage.codec import (
+    GzipCodec,
+    decompress_blob,
+    get_codec,
+    zstd_available,
+)
+
+
+CODECS = ["none", "gzip", pytest.param(
+    "zstd", marks=pytest.mark.skipif(not zstd_available(), reason="zstandard not installed")
+)]
+
+BLOCKS = [b'{"n": 1}\n', b'{"n": 2}\n{"n": 3}\n', b'{"n": 4}\n']
+
+
+@pytest.fixture(params=CODECS)
+def codec(request):
+    return get_codec(request.param)
+
+
+def encode(codec, blocks=BLOCKS):
+    return b"".join(codec.compress(block) for block in blocks)
+
+
+def test_decode_round_trips_appended_blocks(codec):
+    data = encode(codec)
+    assert codec.decode(data) == (b"".join(BLOCKS), len(data))
+
+
+def test_blocks_report_offsets_of_each_block(codec):
+    data = encode(codec)
+    blocks = list(codec.blocks(data))
+
+    assert blocks[0][0] == 0 and blocks[-1][1] == len(data)
+    for (_, end, _), (start, _, _) in zip(blocks, blocks[1:]):
+        assert end == start
+    for start, end, payload in blocks:
+        assert codec.decode(data[start:end])[0] == payload
+
+
+def test_every_torn_tail_is_trimmed_to_the_last_whole_block(codec):
+    whole = [encode(codec, BLOCKS[:count]) for count in range(len(BLOCKS) + 1)]
+    data = whole[-1]
+
+    for cut in range(len(data) + 1):
+        payload, valid = codec.decode(data[:cut])
+        assert valid <= cut
+        # The valid prefix ends on a block boundary (or line, for plain logs)
+        assert codec.decode(data[:valid]) == (payload, valid)
+        assert payload == b"".join(BLOCKS)[:len(payload)]
+        if codec.name != "none":
+            assert data[:valid] in whole
+
+
+def test_garbage_after_blocks_is_not_decoded(codec):
+    data = encode(codec)
+    payload, valid = codec.decode(data + b"\x00garbage")
+    assert payload == b"".join(BLOCKS)
+    assert valid == len(data)
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        get_codec("lz4")
+
+
+def test_zstd_falls_back_to_gzip_when_unavailable(monkeypatch):
+    monkeypatch.setattr("backend.storage.codec.zstandard", None)
+    assert isinstance(get_codec("zstd"), GzipCodec)
+
+
+def test_decompress_blob_detects_the_format():
+    assert decompress_blob(GzipCodec().compress(b"payload")) == b"payload"
+    with pytest.raises(ValueError):
+        decompress_blob(b"plain")
+
+
+def test_compressed_log_trims_a_torn_block_before_appending(codec, tmp_path):
+    store = LogStore(str(tmp_path), fsync_interval=0, codec=codec)
+    store.create_conversation("c1")
+    store.append_message("c1", {"n": 1})
+    store.append_message("c1", {"n": 2})
+    store.close()
+
+    path = store._find_log("c1")[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    tail = codec.compress(b'{"n": 3}\n')
+    with open(path, "wb") as f:
+        f.write(data + tail[:len(tail) // 2])
+
+    store = LogStore(str(tmp_path), fsync_interval=0, codec=codec)
+    try:
+        assert store.get_conversation("c1")["messages"] == [{"n": 1}, {"n": 2}]
+        store.append_message("c1", {"n": 4})
+        assert store.get_conversation("c1")["messages"] == [{"n": 1}, {"n": 2}, {"n": 4}]
+    finally:
+        store.close()
+
+
+def test_plain_log_stays_readable_after_enabling_compression(tmp_path):
+    plain = LogStore(str(tmp_path), fsync_interval=0)
+    plain.create_conversation("c1")
+    plain.append_message("c1", {"n": 1})
+    plain.close()
+
+    store = LogStore(str(tmp_path), fsync_interval=0, codec=GzipCodec())
+    try:
+        # Appends continue in the log's own format until it is recompressed
+        store.append_message("c1", {"n": 2})
+        assert store._find_log("c1")[0].endswith("messages.jsonl")
+
+        store.recompress("c1")
+        assert store._find_log("c1")[0].endswith("messages.jsonl.gz")
+        assert store.get_conversation("c1")["messages"] == [{"n": 1}, {"n": 2}]
+        assert store.get_messages("c1", -1)["messages"] == [{"n": 2}]
+    finally:
+        store.close()
+
+
+def test_sqlite_reads_rows_written_before_compression(tmp_path):
+    path = str(tmp_path / "conversations.db")
+    plain = SqliteStore(path)
+    plain.create_conversation("c1")
+    plain.append_message("c1", {"n": 1})
+    plain.close()
+
+    store = SqliteStore(path, GzipCodec())
+    try:
+        store.append_message("c1", {"n": 2})
+        assert store.get_conversation("c1")["messages"] == [{"n": 1}, {"n": 2}]
+    finally:
+        store.close()
+
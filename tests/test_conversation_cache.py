@@ -0,0 +1,131 @@
+"""Tests for the write-behind conversation cache."""
+
+import asyncio
+import shutil
+
+import pytest
+
+from backend.storage import aio
+from backend.storage.conversation_cache import ConversationCache
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def test_changes_are_served_from_memory_until_flushed(storage):
+    cache = ConversationCache(max_entries=8, flush_delay=60)
+
+    async def main():
+        await cache.create_conversation("c1")
+        await cache.add_user_message("c1", "hello")
+        await cache.update_conversation_title("c1", "Greeting")
+        before = storage.get_conversation("c1")
+        cached = await cache.get_conversation("c1")
+        await cache.flush("c1")
+        return before, cached
+
+    before, cached = asyncio.run(main())
+
+    assert before["messages"] == [] and before["title"] == "New Conversation"
+    assert cached["messages"] == [user("hello")] and cached["title"] == "Greeting"
+    after = storage.get_conversation("c1")
+    assert after["messages"] == [user("hello")] and after["title"] == "Greeting"
+    assert cache.stats()["flushes"] == 1
+    assert cache.stats()["dirty"] == 0
+
+
+def test_timer_flushes_after_the_delay(storage):
+    cache = ConversationCache(max_entries=8, flush_delay=0.01)
+
+    async def main():
+        await cache.create_conversation("c1")
+        await cache.add_user_message("c1", "hello")
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert storage.get_conversation("c1")["messages"] == [user("hello")]
+
+
+def test_concurrent_appends_get_distinct_indexes(storage):
+    cache = ConversationCache(max_entries=8, flush_delay=60)
+
+    async def main():
+        await cache.create_conversation("c1")
+        indexes = await asyncio.gather(*[cache.add_user_message("c1", str(i)) for i in range(10)])
+        await cache.flush("c1")
+        return indexes
+
+    assert sorted(asyncio.run(main())) == list(range(10))
+    assert len(storage.get_conversation("c1")["messages"]) == 10
+
+
+def test_failed_flush_keeps_changes_queued_for_retry(storage, monkeypatch):
+    cache = ConversationCache(max_entries=8, flush_delay=60)
+    real_commit = aio.commit
+    failures = [OSError("disk full")]
+
+    async def flaky_commit(*args):
+        if failures:
+            raise failures.pop()
+        return await real_commit(*args)
+
+    monkeypatch.setattr(aio, "commit", flaky_commit)
+
+    async def main():
+        await cache.create_conversation("c1")
+        await cache.add_user_message("c1", "first")
+        with pytest.raises(OSError):
+            await cache.flush("c1")
+        assert cache.stats()["dirty"] == 1
+        await cache.add_user_message("c1", "second")
+        await cache.flush("c1")
+
+    asyncio.run(main())
+    assert storage.get_conversation("c1")["messages"] == [user("first"), user("second")]
+    assert cache.stats()["dirty"] == 0
+
+
+def test_flush_drops_a_conversation_removed_from_storage(storage):
+    cache = ConversationCache(max_entries=8, flush_delay=60)
+
+    async def main():
+        await cache.create_conversation("c1")
+        await cache.add_user_message("c1", "orphan")
+        shutil.rmtree(f"{storage.data_dir}/c1")
+        with pytest.raises(ValueError):
+            await cache.flush("c1")
+        return cache.stats()
+
+    stats = asyncio.run(main())
+    assert stats["entries"] == 0 and stats["dirty"] == 0
+
+
+def test_returned_conversations_do_not_alias_the_cache(storage):
+    cache = ConversationCache(max_entries=8, flush_delay=60)
+
+    async def main():
+        await cache.create_conversation("c1")
+        await cache.add_user_message("c1", "original")
+        snapshot = await cache.get_conversation("c1")
+        snapshot["messages"][0]["content"] = "edited"
+        snapshot["messages"].append(user("extra"))
+        return await cache.get_conversation("c1")
+
+    assert asyncio.run(main())["messages"] == [user("original")]
+
+
+def test_only_clean_entries_are_evicted(storage):
+    cache = ConversationCache(max_entries=1, flush_delay=60)
+
+    async def main():
+        await cache.create_conversation("a")
+        await cache.add_user_message("a", "unsaved")
+        await cache.create_conversation("b")
+        # 'a' is dirty, so it stays cached beyond the limit
+        assert cache.stats()["entries"] == 2
+        await cache.flush("a")
+        return cache.stats()
+
+    assert asyncio.run(main())["entries"] == 1
+    assert storage.get_conversation("a")["messages"] == [user("unsaved")]
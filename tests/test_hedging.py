@@ -0,0 +1,94 @@
+"""Tests for hedged requests and the hedge budget."""
+
+import asyncio
+
+from backend.providers.hedging import HedgeBudget, LatencyTracker, hedged_call
+
+
+def make_call(delays, results=None, calls=None):
+    """Build a fake route call that answers after a per-route delay."""
+    results = results or {}
+
+    async def call(route):
+        if calls is not None:
+            calls.append(route)
+        await asyncio.sleep(delays[route])
+        return results.get(route, {"content": route})
+
+    return call
+
+
+def test_budget_earns_ratio_per_request_up_to_burst():
+    budget = HedgeBudget(ratio=0.5, burst=2)
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.earn()
+    assert not budget.try_spend()
+    budget.earn()
+    assert budget.try_spend()
+
+    for _ in range(10):
+        budget.earn()
+    assert budget.tokens == 2
+
+    assert budget.stats() == {"requests": 12, "hedges": 3, "hedge_wins": 0, "denied": 2}
+
+
+def test_latency_percentile_needs_min_samples():
+    tracker = LatencyTracker(window=4)
+    for seconds in (0.1, 0.2, 0.3):
+        tracker.record("a/m", seconds)
+    assert tracker.percentile("a/m", 95, min_samples=4) is None
+
+    tracker.record("a/m", 0.4)
+    tracker.record("a/m", 0.5)  # pushes 0.1 out of the window
+    assert tracker.percentile("a/m", 50, min_samples=4) == 0.3
+    assert tracker.percentile("a/m", 95, min_samples=4) == 0.5
+
+
+def test_fast_primary_is_not_hedged():
+    budget = HedgeBudget(ratio=1.0, burst=1)
+    calls = []
+    call = make_call({"primary": 0.0, "alt": 0.0}, calls=calls)
+
+    response = asyncio.run(hedged_call("primary", ["alt"], call, 0.2, budget))
+
+    assert response == {"content": "primary"}
+    assert calls == ["primary"]
+    assert budget.stats()["hedges"] == 0
+
+
+def test_slow_primary_is_hedged_and_hedge_win_counted():
+    budget = HedgeBudget(ratio=0.0, burst=1)
+    calls = []
+    call = make_call({"primary": 1.0, "alt": 0.0}, calls=calls)
+
+    response = asyncio.run(hedged_call("primary", ["alt"], call, 0.02, budget))
+
+    assert response == {"content": "alt"}
+    assert calls == ["primary", "alt"]
+    assert budget.stats() == {"requests": 1, "hedges": 1, "hedge_wins": 1, "denied": 0}
+
+
+def test_exhausted_budget_waits_for_primary():
+    budget = HedgeBudget(ratio=0.0, burst=0)
+    calls = []
+    call = make_call({"primary": 0.05, "alt": 0.0}, calls=calls)
+
+    response = asyncio.run(hedged_call("primary", ["alt"], call, 0.01, budget))
+
+    assert response == {"content": "primary"}
+    assert calls == ["primary"]
+    assert budget.stats()["denied"] == 1
+
+
+def test_failed_primary_falls_over_to_alternate():
+    budget = HedgeBudget(ratio=0.0, burst=1)
+    call = make_call({"primary": 0.0, "alt": 0.0}, results={"primary": None})
+
+    response = asyncio.run(hedged_call("primary", ["alt"], call, 1.0, budget))
+
+    assert response == {"content": "alt"}
+    assert budget.stats()["hedges"] == 1
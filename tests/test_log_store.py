@@ -0,0 +1,146 @@
+"""Tests for the append-only log conversation store."""
+
+import json
+import os
+
+import pytest
+
+from backend.storage import LogStore
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path / "conversations")
+
+
+@pytest.fixture
+def store(data_dir):
+    store = LogStore(data_dir, fsync_interval=0)
+    yield store
+    store.close()
+
+
+def log_path(data_dir, conversation_id):
+    return os.path.join(data_dir, conversation_id, "messages.jsonl")
+
+
+def read_header(data_dir, conversation_id):
+    with open(os.path.join(data_dir, conversation_id, "header.json")) as f:
+        return json.load(f)
+
+
+def test_appends_are_one_line_each_and_replay_in_order(store, data_dir):
+    store.create_conversation("c1")
+    store.append_message("c1", user("one"))
+    store.commit("c1", [user("two"), user("three")], "Title")
+
+    with open(log_path(data_dir, "c1"), "rb") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["content"] for line in lines] == ["one", "two", "three"]
+
+    header = read_header(data_dir, "c1")
+    assert header["message_count"] == 3
+    assert header["title"] == "Title"
+    assert [m["content"] for m in store.get_conversation("c1")["messages"]] == ["one", "two", "three"]
+
+
+def test_torn_last_line_is_ignored_then_trimmed(store, data_dir):
+    store.create_conversation("c1")
+    store.commit("c1", [user("one"), user("two")], None)
+    store.close()
+
+    # A crash mid-write leaves half a line at the end of the log
+    with open(log_path(data_dir, "c1"), "ab") as f:
+        f.write(b'{"role": "user", "cont')
+
+    reopened = LogStore(data_dir, fsync_interval=0)
+    try:
+        assert [m["content"] for m in reopened.get_conversation("c1")["messages"]] == ["one", "two"]
+
+        reopened.append_message("c1", user("three"))
+        with open(log_path(data_dir, "c1"), "rb") as f:
+            lines = f.read().splitlines()
+        assert [json.loads(line)["content"] for line in lines] == ["one", "two", "three"]
+        assert [m["content"] for m in reopened.get_conversation("c1")["messages"]] == [
+            "one", "two", "three"
+        ]
+    finally:
+        reopened.close()
+
+
+def test_replay_stops_at_a_corrupt_line(store, data_dir):
+    store.create_conversation("c1")
+    store.commit("c1", [user("one"), user("two"), user("three")], None)
+
+    path = log_path(data_dir, "c1")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b'"two"', b'"tw'))
+
+    assert [m["content"] for m in store.get_conversation("c1")["messages"]] == ["one"]
+
+
+def test_save_conversation_compacts_the_log(store, data_dir):
+    store.create_conversation("c1")
+    for i in range(5):
+        store.append_message("c1", user(str(i)))
+
+    conversation = store.get_conversation("c1")
+    conversation["messages"] = conversation["messages"][3:]
+    store.save_conversation(conversation)
+
+    with open(log_path(data_dir, "c1"), "rb") as f:
+        assert len(f.read().splitlines()) == 2
+    assert not os.path.exists(log_path(data_dir, "c1") + ".tmp")
+    assert read_header(data_dir, "c1")["message_count"] == 2
+
+    # Appends continue on the compacted log
+    store.append_message("c1", user("5"))
+    assert [m["content"] for m in store.get_conversation("c1")["messages"]] == ["3", "4", "5"]
+
+
+def test_legacy_file_is_converted_on_first_write_and_kept(store, data_dir):
+    os.makedirs(data_dir)
+    legacy = {
+        "id": "old",
+        "created_at": "2024-01-01T00:00:00",
+        "title": "Legacy",
+        "messages": [user("before")],
+    }
+    legacy_path = os.path.join(data_dir, "old.json")
+    with open(legacy_path, "w") as f:
+        json.dump(legacy, f)
+
+    # Readable before conversion
+    assert store.get_conversation("old")["messages"] == [user("before")]
+
+    store.append_message("old", user("after"))
+
+    assert not os.path.exists(legacy_path)
+    with open(legacy_path + ".bak") as f:
+        assert json.load(f) == legacy
+    conversation = store.get_conversation("old")
+    assert conversation["title"] == "Legacy"
+    assert conversation["messages"] == [user("before"), user("after")]
+
+
+def test_batched_fsync_writes_are_readable_before_flush(data_dir):
+    store = LogStore(data_dir, fsync_interval=60)
+    try:
+        store.create_conversation("c1")
+        store.append_message("c1", user("buffered"))
+        assert store.get_conversation("c1")["messages"] == [user("buffered")]
+        store.flush()
+    finally:
+        store.close()
+
+    reopened = LogStore(data_dir, fsync_interval=0)
+    try:
+        assert reopened.get_conversation("c1")["messages"] == [user("buffered")]
+    finally:
+        reopened.close()
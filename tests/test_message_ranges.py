@@ -0,0 +1,115 @@
+"""Tests for ranged message reads and stage projection."""
+
+import os
+
+import pytest
+
+from backend.main import parse_fields, project_message
+from backend.storage import LogStore
+from backend.storage.codec import GzipCodec
+
+
+def user(number):
+    return {"role": "user", "content": str(number)}
+
+
+def contents(page):
+    return [int(message["content"]) for message in page["messages"]]
+
+
+@pytest.fixture(params=["none", "gzip"])
+def store(request, tmp_path):
+    codec = GzipCodec() if request.param == "gzip" else None
+    store = LogStore(str(tmp_path / "conversations"), fsync_interval=0, codec=codec)
+    store.create_conversation("c1")
+    # Mix single appends and batched commits so blocks hold one or more lines
+    for number in range(0, 6, 2):
+        store.commit("c1", [user(number), user(number + 1)], None)
+    for number in range(6, 10):
+        store.append_message("c1", user(number))
+    yield store
+    store.close()
+
+
+def offsets_path(store):
+    return os.path.join(store.data_dir, "c1", "messages.offsets")
+
+
+def log_path(store):
+    return store._find_log("c1")[0]
+
+
+def test_ranges_match_a_full_replay(store):
+    everything = store.get_conversation("c1")["messages"]
+    for offset in range(-12, 12):
+        for limit in (None, 0, 1, 3, 20):
+            page = store.get_messages("c1", offset, limit)
+            start = offset if offset >= 0 else max(0, 10 + offset)
+            end = 10 if limit is None else start + limit
+            assert page["messages"] == everything[start:end]
+            assert page["message_count"] == 10
+
+
+def test_missing_offsets_are_rebuilt(store):
+    os.remove(offsets_path(store))
+    assert contents(store.get_messages("c1", 7, 2)) == [7, 8]
+    assert os.path.getsize(offsets_path(store)) > 0
+
+
+def test_offsets_stay_valid_after_compaction(store):
+    conversation = store.get_conversation("c1")
+    conversation["messages"] = conversation["messages"][5:]
+    store.save_conversation(conversation)
+    store.append_message("c1", user(10))
+
+    assert contents(store.get_messages("c1", -3)) == [8, 9, 10]
+    assert contents(store.get_messages("c1", 0, 2)) == [5, 6]
+
+
+def test_torn_tail_is_trimmed_before_a_ranged_read(store):
+    store.close()
+    with open(log_path(store), "ab") as f:
+        f.write(b'{"role": "us')
+
+    assert contents(store.get_messages("c1", -2)) == [8, 9]
+    store.append_message("c1", user(10))
+    assert contents(store.get_messages("c1", -2)) == [9, 10]
+    assert contents(store.get_messages("c1")) == list(range(11))
+
+
+def test_ranged_read_stops_at_a_corrupt_line(tmp_path):
+    store = LogStore(str(tmp_path / "conversations"), fsync_interval=0)
+    try:
+        store.create_conversation("c1")
+        for number in range(4):
+            store.append_message("c1", user(number))
+        path = log_path(store)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data.replace(b'"1"}', b'"1"X'))
+
+        assert contents(store.get_messages("c1", 0)) == [0]
+        assert contents(store.get_messages("c1", 2)) == [2, 3]
+    finally:
+        store.close()
+
+
+def test_projection_keeps_only_requested_stages():
+    message = {
+        "role": "assistant",
+        "stage1": [{"model": "a", "response": "x"}],
+        "stage2": [{"model": "b", "ranking": "long text", "parsed_ranking": ["Response A"]}],
+        "stage3": {"model": "c", "response": "z"},
+        "trace": {"spans": []},
+    }
+    projected = project_message(message, parse_fields("stage3"))
+    assert projected == {
+        "role": "assistant",
+        "stage3": {"model": "c", "response": "z"},
+        "omitted": ["stage1", "stage2", "trace"],
+    }
+    rankings = project_message(message, parse_fields("stage2_rankings"))
+    assert rankings["stage2"] == [{"model": "b", "parsed_ranking": ["Response A"]}]
+    assert project_message(user(1), parse_fields("stage3")) == user(1)
+    assert project_message(message, parse_fields(None)) == message
@@ -0,0 +1,158 @@
+"""Tests for the conversation metadata index and cursor pagination."""
+
+import builtins
+
+import pytest
+
+from backend.storage import JsonStore, LogStore, MetadataIndex, encode_cursor, parse_cursor
+from backend.storage.index import paginate
+
+
+def item(number, title=None):
+    return {
+        "id": f"c{number:03d}",
+        "created_at": f"2024-01-01T00:00:{number:02d}",
+        "title": title or f"Conversation {number}",
+        "message_count": 0,
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    return MetadataIndex(str(tmp_path / "index.jsonl"), scan=lambda: [])
+
+
+def ids(page):
+    return [entry["id"] for entry in page]
+
+
+def test_cursor_round_trip_and_validation():
+    assert parse_cursor(encode_cursor(item(1))) == ("2024-01-01T00:00:01", "c001")
+    for bad in ("", "no-separator", "|c001", "2024-01-01|"):
+        with pytest.raises(ValueError):
+            parse_cursor(bad)
+
+
+def test_pages_are_newest_first_and_disjoint(index):
+    for number in range(10):
+        index.upsert(item(number))
+
+    first = index.page(limit=4)
+    second = index.page(limit=4, before=encode_cursor(first[-1]))
+    third = index.page(limit=4, before=encode_cursor(second[-1]))
+
+    assert ids(first) == ["c009", "c008", "c007", "c006"]
+    assert ids(second) == ["c005", "c004", "c003", "c002"]
+    assert ids(third) == ["c001", "c000"]
+
+
+def test_cursor_is_stable_across_inserts(index):
+    for number in range(10):
+        index.upsert(item(number))
+    first = index.page(limit=3)
+
+    # New conversations arrive while the client is paging
+    for number in range(10, 15):
+        index.upsert(item(number))
+    second = index.page(limit=3, before=encode_cursor(first[-1]))
+
+    assert ids(first) == ["c009", "c008", "c007"]
+    assert ids(second) == ["c006", "c005", "c004"]
+    assert ids(index.page(limit=1)) == ["c014"]
+
+
+def test_updates_replace_entries_in_place(index):
+    for number in range(3):
+        index.upsert(item(number))
+    index.upsert({**item(1, "Renamed"), "message_count": 4})
+
+    page = index.page()
+    assert ids(page) == ["c002", "c001", "c000"]
+    assert page[1]["title"] == "Renamed" and page[1]["message_count"] == 4
+
+
+def test_page_matches_the_scanning_paginate(index):
+    items = [item(number) for number in range(20)]
+    for entry in items:
+        index.upsert(entry)
+    newest_first = sorted(items, key=lambda entry: (entry["created_at"], entry["id"]), reverse=True)
+
+    cursor = encode_cursor(items[12])
+    assert index.page(limit=5, before=cursor) == paginate(newest_first, 5, cursor)
+    assert index.page(before=cursor) == paginate(newest_first, None, cursor)
+
+
+def test_journal_reloads_and_compacts(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = MetadataIndex(path, scan=lambda: [])
+    for round_ in range(60):
+        for number in range(3):
+            index.upsert(item(number, f"Title {round_}"))
+
+    with open(path) as f:
+        assert len(f.readlines()) < 180
+
+    reloaded = MetadataIndex(path, scan=lambda: [])
+    assert reloaded.page() == index.page()
+    assert reloaded.page()[0]["title"] == "Title 59"
+
+
+def test_torn_journal_line_loses_only_that_update(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = MetadataIndex(path, scan=lambda: [])
+    index.upsert(item(0))
+    with open(path, "a") as f:
+        f.write('{"id": "c001", "created_')
+
+    reloaded = MetadataIndex(path, scan=lambda: [])
+    reloaded.upsert(item(2))
+
+    assert ids(MetadataIndex(path, scan=lambda: []).page()) == ["c002", "c000"]
+
+
+def test_missing_journal_is_rebuilt_from_a_scan(tmp_path):
+    data_dir = str(tmp_path / "conversations")
+    store = LogStore(data_dir, fsync_interval=0)
+    for conversation_id in ("a", "b", "c"):
+        store.create_conversation(conversation_id)
+    store.close()
+    (tmp_path / "conversations" / "index.jsonl").unlink()
+
+    store = LogStore(data_dir, fsync_interval=0)
+    try:
+        listed = store.list_conversations(limit=2)
+        assert ids(listed) == ["c", "b"]
+        assert ids(store.list_conversations(before=encode_cursor(listed[-1]))) == ["a"]
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize("open_store", [
+    JsonStore,
+    lambda data_dir: LogStore(data_dir, fsync_interval=0),
+], ids=["json", "jsonl"])
+def test_listing_does_not_open_conversation_files(open_store, tmp_path, monkeypatch):
+    data_dir = str(tmp_path / "conversations")
+    store = open_store(data_dir)
+    for conversation_id in ("a", "b", "c"):
+        store.create_conversation(conversation_id)
+    store.commit("b", [{"role": "user", "content": "hi"}], "Renamed")
+    store.close()
+
+    opened = []
+    real_open = builtins.open
+
+    def recording_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    store = open_store(data_dir)
+    monkeypatch.setattr(builtins, "open", recording_open)
+    try:
+        listed = store.list_conversations(limit=2)
+        assert ids(listed) == ["c", "b"]
+        assert listed[1]["title"] == "Renamed" and listed[1]["message_count"] == 1
+        assert ids(store.list_conversations(before=encode_cursor(listed[-1]))) == ["a"]
+    finally:
+        store.close()
+    assert opened == [str(tmp_path / "conversations" / "index.jsonl")]
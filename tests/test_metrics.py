@@ -0,0 +1,91 @@
+"""Tests for the Prometheus text exposition and the /metrics endpoint."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import backend.main as main_module
+from backend.metrics import Counter, Gauge, Histogram, Registry
+from backend.providers import factory
+
+
+def sample(text, line_prefix):
+    """Get the value of the sample line starting with the given name and labels."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Request latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe("stage1", value=value)
+
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Request latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{stage="stage1",le="0.1"} 2',
+        'latency_seconds_bucket{stage="stage1",le="1"} 3',
+        'latency_seconds_bucket{stage="stage1",le="+Inf"} 4',
+        'latency_seconds_sum{stage="stage1"} 2.65',
+        'latency_seconds_count{stage="stage1"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("requests_total", "Requests", ("model",))
+    counter.inc('odd"model\\name\nline')
+    counter.inc('odd"model\\name\nline', amount=0.5)
+
+    assert counter.samples() == ['requests_total{model="odd\\"model\\\\name\\nline"} 1.5']
+
+
+def test_wrong_label_count_is_rejected():
+    counter = Counter("requests_total", "Requests", ("stage", "model"))
+    with pytest.raises(ValueError):
+        counter.inc("stage1")
+
+
+def test_registry_exports_numeric_stats_as_gauges():
+    registry = Registry()
+    gauge = registry.register(Gauge("active", "Active things"))
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    def broken():
+        raise RuntimeError("unavailable")
+
+    stats = {"hits": 3, "hit_rate": 0.75, "enabled": True, "name": "x"}
+    registry.register_stats("cache", "Cache stats", lambda: stats)
+    registry.register_stats("broken", "Broken stats", broken)
+
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "active 1" in text.splitlines()
+    assert "cache_hits 3" in text.splitlines()
+    assert "cache_hit_rate 0.75" in text.splitlines()
+    assert "cache_enabled" not in text and "cache_name" not in text and "broken_" not in text
+
+
+def test_metrics_endpoint_counts_a_sim_query(sim):
+    requests = 'council_model_requests_total{stage="stage1",model="sim/metrics",outcome="success"}'
+    latency = 'council_model_request_duration_seconds_count{stage="stage1",model="sim/metrics"}'
+
+    async def main():
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            before = (await client.get("/metrics")).text
+            await factory.query_model("sim/metrics", [{"role": "user", "content": "hi"}], stage="stage1")
+            after = await client.get("/metrics")
+        return before, after
+
+    before, after = asyncio.run(main())
+
+    assert after.status_code == 200
+    assert after.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert sample(after.text, requests) == sample(before, requests) + 1
+    assert sample(after.text, latency) == sample(before, latency) + 1
+    assert "# TYPE council_model_requests_total counter" in after.text
@@ -0,0 +1,137 @@
+"""Tests for the Stage 1 quorum and soft deadline of parallel model calls."""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.config import CIRCUIT_BREAKER_CONFIG
+from backend.providers import factory
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.fixture
+def models(sim, monkeypatch):
+    """
+    Simulated models with known timings, recording which ones got cancelled.
+
+    "fast" answers at once, "medium" after 0.1 s, "slow" after 1 s, and
+    "dead" always fails (with its retries) within a few milliseconds.
+    """
+    sim.models.update({
+        "medium": {"ttft": 0.1},
+        "slow": {"ttft": 1.0},
+        "dead": {"error_rate": 1.0},
+    })
+    # Failures of "dead" must not open the breaker shared by every sim model
+    monkeypatch.setitem(CIRCUIT_BREAKER_CONFIG, "failure_threshold", 100)
+
+    cancelled = []
+    query_model, stream_model = sim.query_model, sim.stream_model
+
+    async def recording_query(model, *args, **kwargs):
+        try:
+            return await query_model(model, *args, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.append(f"sim/{model}")
+            raise
+
+    async def recording_stream(model, *args, **kwargs):
+        try:
+            async for chunk in stream_model(model, *args, **kwargs):
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            cancelled.append(f"sim/{model}")
+            raise
+
+    monkeypatch.setattr(sim, "query_model", recording_query)
+    monkeypatch.setattr(sim, "stream_model", recording_stream)
+    return cancelled
+
+
+async def run_quorum(model_ids, **kwargs):
+    return await factory.query_models_quorum(model_ids, MESSAGES, **kwargs)
+
+
+async def run_streamed(model_ids, **kwargs):
+    responses, stragglers = {}, []
+    async for model_id, kind, payload in factory.stream_models_parallel(model_ids, MESSAGES, **kwargs):
+        if kind == "done":
+            responses[model_id] = payload[0]
+        elif kind == "straggler":
+            stragglers.append(model_id)
+    return responses, stragglers
+
+
+@pytest.fixture(params=[run_quorum, run_streamed], ids=["quorum", "streamed"])
+def collect(request):
+    """Run one of the two quorum implementations, timing it."""
+    def run(model_ids, **kwargs):
+        async def main():
+            start = time.perf_counter()
+            responses, stragglers = await request.param(model_ids, **kwargs)
+            # Let cancelled calls unwind before checking them
+            await asyncio.sleep(0.01)
+            return responses, stragglers, time.perf_counter() - start
+
+        return asyncio.run(main())
+    return run
+
+
+def answered(responses):
+    return sorted(model for model, response in responses.items() if response is not None)
+
+
+def test_returns_once_the_quorum_is_reached(models, collect):
+    responses, stragglers, elapsed = collect(
+        ["sim/fast", "sim/medium", "sim/slow"], min_responses=2
+    )
+
+    assert answered(responses) == ["sim/fast", "sim/medium"]
+    assert stragglers == ["sim/slow"]
+    assert elapsed < 0.5
+    # The straggler's request was cancelled, not left running
+    assert models == ["sim/slow"]
+
+
+def test_soft_deadline_cuts_off_models_after_a_success(models, collect):
+    responses, stragglers, elapsed = collect(
+        ["sim/fast", "sim/slow"], soft_deadline=0.05
+    )
+
+    assert answered(responses) == ["sim/fast"]
+    assert stragglers == ["sim/slow"]
+    assert 0.05 <= elapsed < 0.5
+    assert models == ["sim/slow"]
+
+
+def test_soft_deadline_waits_for_the_first_success(models, collect):
+    # The deadline passes long before anyone answers; failures do not count
+    responses, stragglers, elapsed = collect(
+        ["sim/dead", "sim/medium", "sim/slow"], soft_deadline=0.01
+    )
+
+    assert responses["sim/dead"] is None
+    assert answered(responses) == ["sim/medium"]
+    assert stragglers == ["sim/slow"]
+    assert 0.1 <= elapsed < 0.5
+
+
+def test_fewer_successes_than_the_quorum_waits_for_every_model(models, collect):
+    responses, stragglers, _ = collect(
+        ["sim/dead", "sim/medium", "sim/fast"], min_responses=3
+    )
+
+    assert set(responses) == {"sim/dead", "sim/medium", "sim/fast"}
+    assert answered(responses) == ["sim/fast", "sim/medium"]
+    assert stragglers == []
+    assert models == []
+
+
+def test_without_a_quorum_every_model_is_awaited(models, collect):
+    responses, stragglers, elapsed = collect(["sim/fast", "sim/medium"])
+
+    assert answered(responses) == ["sim/fast", "sim/medium"]
+    assert stragglers == [] and elapsed >= 0.1
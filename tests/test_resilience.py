@@ -0,0 +1,257 @@
+"""Tests for retry planning and circuit breakers."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from backend.config import CIRCUIT_BREAKER_CONFIG, RATE_LIMIT_MAX_RETRIES, RETRY_CONFIG
+from backend.providers import factory
+from backend.providers.errors import (
+    CircuitOpenError,
+    ProviderClientError,
+    ProviderServerError,
+    RateLimitError,
+    classify_error,
+    parse_retry_after,
+)
+from backend.providers.resilience import CircuitBreaker, retry_delay
+from backend.providers.scheduler import RateLimitScheduler
+
+
+def make_breaker(threshold=2, reset_timeout=60.0, probe=None, probe_interval=0.01):
+    return CircuitBreaker("sim:test", threshold, reset_timeout, probe_interval, probe)
+
+
+@pytest.fixture
+def fresh_scheduler(monkeypatch):
+    scheduler = RateLimitScheduler({"default": {}})
+    monkeypatch.setattr(factory, "scheduler", scheduler)
+    return scheduler
+
+
+def new_attempts():
+    return {"retries": 0, "rate_limited": 0}
+
+
+def test_retry_delay_is_capped_full_jitter():
+    for attempt in range(10):
+        delay = retry_delay(attempt, 0.5, 4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_plan_retry_retries_server_errors_until_the_limit(fresh_scheduler):
+    breaker = make_breaker(threshold=100)
+    attempts = new_attempts()
+    error = ProviderServerError("boom", 503)
+
+    for _ in range(RETRY_CONFIG["max_retries"]):
+        delay = factory._plan_retry(error, "sim", breaker, attempts, None)
+        assert delay is not None and delay >= 0
+    assert factory._plan_retry(error, "sim", breaker, attempts, None) is None
+
+    assert attempts["retries"] == RETRY_CONFIG["max_retries"]
+    assert breaker.failures == RETRY_CONFIG["max_retries"] + 1
+
+
+def test_plan_retry_gives_up_on_client_errors_without_tripping(fresh_scheduler):
+    breaker = make_breaker()
+    attempts = new_attempts()
+
+    assert factory._plan_retry(ProviderClientError("bad key", 401), "sim", breaker, attempts, None) is None
+    assert breaker.failures == 0
+    assert attempts == new_attempts()
+
+
+def test_plan_retry_gives_up_when_circuit_is_open(fresh_scheduler):
+    breaker = make_breaker()
+    assert factory._plan_retry(CircuitOpenError("open"), "sim", breaker, new_attempts(), None) is None
+    assert breaker.failures == 0
+
+
+def test_plan_retry_pauses_provider_for_retry_after(fresh_scheduler):
+    breaker = make_breaker()
+    attempts = new_attempts()
+    notified = []
+
+    delay = factory._plan_retry(RateLimitError("slow down", 7.0), "sim", breaker, attempts, notified.append)
+
+    # The wait happens in the scheduler, not in the retry loop
+    assert delay == 0.0
+    assert notified == [{"reason": "retry_after", "wait": 7.0}]
+    assert fresh_scheduler._bucket("sim").reserve() == pytest.approx(7.0, abs=0.1)
+    assert breaker.failures == 0
+
+    for _ in range(RATE_LIMIT_MAX_RETRIES - 1):
+        assert factory._plan_retry(RateLimitError("slow down", 0.0), "sim", breaker, attempts, None) == 0.0
+    assert factory._plan_retry(RateLimitError("slow down", 0.0), "sim", breaker, attempts, None) is None
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = make_breaker(threshold=2)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = make_breaker(threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.stats() == {"state": "closed", "failures": 1}
+
+
+def test_breaker_half_opens_after_reset_timeout(monkeypatch):
+    breaker = make_breaker(threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    opened_at = breaker.opened_at
+    monkeypatch.setattr(time, "monotonic", lambda: opened_at + 31.0)
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+    # A failed trial reopens at once, a successful one closes
+    breaker.record_failure()
+    assert breaker.state == "open"
+    monkeypatch.setattr(time, "monotonic", lambda: breaker.opened_at + 31.0)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.stats() == {"state": "closed", "failures": 0}
+
+
+def test_half_open_breaker_admits_one_trial_at_a_time(monkeypatch):
+    breaker = make_breaker(threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    monkeypatch.setattr(time, "monotonic", lambda: breaker.opened_at + 31.0)
+
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # A trial that ends without a verdict (e.g. cancelled) frees the slot
+    breaker.end_trial()
+    assert breaker.before_call() is True
+    breaker.record_success()
+    assert breaker.before_call() is False
+    assert breaker.before_call() is False
+
+
+def test_half_open_sim_endpoint_gets_a_single_trial_request(sim, monkeypatch):
+    sim.models["recovering"] = {"ttft": 0.05}
+    messages = [{"role": "user", "content": "hello"}]
+    sent = []
+    query_model = sim.query_model
+
+    async def counting_query(model, *args, **kwargs):
+        sent.append(model)
+        return await query_model(model, *args, **kwargs)
+
+    monkeypatch.setattr(sim, "query_model", counting_query)
+
+    async def main():
+        breaker = factory.get_breaker("sim", sim)
+        breaker.state = "half_open"
+        responses = await asyncio.gather(*[
+            factory.query_model("sim/recovering", messages) for _ in range(5)
+        ])
+        return breaker.state, responses
+
+    state, responses = asyncio.run(main())
+
+    assert sent == ["recovering"]
+    assert state == "closed"
+    assert sum(response is not None for response in responses) == 1
+
+
+def test_breaker_probe_half_opens_once_endpoint_answers():
+    answers = [False, True]
+
+    async def probe():
+        return answers.pop(0)
+
+    async def main():
+        breaker = make_breaker(threshold=1, probe=probe)
+        breaker.record_failure()
+        assert breaker.state == "open"
+        for _ in range(100):
+            if breaker.state != "open":
+                break
+            await asyncio.sleep(0.01)
+        breaker.close()
+        return breaker.state
+
+    assert asyncio.run(main()) == "half_open"
+    assert answers == []
+
+
+def test_query_model_retries_flaky_sim_model(sim):
+    sim.models["flaky"] = {"error_rate": 0.5}
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def main():
+        return [await factory.query_model("sim/flaky", messages) for _ in range(20)]
+
+    responses = asyncio.run(main())
+
+    # With two retries a 50% failure rate should almost never exhaust them
+    assert sum(response is not None for response in responses) >= 15
+
+
+def test_query_model_opens_breaker_on_a_dead_sim_model(sim, monkeypatch):
+    sim.models["dead"] = {"timeout_rate": 1.0}
+    monkeypatch.setitem(CIRCUIT_BREAKER_CONFIG, "failure_threshold", 2)
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def main():
+        first = await factory.query_model("sim/dead", messages, timeout=0.01)
+        breaker = factory.get_breaker("sim", sim)
+        state = breaker.state
+        start = time.perf_counter()
+        second = await factory.query_model("sim/dead", messages, timeout=0.01)
+        fast_fail = time.perf_counter() - start
+        breaker.close()
+        return first, state, second, fast_fail
+
+    first, state, second, fast_fail = asyncio.run(main())
+
+    assert first is None and second is None
+    assert state == "open"
+    assert fast_fail < 0.01
+
+
+
+def test_parse_retry_after_seconds_and_dates():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(later, usegmt=True)) == pytest.approx(30, abs=2)
+    # "-0000" parses to a naive datetime, which is still UTC
+    naive = format_datetime(later.replace(tzinfo=None))
+    assert naive.endswith("-0000")
+    assert parse_retry_after(naive) == pytest.approx(30, abs=2)
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 -0000") == 0.0
+
+
+def test_classify_error_reads_retry_after_of_a_429():
+    later = datetime.now(timezone.utc) + timedelta(seconds=10)
+    headers = {"Retry-After": format_datetime(later.replace(tzinfo=None))}
+    request = httpx.Request("POST", "http://sim.test/v1/chat")
+    response = httpx.Response(429, headers=headers, request=request)
+    error = classify_error(httpx.HTTPStatusError("Too many requests", request=request, response=response))
+
+    assert isinstance(error, RateLimitError)
+    assert error.retry_after == pytest.approx(10, abs=2)
@@ -0,0 +1,139 @@
+"""Tests for the model response cache."""
+
+import asyncio
+
+import pytest
+
+from backend.config import RESPONSE_CACHE
+from backend.providers import factory
+from backend.providers.cache import ResponseCache, cache_key
+
+
+def test_cache_key_is_canonical():
+    messages = [{"role": "user", "content": "hi"}]
+    reordered = [{"content": "hi", "role": "user"}]
+    assert cache_key("sim/a", messages) == cache_key("sim/a", reordered)
+    assert cache_key("sim/a", messages) != cache_key("sim/b", messages)
+    assert cache_key("sim/a", messages) != cache_key("sim/a", [{"role": "user", "content": "hi!"}])
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, max_bytes=10**6, ttl=None)
+
+    async def main():
+        await cache.put("a", {"content": "A"})
+        await cache.put("b", {"content": "B"})
+        assert await cache.get("a") == {"content": "A"}
+        await cache.put("c", {"content": "C"})
+        return await cache.get("a"), await cache.get("b"), await cache.get("c")
+
+    assert asyncio.run(main()) == ({"content": "A"}, None, {"content": "C"})
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=100, max_bytes=100, ttl=None)
+
+    async def main():
+        for key in "abcd":
+            await cache.put(key, {"content": key * 40})
+
+    asyncio.run(main())
+    assert cache.stats()["bytes"] <= 100
+    assert cache.stats()["entries"] == 1
+
+
+def test_expired_entries_miss(monkeypatch):
+    cache = ResponseCache(max_entries=10, max_bytes=10**6, ttl=60)
+    now = [1000.0]
+    monkeypatch.setattr("backend.providers.cache.time.time", lambda: now[0])
+
+    async def main():
+        await cache.put("a", {"content": "A"})
+        now[0] += 61
+        return await cache.get("a")
+
+    assert asyncio.run(main()) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_a_cleared_memory_tier(tmp_path):
+    cache = ResponseCache(max_entries=10, max_bytes=10**6, ttl=None, disk_dir=str(tmp_path))
+
+    async def main():
+        await cache.put("ab12", {"content": "A"})
+        cache.clear()
+        return await cache.get("ab12")
+
+    assert asyncio.run(main()) == {"content": "A"}
+    assert (tmp_path / "ab" / "ab12.json").exists()
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_callers_cannot_change_cached_responses(tmp_path):
+    cache = ResponseCache(max_entries=10, max_bytes=10**6, ttl=None, disk_dir=str(tmp_path))
+    original = {"content": "A", "reasoning_details": [{"step": 1}]}
+
+    async def main():
+        await cache.put("ab12", original)
+        original["reasoning_details"].append({"step": 2})
+        hit = await cache.get("ab12")
+        hit["timing"] = {"duration": 1.0}
+        hit["reasoning_details"].clear()
+        cache.clear()
+        disk_hit = await cache.get("ab12")
+        disk_hit["content"] = "changed"
+        return await cache.get("ab12"), await cache.get("ab12")
+
+    for response in asyncio.run(main()):
+        assert response == {"content": "A", "reasoning_details": [{"step": 1}]}
+
+
+def test_concurrent_disk_writes_of_one_key_do_not_collide(tmp_path):
+    cache = ResponseCache(max_entries=10, max_bytes=10**6, ttl=None, disk_dir=str(tmp_path))
+    responses = [{"content": str(i) * 10000} for i in range(20)]
+
+    async def main():
+        await asyncio.gather(*[cache.put("ab12", response) for response in responses])
+        cache.clear()
+        return await cache.get("ab12")
+
+    assert asyncio.run(main()) in responses
+    assert [path.name for path in (tmp_path / "ab").iterdir()] == ["ab12.json"]
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    cache = ResponseCache(max_entries=10, max_bytes=10**6, ttl=None)
+    monkeypatch.setattr(factory, "response_cache", cache)
+    monkeypatch.setitem(RESPONSE_CACHE, "enabled", True)
+    monkeypatch.setitem(RESPONSE_CACHE, "stages", {"stage1": True, "stage3": False})
+    return cache
+
+
+def test_query_model_serves_repeats_from_cache_without_usage(sim, response_cache):
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def main():
+        first = await factory.query_model("sim/a", messages, stage="stage1")
+        second = await factory.query_model("sim/a", messages, stage="stage1")
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first["content"] == second["content"]
+    assert first["usage"]["completion_tokens"] == 20
+    # A cached answer used no tokens
+    assert "usage" not in second
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_query_model_skips_cache_for_disabled_stage(sim, response_cache):
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def main():
+        await factory.query_model("sim/a", messages, stage="stage3")
+        return await factory.query_model("sim/a", messages, stage="stage3")
+
+    assert "usage" in asyncio.run(main())
+    assert response_cache.stats()["entries"] == 0
@@ -0,0 +1,297 @@
+"""Tests for background council runs and their replayable event logs."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import backend.main as main_module
+from backend import council, runs
+from backend.runs import RunManager
+from backend.storage import aio
+
+
+MODELS = ["sim/alpha", "sim/beta", "sim/gamma"]
+
+
+@pytest.fixture
+def sim_council(sim, storage, monkeypatch):
+    """Make the council, chairman and titles use simulated models."""
+    async def title(content):
+        return "Simulated Title"
+
+    monkeypatch.setattr(council, "COUNCIL_MODELS", list(MODELS))
+    monkeypatch.setattr(council, "CHAIRMAN_MODEL", "sim/chair")
+    monkeypatch.setattr(runs, "generate_conversation_title", title)
+    return sim
+
+
+@pytest.fixture
+def manager(sim_council, monkeypatch):
+    """A fresh RunManager (runs outlive their clients) serving the API."""
+    manager = RunManager(retention=60, max_finished=10)
+    monkeypatch.setattr(main_module, "run_manager", manager)
+    return manager
+
+
+def types(events):
+    return [event["type"] for event in events]
+
+
+async def collect(run, last_event_id=-1):
+    return [item async for item in run.subscribe(last_event_id)]
+
+
+def parse_sse(text):
+    """Get (id, event) pairs from an SSE body."""
+    frames = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "id" in fields:
+            frames.append((int(fields["id"]), json.loads(fields["data"])))
+    return frames
+
+
+def test_run_saves_the_turn_and_logs_every_event(manager, storage):
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "What is a council?")
+        await run.task
+        return run
+
+    run = asyncio.run(main())
+
+    assert run.status == "complete"
+    assert types(run.events)[0] == "run_started"
+    assert types(run.events)[-2:] == ["trace", "complete"]
+    assert "title_complete" in types(run.events)
+    conversation = storage.get_conversation("c1")
+    assert conversation["title"] == "Simulated Title"
+    assert [message["role"] for message in conversation["messages"]] == ["user", "assistant"]
+    assert conversation["messages"][1]["stage3"]["model"] == "sim/chair"
+
+
+def test_subscribers_replay_after_their_last_event_id(manager):
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello")
+        live = asyncio.create_task(collect(run))
+        await run.task
+        return run, await live, await collect(run), await collect(run, 4)
+
+    run, live, replayed, resumed = asyncio.run(main())
+
+    assert live == replayed == list(enumerate(run.events))
+    assert resumed == replayed[5:]
+
+
+def test_late_subscriber_gets_the_events_it_missed(manager):
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello")
+        while len(run.events) < 3:
+            await asyncio.sleep(0.001)
+        late = await collect(run, 1)
+        return run, late
+
+    run, late = asyncio.run(main())
+    assert late == list(enumerate(run.events))[2:]
+
+
+def test_events_endpoint_honours_last_event_id(manager):
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello")
+        await run.task
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            url = f"/api/conversations/c1/runs/{run.id}/events"
+            header = await client.get(url, headers={"Last-Event-ID": "3"})
+            query = await client.get(url, params={"after": 3})
+            invalid = await client.get(url, headers={"Last-Event-ID": "three"})
+            missing = await client.get(f"/api/conversations/other/runs/{run.id}/events")
+        return run, header, query, invalid, missing
+
+    run, header, query, invalid, missing = asyncio.run(main())
+
+    expected = list(enumerate(run.events))[4:]
+    assert parse_sse(header.text) == expected
+    assert parse_sse(query.text) == expected
+    assert invalid.status_code == 400
+    assert missing.status_code == 404
+
+
+@pytest.fixture
+def calls(sim, monkeypatch):
+    """Record (model, prompt) of every request the simulated provider serves."""
+    recorded = []
+    query_model, stream_model = sim.query_model, sim.stream_model
+
+    async def recording_query(model, messages, *args, **kwargs):
+        recorded.append((f"sim/{model}", messages[-1]["content"]))
+        return await query_model(model, messages, *args, **kwargs)
+
+    async def recording_stream(model, messages, *args, **kwargs):
+        recorded.append((f"sim/{model}", messages[-1]["content"]))
+        async for chunk in stream_model(model, messages, *args, **kwargs):
+            yield chunk
+
+    monkeypatch.setattr(sim, "query_model", recording_query)
+    monkeypatch.setattr(sim, "stream_model", recording_stream)
+    return recorded
+
+
+def interrupted_checkpoint(content, stage1):
+    """Checkpoint of a first turn interrupted after some Stage 1 answers."""
+    checkpoint = runs.new_checkpoint("interrupted", "c1", content)
+    checkpoint.update(message_index=0, is_first_message=True, stage1=stage1)
+    return checkpoint
+
+
+def test_resumed_run_does_not_query_answered_models_again(manager, storage, calls):
+    answered = {"model": "sim/alpha", "response": "Saved before the crash"}
+
+    async def main():
+        await aio.create_conversation("c1")
+        await aio.add_user_message("c1", "hello")
+        await aio.save_checkpoint(interrupted_checkpoint("hello", [answered]))
+        resumed = await manager.resume_pending()
+        await asyncio.gather(*(run.task for run in resumed))
+        return resumed, await aio.load_checkpoints()
+
+    resumed, left = asyncio.run(main())
+
+    assert [run.resumed_from for run in resumed] == ["interrupted"]
+    assert resumed[0].status == "complete"
+    stage1_models = [model for model, prompt in calls if prompt == "hello"]
+    assert sorted(stage1_models) == ["sim/beta", "sim/gamma"]
+    assert left == []
+
+    messages = storage.get_conversation("c1")["messages"]
+    assert [message["role"] for message in messages] == ["user", "assistant"]
+    assert messages[1]["stage1"][0] == answered
+    assert [result["model"] for result in messages[1]["stage1"]] == MODELS
+    assert storage.get_conversation("c1")["title"] == "Simulated Title"
+
+
+def test_resumed_run_restores_a_lost_user_message(manager, storage):
+    async def main():
+        await aio.create_conversation("c1")
+        # The write-behind cache never flushed the user message
+        await aio.save_checkpoint(interrupted_checkpoint("hello", []))
+        resumed = await manager.resume_pending()
+        await asyncio.gather(*(run.task for run in resumed))
+
+    asyncio.run(main())
+
+    messages = storage.get_conversation("c1")["messages"]
+    assert messages[0] == {"role": "user", "content": "hello"}
+    assert messages[1]["role"] == "assistant"
+
+
+def test_resumed_run_with_a_stored_answer_only_drops_its_checkpoint(manager, storage, calls):
+    async def main():
+        await aio.create_conversation("c1")
+        await aio.add_user_message("c1", "hello")
+        await aio.add_assistant_message("c1", [], [], {"model": "sim/chair", "response": "Done"})
+        await aio.save_checkpoint(interrupted_checkpoint("hello", []))
+        resumed = await manager.resume_pending()
+        await asyncio.gather(*(run.task for run in resumed))
+        return resumed, await aio.load_checkpoints()
+
+    resumed, left = asyncio.run(main())
+
+    assert types(resumed[0].events) == ["run_started", "complete"]
+    assert calls == [] and left == []
+    assert len(storage.get_conversation("c1")["messages"]) == 2
+
+
+def test_shutdown_keeps_the_checkpoint_of_a_suspended_run(manager, storage, sim):
+    sim.models["chair"] = {"ttft": 60.0}
+
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello")
+        while "stage3_start" not in types(run.events):
+            await asyncio.sleep(0.001)
+        await manager.close()
+        return run, await aio.load_checkpoints()
+
+    run, left = asyncio.run(main())
+
+    assert run.status == "cancelled"
+    assert [checkpoint["run_id"] for checkpoint in left] == [run.id]
+    assert [result["model"] for result in left[0]["stage1"]] == MODELS
+    assert left[0]["stage2_metadata"] is not None and left[0]["stage3"] is None
+
+
+async def watch_until(run, event_type):
+    """Subscribe to a run and leave once an event of the given type arrives."""
+    subscription = run.subscribe()
+    try:
+        async for _, event in subscription:
+            if event["type"] == event_type:
+                return
+    finally:
+        await subscription.aclose()
+
+
+def test_abandoned_run_is_cancelled_and_saves_what_finished(sim_council, storage):
+    sim_council.models["chair"] = {"ttft": 60.0}
+    manager = RunManager(60, 10, on_disconnect="cancel", disconnect_grace=0.05)
+
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello", attached=True)
+        await watch_until(run, "stage3_start")
+        with pytest.raises(asyncio.CancelledError):
+            await run.task
+        return run, await aio.load_checkpoints()
+
+    run, left = asyncio.run(main())
+
+    assert run.status == "cancelled"
+    assert left == []
+    answer = storage.get_conversation("c1")["messages"][1]
+    assert [result["model"] for result in answer["stage1"]] == MODELS
+    assert len(answer["stage2"]) == len(MODELS)
+    assert answer["stage3"]["model"] == "cancelled"
+
+
+def test_client_reattaching_within_the_grace_keeps_the_run(sim_council, storage):
+    sim_council.models["chair"] = {"ttft": 0.1}
+    manager = RunManager(60, 10, on_disconnect="cancel", disconnect_grace=0.05)
+
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello", attached=True)
+        await watch_until(run, "stage3_start")
+        await asyncio.sleep(0.01)
+        replayed = await collect(run)
+        await run.task
+        return run, replayed
+
+    run, replayed = asyncio.run(main())
+
+    assert run.status == "complete"
+    assert replayed == list(enumerate(run.events))
+    assert storage.get_conversation("c1")["messages"][1]["stage3"]["model"] == "sim/chair"
+
+
+@pytest.mark.parametrize("on_disconnect, attached", [("background", True), ("cancel", False)])
+def test_runs_outside_the_cancel_policy_finish_without_clients(
+    sim_council, storage, on_disconnect, attached
+):
+    sim_council.models["chair"] = {"ttft": 0.1}
+    manager = RunManager(60, 10, on_disconnect=on_disconnect, disconnect_grace=0.01)
+
+    async def main():
+        await aio.create_conversation("c1")
+        run = manager.start("c1", "hello", attached=attached)
+        await watch_until(run, "stage1_start")
+        await run.task
+        return run
+
+    assert asyncio.run(main()).status == "complete"
+    assert storage.get_conversation("c1")["messages"][1]["stage3"]["model"] == "sim/chair"
@@ -0,0 +1,138 @@
+"""Tests for the token bucket and the per-provider rate limit scheduler."""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.providers import scheduler as scheduler_module
+from backend.providers.scheduler import RateLimitScheduler, TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic so bucket refills are deterministic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_spends_burst_then_queues(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # Refilling pays back the debt before new tokens are available
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    clock.now += 10.0
+    assert bucket.reserve() == 0
+    assert bucket.tokens == pytest.approx(1)
+
+
+def test_bucket_without_rate_only_honours_pauses(clock):
+    bucket = TokenBucket(rate=None, capacity=1)
+    for _ in range(5):
+        assert bucket.reserve() == 0
+
+    bucket.pause(3.0)
+    assert bucket.reserve() == pytest.approx(3.0)
+    clock.now += 2.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_pause_never_shortens_an_existing_pause(clock):
+    bucket = TokenBucket(rate=None, capacity=1)
+    bucket.pause(5.0)
+    bucket.pause(1.0)
+    assert bucket.reserve() == pytest.approx(5.0)
+
+
+def test_retry_after_pauses_provider_but_not_others(clock):
+    scheduler = RateLimitScheduler({"default": {}})
+    assert scheduler.backoff("openrouter", 2.5, attempt=0) == 2.5
+
+    assert scheduler._bucket("openrouter").reserve() == pytest.approx(2.5)
+    assert scheduler._bucket("ollama").reserve() == 0
+
+
+def test_backoff_without_retry_after_is_exponential(clock):
+    scheduler = RateLimitScheduler({"default": {}})
+    assert scheduler.backoff("openrouter", None, attempt=0) == 1.0
+    assert scheduler.backoff("openrouter", None, attempt=3) == 8.0
+    assert scheduler.backoff("openrouter", None, attempt=10) == 60.0
+
+
+def test_slot_waits_out_a_429_pause():
+    scheduler = RateLimitScheduler({"default": {}})
+    queued = []
+
+    async def main():
+        scheduler.backoff("sim", 0.05, attempt=0)
+        start = time.perf_counter()
+        async with scheduler.slot("sim", "fast", on_queued=queued.append):
+            return time.perf_counter() - start
+
+    waited = asyncio.run(main())
+
+    assert waited >= 0.04
+    assert len(queued) == 1 and queued[0]["reason"] == "rate_limit"
+    assert queued[0]["wait"] == pytest.approx(0.05, abs=0.01)
+
+
+def test_slot_enforces_model_and_provider_concurrency():
+    scheduler = RateLimitScheduler({
+        "default": {"max_concurrency": 2, "max_concurrency_per_model": 1}
+    })
+    running = {"total": 0, "peak": 0, "fast": 0, "fast_peak": 0}
+    queued = []
+
+    async def request(model):
+        async with scheduler.slot("sim", model, on_queued=lambda info: queued.append((model, info))):
+            running["total"] += 1
+            running["peak"] = max(running["peak"], running["total"])
+            if model == "fast":
+                running["fast"] += 1
+                running["fast_peak"] = max(running["fast_peak"], running["fast"])
+            await asyncio.sleep(0.01)
+            running["total"] -= 1
+            if model == "fast":
+                running["fast"] -= 1
+
+    async def main():
+        await asyncio.gather(*[request(model) for model in ("fast", "fast", "slow", "other")])
+
+    asyncio.run(main())
+
+    assert running["peak"] == 2
+    assert running["fast_peak"] == 1
+    assert queued and all(info["reason"] == "concurrency" for _, info in queued)
+    assert scheduler.stats() == {"queued": 0}
+
+
+def test_cancelled_wait_releases_its_slot():
+    scheduler = RateLimitScheduler({"default": {"max_concurrency": 1}})
+
+    async def main():
+        async with scheduler.slot("sim", "a"):
+            waiter = asyncio.create_task(scheduler.slot("sim", "b").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with scheduler.slot("sim", "c"):
+            return scheduler.stats()
+
+    assert asyncio.run(main()) == {"queued": 0}
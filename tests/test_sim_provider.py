@@ -0,0 +1,139 @@
+"""Tests for the deterministic simulated provider."""
+
+import asyncio
+
+import pytest
+
+from backend.providers.errors import ProviderServerError, ProviderTimeoutError, RateLimitError
+from backend.providers.sim import SimProvider
+
+
+MESSAGES = [{"role": "user", "content": "What is a council?"}]
+
+
+def make_sim(seed=0, **models):
+    return SimProvider({
+        "seed": seed,
+        "defaults": {
+            "ttft": 0.001,
+            "tokens_per_second": 100000.0,
+            "response_tokens": 20,
+            "jitter": 0.0,
+        },
+        "models": models,
+    })
+
+
+async def outcomes(provider, model, count, timeout=1.0):
+    """Query a model repeatedly, naming the outcome of each request."""
+    results = []
+    for _ in range(count):
+        try:
+            await provider.query_model(model, MESSAGES, timeout)
+            results.append("ok")
+        except ProviderTimeoutError:
+            results.append("timeout")
+        except RateLimitError:
+            results.append("rate_limited")
+        except ProviderServerError:
+            results.append("error")
+    return results
+
+
+async def stream_text(provider, model, timeout=1.0):
+    chunks = [chunk async for chunk in provider.stream_model(model, MESSAGES, timeout)]
+    return "".join(chunk.get("content", "") for chunk in chunks), chunks[-1]
+
+
+def test_same_seed_gives_the_same_output():
+    async def main(seed):
+        provider = make_sim(seed)
+        return await provider.query_model("a", MESSAGES), await stream_text(provider, "a")
+
+    (first, (streamed, _)), (again, _) = asyncio.run(main(0)), asyncio.run(main(0))
+    other, _ = asyncio.run(main(1))
+
+    assert first["content"] == again["content"] == streamed
+    assert len(first["content"].split()) == 20
+    assert other["content"] != first["content"]
+
+
+def test_different_models_and_prompts_answer_differently():
+    provider = make_sim()
+
+    async def main():
+        return (
+            (await provider.query_model("a", MESSAGES))["content"],
+            (await provider.query_model("b", MESSAGES))["content"],
+            (await provider.query_model("a", [{"role": "user", "content": "Other"}]))["content"],
+        )
+
+    assert len(set(asyncio.run(main()))) == 3
+
+
+def test_ranking_prompts_get_a_parseable_final_ranking():
+    prompt = "Response A:\nx\n\nResponse B:\ny\n\nEnd with a FINAL RANKING: section."
+    provider = make_sim()
+    response = asyncio.run(provider.query_model("a", [{"role": "user", "content": prompt}]))
+
+    ranking = response["content"].split("FINAL RANKING:")[1]
+    assert sorted(line.split(". ", 1)[1] for line in ranking.strip().splitlines()) == [
+        "Response A", "Response B"
+    ]
+
+
+def test_failure_rates_are_honoured_and_seeded():
+    profile = {
+        "ttft": 0.0,
+        "error_rate": 0.3,
+        "rate_limit_rate": 0.2,
+        "timeout_rate": 0.1,
+        "retry_after": 0.0,
+    }
+
+    def run(seed):
+        provider = make_sim(seed, mixed=profile)
+        return asyncio.run(outcomes(provider, "mixed", 300, timeout=0.01))
+
+    results = run(0)
+
+    assert results == run(0)
+    assert results != run(1)
+    for outcome, rate in (("error", 0.3), ("rate_limited", 0.2), ("timeout", 0.1), ("ok", 0.4)):
+        assert results.count(outcome) / len(results) == pytest.approx(rate, abs=0.07)
+
+
+def test_rate_limits_carry_the_retry_after():
+    provider = make_sim(limited={"rate_limit_rate": 1.0, "retry_after": 2.5})
+    with pytest.raises(RateLimitError) as raised:
+        asyncio.run(provider.query_model("limited", MESSAGES))
+    assert raised.value.retry_after == 2.5
+
+
+def test_slow_first_token_times_out():
+    provider = make_sim(slow={"ttft": 1.0})
+    with pytest.raises(ProviderTimeoutError):
+        asyncio.run(provider.query_model("slow", MESSAGES, timeout=0.02))
+
+
+def test_stream_times_out_mid_response():
+    # The first token arrives in time, but the whole answer would take ~0.5 s
+    provider = make_sim(sluggish={"tokens_per_second": 40.0, "chunk_tokens": 1})
+    received = []
+
+    async def main():
+        async for chunk in provider.stream_model("sluggish", MESSAGES, timeout=0.1):
+            received.append(chunk)
+
+    with pytest.raises(ProviderTimeoutError):
+        asyncio.run(main())
+    assert 0 < len(received) < 20
+    assert all("content" in chunk for chunk in received)
+
+
+def test_stream_ends_with_usage():
+    provider = make_sim()
+    text, last = asyncio.run(stream_text(provider, "a"))
+    assert last["usage"]["completion_tokens"] == 20
+    assert last["usage"]["prompt_tokens"] == (len(MESSAGES[0]["content"]) + 3) // 4
+    assert text
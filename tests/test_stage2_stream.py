@@ -0,0 +1,131 @@
+"""Tests for completion-order queries and incremental Stage 2 rankings."""
+
+import asyncio
+
+import pytest
+
+from backend import council
+from backend.config import CIRCUIT_BREAKER_CONFIG
+from backend.providers import factory
+
+
+MODELS = ["sim/alpha", "sim/beta", "sim/gamma"]
+STAGE1 = [{"model": model, "response": f"Answer from {model}"} for model in MODELS]
+
+
+@pytest.fixture
+def sim_council(sim, monkeypatch):
+    """A council whose members finish in the order beta, alpha, gamma."""
+    sim.models.update({
+        "alpha": {"ttft": 0.03},
+        "beta": {"ttft": 0.001},
+        "gamma": {"ttft": 0.06},
+    })
+    monkeypatch.setattr(council, "COUNCIL_MODELS", list(MODELS))
+    monkeypatch.setitem(CIRCUIT_BREAKER_CONFIG, "failure_threshold", 100)
+    return sim
+
+
+def stream_rankings(answered=None):
+    async def main():
+        return [
+            event async for event in council.stage2_stream_rankings("question", STAGE1, answered)
+        ]
+
+    return asyncio.run(main())
+
+
+def of_type(events, event_type):
+    return [event for event in events if event["type"] == event_type]
+
+
+def test_results_arrive_in_completion_order(sim_council):
+    async def main():
+        return [
+            (model, response is not None, timing["duration"])
+            async for model, response, timing in factory.query_models_as_completed(
+                MODELS, [{"role": "user", "content": "hello"}]
+            )
+        ]
+
+    results = asyncio.run(main())
+
+    assert [model for model, _, _ in results] == ["sim/beta", "sim/alpha", "sim/gamma"]
+    assert all(ok for _, ok, _ in results)
+    durations = [duration for _, _, duration in results]
+    assert durations == sorted(durations) and durations[-1] >= 0.06
+
+
+def test_closing_early_cancels_the_remaining_models(sim_council, monkeypatch):
+    cancelled = []
+    query_model = sim_council.query_model
+
+    async def recording_query(model, *args, **kwargs):
+        try:
+            return await query_model(model, *args, **kwargs)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+
+    monkeypatch.setattr(sim_council, "query_model", recording_query)
+
+    async def main():
+        results = factory.query_models_as_completed(MODELS, [{"role": "user", "content": "hello"}])
+        first = await results.__anext__()
+        await results.aclose()
+        await asyncio.sleep(0.01)
+        return first
+
+    assert asyncio.run(main())[0] == "sim/beta"
+    assert sorted(cancelled) == ["alpha", "gamma"]
+
+
+def test_partial_aggregates_follow_every_ranking(sim_council):
+    events = stream_rankings()
+
+    completed = of_type(events, "stage2_model_complete")
+    assert [event["data"]["model"] for event in completed] == ["sim/beta", "sim/alpha", "sim/gamma"]
+    for count, event in enumerate(completed, start=1):
+        aggregate = event["metadata"]["aggregate_rankings"]
+        # Every model is ranked once per finished ranking so far
+        assert {entry["model"] for entry in aggregate} == set(MODELS)
+        assert all(entry["rankings_count"] == count for entry in aggregate)
+        assert event["timing"]["duration"] >= 0
+        assert len(event["data"]["parsed_ranking"]) == len(MODELS)
+
+    final = of_type(events, "stage2_complete")[0]
+    assert events[-1] is final
+    assert [result["model"] for result in final["data"]] == MODELS
+    assert final["metadata"]["aggregate_rankings"] == completed[-1]["metadata"]["aggregate_rankings"]
+
+
+def test_failed_rankings_are_reported_and_left_out(sim_council):
+    sim_council.models["gamma"] = {"error_rate": 1.0}
+    events = stream_rankings()
+
+    failed = of_type(events, "stage2_model_failed")
+    assert [event["model"] for event in failed] == ["sim/gamma"]
+    assert failed[0]["timing"]["duration"] >= 0
+
+    final = of_type(events, "stage2_complete")[0]
+    assert [result["model"] for result in final["data"]] == ["sim/alpha", "sim/beta"]
+    assert all(entry["rankings_count"] == 2 for entry in final["metadata"]["aggregate_rankings"])
+
+
+def test_resumed_rankings_are_replayed_first_and_not_queried(sim_council, monkeypatch):
+    first = stream_rankings()
+    saved = [event["data"] for event in of_type(first, "stage2_model_complete")][:1]
+    queried = []
+    query_model = sim_council.query_model
+
+    async def recording_query(model, *args, **kwargs):
+        queried.append(model)
+        return await query_model(model, *args, **kwargs)
+
+    monkeypatch.setattr(sim_council, "query_model", recording_query)
+    events = stream_rankings(answered=saved)
+
+    completed = of_type(events, "stage2_model_complete")
+    assert completed[0]["resumed"] and completed[0]["data"] == saved[0]
+    assert sorted(queried) == ["alpha", "gamma"]
+    assert [result["model"] for result in of_type(events, "stage2_complete")[0]["data"]] == MODELS
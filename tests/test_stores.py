@@ -0,0 +1,147 @@
+"""Contract tests run against every conversation storage backend."""
+
+import asyncio
+
+import pytest
+
+import backend.storage as storage_module
+from backend.storage import JsonStore, LogStore, SqliteStore, aio
+
+
+def open_store(backend, path):
+    if backend == "json":
+        return JsonStore(str(path / "conversations"))
+    if backend == "jsonl":
+        return LogStore(str(path / "conversations"), fsync_interval=0)
+    return SqliteStore(str(path / "conversations.db"))
+
+
+@pytest.fixture(params=["json", "jsonl", "sqlite"])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def store(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    yield store
+    store.close()
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def test_create_and_get(store):
+    created = store.create_conversation("c1")
+    assert created["id"] == "c1"
+    assert created["messages"] == []
+
+    loaded = store.get_conversation("c1")
+    assert loaded["id"] == "c1"
+    assert loaded["title"] == "New Conversation"
+    assert loaded["messages"] == []
+    assert store.get_conversation("missing") is None
+
+
+def test_append_commit_and_title(store):
+    store.create_conversation("c1")
+    store.append_message("c1", user("one"))
+    store.commit("c1", [{"role": "assistant", "stage3": {"response": "two"}}, user("three")], "Named")
+    store.update_title("c1", "Renamed")
+
+    conversation = store.get_conversation("c1")
+    assert conversation["title"] == "Renamed"
+    assert [m.get("content") or m["stage3"]["response"] for m in conversation["messages"]] == [
+        "one", "two", "three"
+    ]
+
+
+def test_writes_to_missing_conversation_raise(store):
+    with pytest.raises(ValueError):
+        store.append_message("missing", user("x"))
+    with pytest.raises(ValueError):
+        store.commit("missing", [user("x")], None)
+
+
+@pytest.mark.parametrize("offset, limit, expected", [
+    (0, None, [0, 1, 2, 3, 4]),
+    (1, 2, [1, 2]),
+    (-2, None, [3, 4]),
+    (-10, 1, [0]),
+    (4, 10, [4]),
+    (5, None, []),
+    (0, 0, []),
+])
+def test_get_messages_ranges(store, offset, limit, expected):
+    store.create_conversation("c1")
+    store.commit("c1", [user(str(i)) for i in range(5)], None)
+
+    page = store.get_messages("c1", offset, limit)
+    assert [int(m["content"]) for m in page["messages"]] == expected
+    assert page["message_count"] == 5
+    assert page["offset"] == (expected[0] if expected else min(5, max(0, offset)))
+    assert store.get_messages("missing", 0, 1) is None
+
+
+def test_list_is_newest_first_with_counts(store):
+    for conversation_id in ("a", "b", "c"):
+        store.create_conversation(conversation_id)
+    store.commit("b", [user("x"), user("y")], "B")
+
+    listed = store.list_conversations()
+    assert [item["id"] for item in listed] == ["c", "b", "a"]
+    assert {item["id"]: item["message_count"] for item in listed} == {"a": 0, "b": 2, "c": 0}
+    assert listed[1]["title"] == "B"
+
+
+def test_data_survives_reopening(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    store.create_conversation("c1")
+    store.commit("c1", [user("kept")], "Title")
+    store.close()
+
+    store = open_store(backend, tmp_path)
+    try:
+        conversation = store.get_conversation("c1")
+        assert conversation["title"] == "Title"
+        assert conversation["messages"] == [user("kept")]
+        assert [item["id"] for item in store.list_conversations()] == ["c1"]
+    finally:
+        store.close()
+
+
+def test_save_conversation_replaces_messages(store):
+    store.create_conversation("c1")
+    store.commit("c1", [user("old"), user("older")], None)
+
+    conversation = store.get_conversation("c1")
+    conversation["messages"] = [user("new")]
+    conversation["title"] = "Saved"
+    store.save_conversation(conversation)
+
+    reloaded = store.get_conversation("c1")
+    assert reloaded["messages"] == [user("new")]
+    assert reloaded["title"] == "Saved"
+
+
+def test_concurrent_saves_and_listings_never_see_a_partial_file(backend, tmp_path, monkeypatch):
+    store = open_store(backend, tmp_path)
+    monkeypatch.setattr(storage_module, "_store", store)
+    store.create_conversation("c1")
+    conversation = store.get_conversation("c1")
+    conversation["messages"] = [user("x" * 1000) for _ in range(200)]
+
+    async def main():
+        # Saves and listings run on different storage threads at once
+        return await asyncio.gather(*[
+            aio.save_conversation(conversation) if i % 2 else aio.list_conversations()
+            for i in range(200)
+        ])
+
+    try:
+        listings = [result for result in asyncio.run(main()) if result is not None]
+        assert all([item["id"] for item in listed] == ["c1"] for listed in listings)
+        assert store.get_conversation("c1")["messages"] == conversation["messages"]
+    finally:
+        store.close()
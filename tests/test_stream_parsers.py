@@ -0,0 +1,97 @@
+"""Tests for the SSE and NDJSON stream parsers used by the providers."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.providers.base import iter_ndjson, iter_sse_data
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """A response body delivered in the given chunks, split anywhere."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def parse(parser, body, chunk_size=None):
+    """Run a parser over a body, optionally cut into chunks of chunk_size bytes."""
+    data = body.encode("utf-8")
+    size = chunk_size or len(data) or 1
+    chunks = [data[i:i + size] for i in range(0, len(data), size)]
+    response = httpx.Response(200, stream=ChunkedStream(chunks))
+
+    async def main():
+        return [item async for item in parser(response)]
+
+    return asyncio.run(main())
+
+
+CHUNK_SIZES = [None, 1, 7]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_sse_events_stop_at_done(chunk_size):
+    body = (
+        'data: {"n": 1}\n\n'
+        'data:{"n": 2}\n\n'
+        "data: [DONE]\n\n"
+        'data: {"n": 3}\n\n'
+    )
+    assert parse(iter_sse_data, body, chunk_size) == [{"n": 1}, {"n": 2}]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_sse_multi_line_data_is_joined(chunk_size):
+    body = 'data: {"text":\ndata:  "two lines"}\n\ndata: {"n": 2}\n\n'
+    assert parse(iter_sse_data, body, chunk_size) == [{"text": "two lines"}, {"n": 2}]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_sse_comments_keepalives_and_other_fields_are_ignored(chunk_size):
+    body = (
+        ": OPENROUTER PROCESSING\n\n"
+        ":\n\n"
+        "event: message\n"
+        "id: 7\n"
+        "retry: 1000\n"
+        'data: {"n": 1}\n\n'
+        "\n\n\n"
+        'data: {"n": 2}\r\n\r\n'
+    )
+    assert parse(iter_sse_data, body, chunk_size) == [{"n": 1}, {"n": 2}]
+
+
+def test_sse_unterminated_last_event_is_decoded():
+    assert parse(iter_sse_data, 'data: {"n": 1}\n\ndata: {"n": 2}') == [{"n": 1}, {"n": 2}]
+    assert parse(iter_sse_data, 'data: {"n": 1}\n\ndata: [DONE]') == [{"n": 1}]
+    assert parse(iter_sse_data, "") == []
+
+
+def test_sse_partial_final_event_raises():
+    with pytest.raises(ValueError):
+        parse(iter_sse_data, 'data: {"n": 1}\n\ndata: {"n": ')
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_ndjson_lines_and_blank_lines(chunk_size):
+    body = '{"n": 1}\n\n  \n{"n": 2}\r\n{"n": 3, "done": true}'
+    assert parse(iter_ndjson, body, chunk_size) == [{"n": 1}, {"n": 2}, {"n": 3, "done": True}]
+
+
+def test_ndjson_partial_final_line_raises_after_whole_lines():
+    received = []
+
+    async def main():
+        response = httpx.Response(200, stream=ChunkedStream([b'{"n": 1}\n{"n"', b': 2']))
+        async for item in iter_ndjson(response):
+            received.append(item)
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+    assert received == [{"n": 1}]
@@ -0,0 +1,95 @@
+"""Tests for the per-run timing trace of a council turn."""
+
+import asyncio
+
+import pytest
+
+from backend import council
+from backend.tracing import start_trace
+
+
+MODELS = ["sim/alpha", "sim/beta", "sim/gamma"]
+
+# Span offsets and durations are rounded to the microsecond
+EPSILON = 2e-6
+
+
+@pytest.fixture
+def sim_council(sim, monkeypatch):
+    monkeypatch.setattr(council, "COUNCIL_MODELS", list(MODELS))
+    monkeypatch.setattr(council, "CHAIRMAN_MODEL", "sim/chair")
+    # One slow council member, so Stage 1 has a clear straggler
+    sim.models["beta"] = {"ttft": 0.05}
+    return sim
+
+
+def named(trace, name):
+    return [span for span in trace["spans"] if span["name"] == name]
+
+
+def end(span):
+    return span["start"] + span["duration"]
+
+
+def run_traced(turn):
+    async def main():
+        trace = start_trace(run_id="traced")
+        await turn()
+        return trace.to_dict()
+
+    return asyncio.run(main())
+
+
+def test_full_council_trace_nests_models_inside_their_stages(sim_council):
+    trace = run_traced(lambda: council.run_full_council("What is a council?"))
+
+    stages = {span["stage"]: span for span in named(trace, "stage")}
+    assert list(stages) == ["stage1", "stage2", "stage3"]
+    # Stages run one after the other
+    assert end(stages["stage1"]) <= stages["stage2"]["start"] + EPSILON
+    assert end(stages["stage2"]) <= stages["stage3"]["start"] + EPSILON
+    assert trace["duration"] >= sum(span["duration"] for span in stages.values())
+
+    models = named(trace, "model")
+    assert sorted((span["stage"], span["model"]) for span in models) == sorted(
+        [("stage1", model) for model in MODELS]
+        + [("stage2", model) for model in MODELS]
+        + [("stage3", "sim/chair")]
+    )
+    for span in models:
+        stage = stages[span["stage"]]
+        assert stage["start"] <= span["start"] + EPSILON and end(span) <= end(stage) + EPSILON
+
+    summary = trace["summary"]
+    assert summary["stages"] == {stage: span["duration"] for stage, span in stages.items()}
+    assert summary["slowest_models"]["stage1"]["model"] == "sim/beta"
+    assert summary["slowest_models"]["stage1"]["duration"] >= 0.05
+
+
+def test_final_aggregation_is_a_single_span(sim_council):
+    trace = run_traced(lambda: council.run_full_council("What is a council?"))
+
+    aggregation = named(trace, "aggregation")
+    assert len(aggregation) == 1
+    stage2_models = [span for span in named(trace, "model") if span["stage"] == "stage2"]
+    assert aggregation[0]["start"] + EPSILON >= max(end(span) for span in stage2_models)
+
+
+def test_streamed_aggregations_do_not_nest(sim_council):
+    async def stream():
+        stage1 = [{"model": model, "response": f"Answer from {model}"} for model in MODELS]
+        return [event async for event in council.stage2_stream_rankings("question", stage1)]
+
+    events = []
+
+    async def turn():
+        events.extend(await stream())
+
+    trace = run_traced(turn)
+
+    completed = [event for event in events if event["type"] == "stage2_model_complete"]
+    aggregation = named(trace, "aggregation")
+    # One per finished ranking plus the final standings, none inside another
+    assert len(aggregation) == len(completed) + 1 == len(MODELS) + 1
+    for first, second in zip(aggregation, aggregation[1:]):
+        assert end(first) <= second["start"] + EPSILON
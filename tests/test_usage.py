@@ -0,0 +1,149 @@
+"""Tests for token usage accounting and the usage log summary."""
+
+import asyncio
+
+import httpx
+
+import backend.main as main_module
+from backend.providers.base import ollama_usage, openai_usage
+from backend.storage import UsageLog, get_usage_log
+from backend.tracing import Trace
+from backend.usage import run_usage, summarize_usage, usage_records
+
+
+def model_span(trace, stage, model, usage, start=0.0, duration=1.0):
+    """Record a finished model call in a trace."""
+    origin = trace._origin + start
+    trace.record("model", origin, origin + duration, {"stage": stage, "model": model, "usage": usage})
+
+
+def record(ts, model, stage="stage1", prompt=10, completion=20, seconds=1.0, conversation_id="c1"):
+    return {
+        "ts": ts,
+        "run_id": "r1",
+        "conversation_id": conversation_id,
+        "stage": stage,
+        "model": model,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+        "seconds": seconds,
+    }
+
+
+def test_provider_usage_is_normalized():
+    assert openai_usage({"prompt_tokens": 10, "completion_tokens": 5}) == {
+        "prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15
+    }
+    assert openai_usage(None) is None
+    assert ollama_usage({
+        "prompt_eval_count": 7,
+        "eval_count": 40,
+        "prompt_eval_duration": 5e8,
+        "eval_duration": 2e9,
+    }) == {
+        "prompt_tokens": 7,
+        "completion_tokens": 40,
+        "total_tokens": 47,
+        "prompt_seconds": 0.5,
+        "generation_seconds": 2.0,
+    }
+    assert ollama_usage({"done": True}) is None
+
+
+def test_run_usage_sums_openai_and_ollama_calls():
+    trace = Trace(run_id="r1")
+    model_span(trace, "stage1", "openrouter/a", openai_usage({
+        "prompt_tokens": 10, "completion_tokens": 30
+    }), duration=3.0)
+    model_span(trace, "stage1", "ollama/b", ollama_usage({
+        "prompt_eval_count": 12, "eval_count": 40, "eval_duration": 2e9
+    }), duration=5.0)
+    model_span(trace, "stage3", "openrouter/a", openai_usage({
+        "prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150
+    }), duration=1.0)
+    # A cached answer carries no usage and is not counted
+    model_span(trace, "stage1", "openrouter/c", None)
+    trace.record("storage", trace._origin, trace._origin + 1.0, {"operation": "commit"})
+
+    usage = run_usage(trace)
+
+    assert usage["total"] == {
+        "calls": 3,
+        "prompt_tokens": 122,
+        "completion_tokens": 120,
+        "total_tokens": 242,
+        "seconds": 6.0,
+        "tokens_per_second": 20.0,
+    }
+    stage1 = usage["stages"]["stage1"]
+    assert stage1["calls"] == 2 and stage1["total_tokens"] == 92
+    # Ollama's own generation time wins over the request time
+    assert stage1["models"]["ollama/b"]["seconds"] == 2.0
+    assert stage1["models"]["ollama/b"]["tokens_per_second"] == 20.0
+    assert stage1["models"]["openrouter/a"]["tokens_per_second"] == 10.0
+    assert set(usage["stages"]) == {"stage1", "stage3"}
+
+
+def test_usage_records_are_timestamped_at_the_end_of_each_call():
+    trace = Trace(run_id="r1")
+    usage = openai_usage({"prompt_tokens": 1, "completion_tokens": 2})
+    model_span(trace, "stage2", "sim/a", usage, start=2.0, duration=0.5)
+
+    [entry] = usage_records(trace, "c1")
+
+    assert entry["ts"] == round(trace.started_at + 2.5, 3)
+    assert entry == {**record(entry["ts"], "sim/a", "stage2", 1, 2, 0.5), "run_id": "r1"}
+
+
+def test_summary_of_a_log_with_a_torn_last_line(tmp_path):
+    log = UsageLog(str(tmp_path / "usage.jsonl"))
+    log.append([record(100.0, "sim/a"), record(130.0, "sim/b", "stage2", seconds=0.0)])
+    with open(log.path, "ab") as f:
+        f.write(b'{"ts": 140.0, "model": "sim/a", "prom')
+
+    summary = summarize_usage(log.read(), bucket=60)
+    assert set(summary["models"]) == {"sim/a", "sim/b"}
+    assert summary["models"]["sim/a"]["calls"] == 1
+    assert summary["models"]["sim/b"]["tokens_per_second"] is None
+    assert [point["start"] for point in summary["series"]] == [60.0, 120.0]
+
+    # The next run's records start on a fresh line and are all read back
+    log.append([record(150.0, "sim/a")])
+    summary = summarize_usage(log.read())
+    assert summary["models"]["sim/a"]["calls"] == 2
+    assert summary["models"]["sim/a"]["stages"]["stage1"]["completion_tokens"] == 40
+    assert "series" not in summary
+
+
+def test_usage_endpoint_filters_and_buckets(storage):
+    get_usage_log().append([
+        record(100.0, "sim/a"),
+        record(110.0, "sim/a", "stage3", completion=10),
+        record(200.0, "sim/b", conversation_id="c2"),
+    ])
+
+    async def main():
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            everything = await client.get("/api/usage", params={"bucket": 60})
+            window = await client.get("/api/usage", params={"since": 105, "until": 300, "bucket": 0})
+            one = await client.get("/api/usage", params={"conversation_id": "c2", "bucket": 0})
+            invalid = await client.get("/api/usage", params={"bucket": -1})
+        return everything, window, one, invalid
+
+    everything, window, one, invalid = asyncio.run(main())
+
+    body = everything.json()
+    assert body["bucket"] == 60 and body["since"] is None
+    assert body["models"]["sim/a"]["calls"] == 2
+    assert body["models"]["sim/a"]["stages"]["stage3"]["completion_tokens"] == 10
+    assert [point["start"] for point in body["series"]] == [60.0, 180.0]
+
+    body = window.json()
+    assert (body["since"], body["until"]) == (105, 300)
+    assert {name: totals["calls"] for name, totals in body["models"].items()} == {"sim/a": 1, "sim/b": 1}
+    assert "series" not in body
+
+    assert list(one.json()["models"]) == ["sim/b"]
+    assert invalid.status_code == 422